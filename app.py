@@ -2,6 +2,7 @@ import streamlit as st
 from app.pages.home import show_home
 from app.pages.creator import show_creator_page
 from app.pages.business import show_business_page
+from app.data.entities import prewarm_wordclouds
 
 def set_custom_styles():
     """设置自定义CSS样式"""
@@ -51,6 +52,9 @@ def main():
     # 应用自定义样式
     set_custom_styles()
     
+    # 后台预生成词云（每个数据版本只执行一次）
+    prewarm_wordclouds()
+    
     # 初始化会话状态
     if 'user_type' not in st.session_state:
         st.session_state.user_type = "Home"
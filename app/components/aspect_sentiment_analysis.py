@@ -0,0 +1,1044 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import seaborn as sns
+from app.utils.rendering import render_png, show_png
+from app.utils.downsample import downsample_frame, downsample_series, point_budget
+from app.utils.figures import plotly_chart, webgl_if_large
+from app.utils.exports import export_button
+from app.utils.anomalies import ANOMALY_METHODS, DEFAULT_WINDOW, DEFAULT_THRESHOLD
+from app.data.grid import load_topic_grid
+from app.data.aspect_sentiment import SOURCE_TFIDF, SOURCE_TOPICS, load_aspect_bundle, comment_topic_counts
+from app.data.aspect_vocabulary import OTHER_ASPECT
+from app.data.aspect_matrix import TopAspects
+
+# 每个页面的标题；aspect_labels 为 True 时在对比热图上显示所有 aspect 标签
+PAGES = {
+    (SOURCE_TFIDF, "bart"): {"header": "BART ABSA Sentiment Analysis", "subtitle": "TD-IDF Extracted Topics As Aspects"},
+    (SOURCE_TFIDF, "roberta"): {"header": "ROBERTA ABSA Sentiment Analysis", "subtitle": "TD-IDF Extracted Topics As Aspects"},
+    (SOURCE_TFIDF, "vader"): {"header": "VADER Sentiment Analysis", "subtitle": "TD-IDF Extracted Topics As Aspects"},
+    (SOURCE_TOPICS, "roberta"): {"header": "ROBERTA ABSA Sentiment Analysis", "subtitle": "Topics As Aspects"},
+    (SOURCE_TOPICS, "vader"): {"header": "VADER Sentiment Analysis", "subtitle": "Topics As Aspects", "aspect_labels": True},
+}
+
+# Function to create consistent heatmaps
+# Returns PNG bytes; the figure is released after rendering and cached by input hash
+def create_heatmap(data, title, x_label, y_label, annot=True, fmt=".1f", figsize=(12, 8), cmap="YlGnBu"):
+    def draw(fig):
+        ax = fig.subplots()
+        sns.heatmap(
+            data, 
+            annot=annot, 
+            cmap=cmap, 
+            fmt=fmt, 
+            cbar=True,
+            linewidths=0.5,
+            ax=ax
+        )
+        
+        ax.set_title(title, fontsize=16, pad=20)
+        ax.set_ylabel(y_label, fontsize=12)
+        ax.set_xlabel(x_label, fontsize=12)
+        fig.tight_layout()
+    
+    return render_png("heatmap", (data, title, x_label, y_label, annot, fmt, cmap), draw, figsize=figsize)
+
+# Function to create more consistent bar charts with Plotly
+def create_stacked_bar(data, x_col, y_cols, title, x_label, y_label, legend_title, color_map=None):
+    fig = px.bar(
+        data,
+        x=x_col,
+        y=y_cols,
+        title=title,
+        labels={"x": x_label, "y": y_label, "variable": legend_title},
+        color_discrete_map=color_map or {"positive": "green", "neutral": "blue", "negative": "red"}
+    )
+    
+    fig.update_layout(
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        legend_title=legend_title,
+        barmode='stack',
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Arial"
+        )
+    )
+    
+    # Improve hover information
+    fig.update_traces(
+        hovertemplate="<b>%{x}</b><br>%{y} comments<extra></extra>"
+    )
+    
+    return fig
+
+def show_aspect_sentiment_analysis(source, method):
+    """
+    Analysis page for one (aspect source, sentiment method) combination
+
+    Parameters:
+    -----------
+    source : str
+        SOURCE_TFIDF or SOURCE_TOPICS
+    method : str
+        Sentiment method, e.g. "bart", "roberta" or "vader" (see app.data.aspect_sentiment.BUNDLES)
+    """
+    page = PAGES[(source, method)]
+    col1, col2 = st.columns([2, 8])
+    with col1:
+        st.image("https://img.icons8.com/color/96/000000/youtube-play.png", width=80)
+    with col2:
+        st.header(page["header"])
+        st.write(page["subtitle"])
+    # st.markdown("---")
+    
+    # All tables come from the shared engine; its version (a fingerprint of
+    # every file behind this page) keys the figure and export caches
+    bundle = load_aspect_bundle(source, method)
+    data_version = bundle.version
+    
+    # Section selector: unlike st.tabs, only the selected section's data is
+    # loaded and its figures computed on each rerun
+    section = st.radio(
+        "Section:",
+        ["Overview", "By Creator", "By Topic", "Time Series", "Aspect-Based"],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    
+    # Consistent color scheme for sentiment across all visualizations
+    sentiment_colors = {"positive": "#2ca02c", "neutral": "#1f77b4", "negative": "#d62728"}
+    
+    if section == "Overview":  # Overview tab
+        with st.spinner('Loading sentiment data...'):
+            sentiment_counts_vader = bundle.sentiment_counts()
+            comments_per_creator_sentiment = bundle.comments_per_creator()
+        
+        st.subheader("Overall Sentiment Distribution per Creator")
+        
+        # 添加每个主题的情感分布条形图（仅部分数据集提供）
+        if bundle.has("topic_distribution"):
+            st.subheader("Sentiment distribution by topic")
+            topic_sentiment, topic_sentiment_melted = bundle.topic_distribution()
+            def build_figure():
+                fig = px.bar(
+                    topic_sentiment_melted, 
+                    x="Topics", 
+                    y="Count", 
+                    color="Sentiment",
+                    title="Sentiment distribution of each topic",
+                    labels={"Topics": "Topic"},
+                    color_discrete_map=sentiment_colors
+                )
+                fig.update_layout(
+                    xaxis_tickangle=-45,
+                    legend_title="Sentiment Type",
+                    hoverlabel=dict(
+                        bgcolor="white",
+                        font_size=12,
+                        font_family="Arial"
+                    )
+                )
+                fig.update_traces(
+                    hovertemplate="<b>Topic:</b> %{x}<br><b>%{data.name}:</b> %{y}<extra></extra>"
+                )
+                return fig
+
+            plotly_chart("topic_distribution", data_version, {}, build_figure)
+            export_button(
+                "📥 Download this data",
+                "topic_sentiment_distribution.csv",
+                data_version,
+                lambda: topic_sentiment
+            )
+        
+        # Fragment: the view toggle only reruns this block
+        @st.fragment
+        def overview_heatmap():
+            # Toggle between absolute values and percentages
+            view_option = st.radio(
+                "Select View:",
+                ('Absolute Numbers', 'Percentages'),
+                horizontal=True
+            )
+            
+            # Percentages are computed once per bundle
+            percentage_data = bundle.sentiment_percentages()
+            
+            if view_option == 'Absolute Numbers':
+                png = create_heatmap(
+                    sentiment_counts_vader,
+                    'Overall Sentiment Distribution per Creator',
+                    'Sentiment',
+                    'Creator',
+                    fmt="d"
+                )
+                st.image(png, use_container_width=True)
+                
+                # Add download button for the data
+                export_button(
+                    "📥 Download this data",
+                    "sentiment_counts_absolute.csv",
+                    data_version,
+                    lambda: sentiment_counts_vader.reset_index()
+                )
+            else:
+                png = create_heatmap(
+                    percentage_data,
+                    'Sentiment Distribution per Creator (Percentage %)',
+                    'Sentiment',
+                    'Creator'
+                )
+                st.image(png, use_container_width=True)
+                
+                # Add download button for the percentage data
+                export_button(
+                    "📥 Download this data",
+                    "sentiment_counts_percentage.csv",
+                    data_version,
+                    lambda: percentage_data.reset_index()
+                )
+        
+        overview_heatmap()
+        
+        # Show stacked bar chart for sentiment distribution
+        st.subheader("Sentiment Distribution by Content Creator")
+        
+        def build_figure():
+            fig = create_stacked_bar(
+                comments_per_creator_sentiment,
+                comments_per_creator_sentiment.index,
+                comments_per_creator_sentiment.columns,
+                "Sentiment Distribution by Content Creator",
+                "Content Creator",
+                "Number of Comments",
+                "Sentiment",
+                sentiment_colors
+            )
+            return fig
+        
+        plotly_chart("overview_stacked_bar", data_version, {}, build_figure)
+        
+        # Add analytical insights
+        with st.expander("Key Insights", expanded=True):
+            st.write("""
+            From the data, we can observe that:
+            - Fully Charged Show and Now You Know have the most positive comments overall
+            - Most creators have a higher proportion of positive comments than neutral and negative ones
+            - Bjorn Nyland has a relatively small number of total comments, but a higher proportion of positive comments
+            """)
+        
+    elif section == "By Creator":  # By Creator tab
+        with st.spinner('Loading sentiment data...'):
+            sentiment_counts_vader = bundle.sentiment_counts()
+        
+        st.subheader("Creator-Specific Sentiment Analysis")
+        
+        # Select creator for detailed analysis
+        selected_creator = st.selectbox(
+            'Select a creator to view detailed sentiment distribution',
+            sentiment_counts_vader.index.tolist()
+        )
+        
+        if selected_creator:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Create pie chart for selected creator
+                def build_figure():
+                    fig = px.pie(
+                        values=sentiment_counts_vader.loc[selected_creator],
+                        names=sentiment_counts_vader.columns,
+                        title=f'{selected_creator} Sentiment Distribution',
+                        color_discrete_map=sentiment_colors
+                    )
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>"
+                    )
+                    return fig
+
+                plotly_chart("creator_pie", data_version, {"creator": selected_creator}, build_figure)
+            
+            with col2:
+                # Create radar chart for sentiment comparison
+                def build_figure():
+                    fig = go.Figure()
+                
+                    fig.add_trace(go.Scatterpolar(
+                        r=sentiment_counts_vader.loc[selected_creator].values,
+                        theta=sentiment_counts_vader.columns,
+                        fill='toself',
+                        name=selected_creator,
+                        line=dict(color=sentiment_colors["positive"])
+                    ))
+                
+                    fig.update_layout(
+                        polar=dict(
+                            radialaxis=dict(
+                                visible=True,
+                            )
+                        ),
+                        showlegend=True,
+                        title=f"{selected_creator} Sentiment Distribution"
+                    )
+                    return fig
+                
+                plotly_chart("creator_radar", data_version, {"creator": selected_creator}, build_figure)
+            
+            # Add comparison with overall average
+            st.subheader(f"Comparing {selected_creator} with Average")
+            
+            # Calculate average sentiment across all creators
+            average_sentiment = sentiment_counts_vader.mean()
+            
+            # Create comparison dataframe
+            comparison_df = pd.DataFrame({
+                'Sentiment': sentiment_counts_vader.columns,
+                f'{selected_creator}': sentiment_counts_vader.loc[selected_creator].values,
+                'Average': average_sentiment.values
+            })
+            
+            # Create comparison bar chart
+            def build_figure():
+                fig = px.bar(
+                    comparison_df,
+                    x='Sentiment',
+                    y=[f'{selected_creator}', 'Average'],
+                    barmode='group',
+                    title=f"Sentiment Comparison: {selected_creator} vs. Average",
+                    color_discrete_sequence=[sentiment_colors["positive"], "#9467bd"]
+                )
+            
+                fig.update_layout(
+                    xaxis_title="Sentiment",
+                    yaxis_title="Count",
+                    legend_title="",
+                    hoverlabel=dict(
+                        bgcolor="white",
+                        font_size=12,
+                        font_family="Arial"
+                    )
+                )
+                return fig
+            
+            plotly_chart("creator_vs_average", data_version, {"creator": selected_creator}, build_figure)
+    
+    elif section == "By Topic":  # By Topic tab
+        with st.spinner('Loading sentiment data...'):
+            topic_sentiment_df = bundle.topic_summary()
+            topic_sentiment_matrix_transposed = bundle.topic_matrix()
+        
+        st.subheader("Topic-Based Sentiment Analysis")
+        
+        # Create table for positive sentiment percentage per topic
+        st.subheader("Positive Sentiment Percentage Per Topic")
+        
+        # Fragment: search, sort and paging only rerun the table
+        @st.fragment
+        def topic_table():
+            # 分页表格：话题索引（小写）与各列排序顺序预先建立，每次只取当前页
+            topic_grid = load_topic_grid(bundle.paths["topic_summary"])
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                # Add a search box for topics
+                topic_search = st.text_input("Search for specific topics:")
+            with col2:
+                sort_by = st.selectbox("Sort by:", topic_grid.columns)
+            with col3:
+                sort_order = st.radio("Order:", ("Ascending", "Descending"), horizontal=True)
+            
+            matching_rows = topic_grid.matching_rows(topic_search, sort_by, sort_order == "Ascending")
+            
+            # Add pagination for better readability
+            page_size = st.slider("Rows per page:", min_value=5, max_value=20, value=10, step=5)
+            total_pages = max(1, len(matching_rows) // page_size + (1 if len(matching_rows) % page_size > 0 else 0))
+            page_number = st.number_input("Page:", min_value=1, max_value=total_pages, value=1, step=1)
+            
+            # Display the current page of data
+            current_page_df = topic_grid.page(matching_rows, page_number, page_size)
+            st.dataframe(current_page_df, use_container_width=True, hide_index=True)
+            
+            start_idx = (page_number - 1) * page_size
+            st.caption(
+                f"Showing {min(start_idx + 1, len(matching_rows))}–{start_idx + len(current_page_df)} "
+                f"of {len(matching_rows)} topics"
+            )
+        
+        topic_table()
+        
+        # Add download button for the topic sentiment data
+        export_button(
+            "📥 Download complete topic sentiment data",
+            "topic_sentiment_summary.csv",
+            data_version,
+            lambda: topic_sentiment_df
+        )
+        
+        # Topic-sentiment matrix heatmap with improved interactivity
+        st.subheader("Topic-Based Sentiment Comparison")
+        
+        # Add zoom controls explanation
+        st.info("👆 Tip: Click and drag on the heatmap to zoom in. Double-click to reset the view.")
+        
+        def build_figure():
+            fig = px.imshow(
+                topic_sentiment_matrix_transposed,
+                labels=dict(x="Topic", y="Creator", color="Sentiment Score"),
+                x=topic_sentiment_matrix_transposed.columns,
+                y=topic_sentiment_matrix_transposed.index,
+                color_continuous_scale="RdYlGn",
+                aspect="auto",
+                text_auto=True
+            )
+
+            fig.update_layout(
+                title="Top 10 Topic-Based Sentiment Comparison per Creator",
+                xaxis_title="Topic",
+                yaxis_title="Creator",
+                height=600
+            )
+        
+            # Improve hover information
+            fig.update_traces(
+                hovertemplate="<b>Creator:</b> %{y}<br><b>Topic:</b> %{x}<br><b>Sentiment Score:</b> %{z:.2f}<extra></extra>"
+            )
+            return fig
+
+        plotly_chart("topic_heatmap", data_version, {}, build_figure)
+        
+        # Topic sentiment per creator analysis
+        st.subheader("Sentiment Distribution per Topic per Creator")
+        
+        st.subheader("Emotional distribution by creator and topic")
+        
+        # Fragment: creator and display-method changes only rerun this block
+        @st.fragment
+        def creator_topic_breakdown():
+            # Create selectors
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                selected_channel = st.selectbox(
+                    "Select Creator:",
+                    options=bundle.topic_creators()
+                )
+            
+            with col2:
+                view_option = st.radio(
+                    "Select the data display method:",
+                    ["Absolute number", "Percentage"],
+                    horizontal=True
+                )
+            
+            # Per-creator slices are cached in the bundle
+            subset = bundle.creator_topics(selected_channel)
+            
+            if view_option == "Percentage":
+                subset_pct = bundle.creator_topics(selected_channel, percentage=True)
+                
+                # Create heatmap
+                def draw_heatmap(fig):
+                    ax = fig.subplots()
+                    sns.heatmap(subset_pct.T, annot=True, fmt=".1f", cmap="YlGnBu", ax=ax)
+                    ax.set_title(f"{selected_channel} - Topic sentiment distribution (%)")
+                    ax.set_ylabel("Sentiment")
+                    ax.set_xlabel("Topic")
+                    ax.tick_params(axis="x", labelrotation=45)
+                    for label in ax.get_xticklabels():
+                        label.set_horizontalalignment("right")
+                    fig.tight_layout()
+                
+                show_png("topic_heatmap_percentage", (subset_pct, selected_channel), draw_heatmap)
+                
+                # Add bar chart for better comparison
+                st.write("Topic sentiment distribution bar chart:")
+                
+                # Use Plotly to create bar chart
+                chart_data = subset_pct.reset_index().melt(id_vars='topics', var_name='Sentiment', value_name='Percentage')
+                
+                def build_figure():
+                    fig = px.bar(
+                        chart_data,
+                        x='topics',
+                        y='Percentage',
+                        color='Sentiment',
+                        title=f"{selected_channel} - Topic sentiment distribution (%)",
+                        labels={'topics': 'Topic', 'Percentage': 'Percentage'},
+                        color_discrete_map=sentiment_colors
+                    )
+                
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>Topic:</b> %{x}<br><b>%{data.name}:</b> %{y:.1f}%<extra></extra>"
+                    )
+                
+                    # Adjust layout
+                    fig.update_layout(
+                        xaxis_tickangle=-45,
+                        legend_title_text='Sentiment',
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                    return fig
+                
+                plotly_chart("topic_bar_percentage", data_version, {"channel": selected_channel}, build_figure)
+            else:
+                # Absolute count heatmap
+                def draw_heatmap(fig):
+                    ax = fig.subplots()
+                    sns.heatmap(subset.T, annot=True, fmt="d", cmap="YlGnBu", ax=ax)
+                    ax.set_title(f"{selected_channel} - Topic sentiment distribution (absolute number)")
+                    ax.set_ylabel("Sentiment")
+                    ax.set_xlabel("Topic")
+                    ax.tick_params(axis="x", labelrotation=45)
+                    for label in ax.get_xticklabels():
+                        label.set_horizontalalignment("right")
+                    fig.tight_layout()
+                
+                show_png("topic_heatmap_absolute", (subset, selected_channel), draw_heatmap)
+                
+                # Add bar chart
+                st.write("Topic sentiment distribution bar chart:")
+                
+                chart_data = subset.reset_index().melt(id_vars='topics', var_name='Sentiment', value_name='Count')
+                
+                def build_figure():
+                    fig = px.bar(
+                        chart_data,
+                        x='topics',
+                        y='Count',
+                        color='Sentiment',
+                        title=f"{selected_channel} - Topic sentiment distribution (absolute number)",
+                        labels={'topics': 'Topic', 'Count': 'Number of comments'},
+                        color_discrete_map=sentiment_colors
+                    )
+                
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>Topic:</b> %{x}<br><b>%{data.name}:</b> %{y}<extra></extra>"
+                    )
+                
+                    # Adjust layout
+                    fig.update_layout(
+                        xaxis_tickangle=-45,
+                        legend_title_text='Sentiment',
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                    return fig
+                
+                plotly_chart("topic_bar_absolute", data_version, {"channel": selected_channel}, build_figure)
+                
+                # Add download button for the topic data
+                export_button(
+                    "📥 Download this data",
+                    f"{selected_channel}_topic_sentiment.csv",
+                    data_version,
+                    lambda: subset.reset_index()
+                )
+        
+        creator_topic_breakdown()
+
+    elif section == "Time Series":  # Time Series tab
+        with st.spinner('Loading sentiment data...'):
+            positive_comment_time_series = bundle.positive_time_series()
+            time_pyramid = bundle.time_pyramid()
+        
+        # Fragment: date range, aggregation and anomaly widgets only rerun this section
+        @st.fragment
+        def time_series_section():
+            st.subheader("Sentiment Over Time")
+            
+            # Add date range selector
+            date_min = positive_comment_time_series.index.min().date()
+            date_max = positive_comment_time_series.index.max().date()
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                start_date = st.date_input("Start date", date_min, min_value=date_min, max_value=date_max)
+            
+            with col2:
+                end_date = st.date_input("End date", date_max, min_value=date_min, max_value=date_max)
+            
+            # Add aggregation options
+            aggregation = st.radio(
+                "Aggregate by:",
+                ("Daily", "Weekly", "Monthly"),
+                horizontal=True
+            )
+            
+            # 长历史按LTTB降采样（保留峰值）；缩小日期范围可看到更多细节
+            full_resolution = st.checkbox(
+                "Full resolution",
+                value=False,
+                help="Plot every point in the selected date range instead of a peak-preserving downsample (zooming into the chart does not add points)"
+            )
+            
+            # Aggregate data based on selection
+            # 周/月聚合由预先计算的前缀和相减得到，不再对每个日期范围重新 resample
+            aggregated_data = time_pyramid.aggregate(start_date, end_date, aggregation)
+            time_format = "%b %Y" if aggregation == "Monthly" else "%b %d, %Y"
+            
+            # Create time series plot
+            def build_figure():
+                plot_data = downsample_frame(aggregated_data, max_points=point_budget(columns=1), full_resolution=full_resolution)
+                fig = px.line(
+                    plot_data,
+                    x="date",
+                    y="value",
+                    color="variable",
+                    title=f"Time Series of Positive Comments per Creator ({aggregation})",
+                    labels={"value": "Number of Positive Comments", "variable": "Creator"},
+                )
+            
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Number of Positive Comments",
+                    legend_title="Creator",
+                    hoverlabel=dict(
+                        bgcolor="white",
+                        font_size=12,
+                        font_family="Arial"
+                    )
+                )
+            
+                # Improve hover information
+                fig.update_traces(
+                    hovertemplate="<b>Date:</b> %{x|" + time_format + "}<br><b>%{data.name}:</b> %{y:.1f}<extra></extra>"
+                )
+                return webgl_if_large(fig)
+            
+            plotly_chart("time_series_all", data_version, {"start": start_date, "end": end_date, "aggregation": aggregation, "full_resolution": full_resolution}, build_figure)
+            
+            # Allow user to select specific creators
+            st.subheader("Compare specific creators")
+            selected_creators = st.multiselect(
+                "Select creators to display:",
+                aggregated_data.columns,
+                default=aggregated_data.columns[:3]  # Default to first three
+            )
+            
+            if selected_creators:
+                # Create filtered time series plot
+                def build_figure():
+                    plot_data = downsample_frame(aggregated_data, selected_creators, max_points=point_budget(columns=1),
+                                                 full_resolution=full_resolution)
+                    fig = px.line(
+                        plot_data,
+                        x="date",
+                        y="value",
+                        color="variable",
+                        title=f"Time Series of Positive Comments for Selected Creators ({aggregation})",
+                        labels={"value": "Number of Positive Comments", "variable": "Creator"}
+                    )
+                
+                    fig.update_layout(
+                        xaxis_title="Date",
+                        yaxis_title="Number of Positive Comments",
+                        legend_title="Creator",
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>Date:</b> %{x|" + time_format + "}<br><b>%{data.name}:</b> %{y:.1f}<extra></extra>"
+                    )
+                    return webgl_if_large(fig)
+                
+                plotly_chart("time_series_selected", data_version, {"start": start_date, "end": end_date, "aggregation": aggregation, "creators": selected_creators, "full_resolution": full_resolution}, build_figure)
+                
+                # Add anomaly detection
+                if st.checkbox("Show anomalies"):
+                    st.info("Anomalies are data points that are significantly different from the expected trend.")
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        method_label = st.selectbox("Detection method", list(ANOMALY_METHODS))
+                    with col2:
+                        window = st.slider("Window", min_value=3, max_value=30, value=DEFAULT_WINDOW,
+                                           help="Number of periods (days, weeks or months) the expected value is computed over")
+                    with col3:
+                        threshold = st.number_input("Threshold (σ)", min_value=0.5, max_value=5.0, value=DEFAULT_THRESHOLD, step=0.5)
+                    method = ANOMALY_METHODS[method_label]
+                    
+                    # 所有作者的异常一次性计算并缓存，这里只按日期和作者切片
+                    bands = bundle.anomaly_bands(aggregation, method, window, threshold)
+                    anomaly_counts = bands.counts(start_date, end_date)[selected_creators]
+                    st.write(f"**{int(anomaly_counts.sum())}** anomalies across {len(selected_creators)} selected creators "
+                             f"({', '.join(f'{creator}: {int(count)}' for creator, count in anomaly_counts.items())})")
+                    
+                    for creator in selected_creators:
+                        anomalies = bands.anomalies(creator, start_date, end_date)
+                        
+                        if not anomalies.empty:
+                            # Create anomaly plot
+                            def build_figure():
+                                fig = go.Figure()
+                                values = bands.values[creator].loc[start_date:end_date]
+                                shown = values if full_resolution else downsample_series(values, point_budget(columns=1))
+                            
+                                # Add main time series
+                                fig.add_trace(go.Scatter(
+                                    x=shown.index,
+                                    y=shown,
+                                    mode='lines',
+                                    name=creator,
+                                    line=dict(color='blue')
+                                ))
+                            
+                                # Add upper and lower bounds
+                                fig.add_trace(go.Scatter(
+                                    x=shown.index,
+                                    y=bands.upper[creator].reindex(shown.index),
+                                    mode='lines',
+                                    name=f'Upper Bound ({threshold:g}σ)',
+                                    line=dict(color='rgba(255,0,0,0.3)')
+                                ))
+                            
+                                fig.add_trace(go.Scatter(
+                                    x=shown.index,
+                                    y=bands.lower[creator].reindex(shown.index),
+                                    mode='lines',
+                                    name=f'Lower Bound ({threshold:g}σ)',
+                                    line=dict(color='rgba(255,0,0,0.3)')
+                                ))
+                            
+                                # Add anomalies as points
+                                fig.add_trace(go.Scatter(
+                                    x=anomalies.index,
+                                    y=anomalies.values,
+                                    mode='markers',
+                                    name='Anomalies',
+                                    marker=dict(color='red', size=8)
+                                ))
+                            
+                                fig.update_layout(
+                                    title=f"Anomaly Detection for {creator} ({method_label})",
+                                    xaxis_title="Date",
+                                    yaxis_title="Number of Positive Comments",
+                                    hoverlabel=dict(
+                                        bgcolor="white",
+                                        font_size=12,
+                                        font_family="Arial"
+                                    )
+                                )
+                                return webgl_if_large(fig)
+                            
+                            plotly_chart("anomalies", data_version, {"start": start_date, "end": end_date, "aggregation": aggregation, "creator": creator, "full_resolution": full_resolution, "method": method, "window": window, "threshold": threshold}, build_figure)
+                        else:
+                            st.write(f"No anomalies detected for {creator} in the selected time range.")
+        
+        time_series_section()
+
+    elif section == "Aspect-Based":  # Aspect-Based tab
+        with st.spinner('Loading sentiment data...'):
+            creator_aspect_sentiment = bundle.creator_aspect_matrix()
+        
+        st.subheader("Aspect-Based Sentiment Analysis")
+        
+        # Compare aspects across creators
+        st.subheader("Cross-Creator Aspect Sentiment Comparison")
+        
+        # Add explanation
+        st.info("""
+        This heatmap shows how different creators' content performs on various aspects. 
+        Greener cells indicate more positive sentiment, while redder cells indicate more negative sentiment.
+        """)
+        
+        def build_figure():
+            fig = px.imshow(
+                creator_aspect_sentiment,
+                labels=dict(x="Aspect", y="Creator", color="Sentiment Score"),
+                color_continuous_scale="RdYlGn",
+                aspect="auto"
+            )
+        
+            fig.update_layout(
+                title="Aspect-Based Sentiment Comparison across Creators",
+                xaxis_title="Aspect",
+                yaxis_title="Creator",
+                height=600,
+                hoverlabel=dict(
+                    bgcolor="white",
+                    font_size=12,
+                    font_family="Arial"
+                )
+            )
+
+            # If you want to ensure all x-axis labels are visible
+            if page.get("aspect_labels"):
+                fig.update_layout(
+                    xaxis=dict(
+                        tickmode='array',
+                        tickvals=list(range(len(creator_aspect_sentiment.columns))),
+                        ticktext=creator_aspect_sentiment.columns,
+                        tickangle=45  # Rotate labels if needed for better readability
+                    )
+                )
+
+            # Improve hover information
+            fig.update_traces(
+                hovertemplate="<b>Creator:</b> %{y}<br><b>Aspect:</b> %{x}<br><b>Sentiment Score:</b> %{z:.2f}<extra></extra>"
+            )
+            return fig
+        
+        plotly_chart("aspect_heatmap", data_version, {}, build_figure)
+
+        # Creator-specific aspect analysis
+        st.subheader("Creator-Specific Aspect Analysis")
+        
+        # Creator selection for aspect-based analysis
+        selected_creator = st.selectbox(
+            "Select creator:",
+            bundle.video_creators()
+        )
+
+        # Video search functionality
+        video_search = st.text_input("Search for specific video ID (optional):")
+        
+        # Slice the creator's sparse video x aspect matrix (built once per bundle) by video search
+        creator_matrix = bundle.creator_matrix(selected_creator)
+        video_rows = creator_matrix.matching_rows(video_search)
+        pivot_data = creator_matrix.frame(video_rows)
+        
+        if not pivot_data.empty:
+            st.subheader(f"Aspect-Based Sentiment for {selected_creator} Videos")
+            
+            def build_figure():
+                fig = px.imshow(
+                    pivot_data,
+                    labels=dict(x="Aspect", y="Video", color="Score"),
+                    color_continuous_scale="RdYlGn",
+                    aspect="auto",
+                    height=max(400, min(800, 100 + 30 * len(pivot_data)))  # Dynamic height based on number of videos
+                )
+            
+                fig.update_layout(
+                    xaxis_title="Aspect",
+                    yaxis_title="Video ID",
+                    hoverlabel=dict(
+                        bgcolor="white",
+                        font_size=12,
+                        font_family="Arial"
+                    )
+                )
+            
+                # Improve hover information
+                fig.update_traces(
+                    hovertemplate="<b>Video:</b> %{y}<br><b>Aspect:</b> %{x}<br><b>Sentiment Score:</b> %{z:.2f}<extra></extra>"
+                )
+                return fig
+            
+            plotly_chart("video_aspect_heatmap", data_version, {"creator": selected_creator, "video_search": video_search}, build_figure)
+            
+            # Add download option for this data
+            export_button(
+                "📥 Download aspect sentiment data",
+                f"{selected_creator}_aspect_sentiment.csv",
+                data_version,
+                lambda: pivot_data.reset_index(),
+                params={"video_search": video_search}
+            )
+        else:
+            st.warning("No data available for the selected creator or search criteria.")
+        
+        # Show most positive and most negative aspects for selected creator
+        if len(video_rows) > 0:
+            st.subheader(f"Most Positive and Negative Aspects for {selected_creator}")
+            
+            # Top and bottom aspects are precomputed per creator; a video search
+            # ranks only the matching videos' averages
+            if video_search:
+                ranked = TopAspects(creator_matrix.column_means(video_rows).to_frame(selected_creator).T)
+            else:
+                ranked = bundle.top_aspects()
+            top_aspects = ranked.highest(selected_creator, 5)
+            bottom_aspects = ranked.lowest(selected_creator, 5)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("Most Positive Aspects")
+                def build_figure():
+                    fig = px.bar(
+                        x=top_aspects.index,
+                        y=top_aspects.values,
+                        labels={'x': 'Aspect', 'y': 'Sentiment Score'},
+                        color=top_aspects.values,
+                        color_continuous_scale='Greens',
+                        title=f"Top 5 Positive Aspects for {selected_creator}"
+                    )
+                
+                    fig.update_layout(
+                        xaxis_tickangle=-45,
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>Aspect:</b> %{x}<br><b>Sentiment Score:</b> %{y:.2f}<extra></extra>"
+                    )
+                    return fig
+                
+                plotly_chart("top_positive_aspects", data_version, {"creator": selected_creator, "video_search": video_search}, build_figure)
+            
+            with col2:
+                st.write("Most Negative Aspects")
+                def build_figure():
+                    fig = px.bar(
+                        x=bottom_aspects.index,
+                        y=bottom_aspects.values,
+                        labels={'x': 'Aspect', 'y': 'Sentiment Score'},
+                        color=bottom_aspects.values,
+                        color_continuous_scale='Reds_r',
+                        title=f"Top 5 Negative Aspects for {selected_creator}"
+                    )
+                
+                    fig.update_layout(
+                        xaxis_tickangle=-45,
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                
+                    # Improve hover information
+                    fig.update_traces(
+                        hovertemplate="<b>Aspect:</b> %{x}<br><b>Sentiment Score:</b> %{y:.2f}<extra></extra>"
+                    )
+                    return fig
+                
+                plotly_chart("top_negative_aspects", data_version, {"creator": selected_creator, "video_search": video_search}, build_figure)
+
+            st.subheader(f"Aspect-Based Sentiment for {selected_creator}")
+            if len(video_rows) > 0:
+                # Shared by every page: built once per creator and comment file version
+                aspect_video_sentiment = comment_topic_counts(selected_creator)
+                def draw_heatmap(fig):
+                    ax = fig.subplots()
+                    sns.heatmap(aspect_video_sentiment, cmap="coolwarm", annot=False, fmt="d", ax=ax)
+                    ax.set_title(f"Aspect-Based Sentiment for {selected_creator} Across Videos")
+                    ax.set_xlabel("Sentiment")
+                    ax.set_ylabel("Video ID - Topic")
+                    ax.tick_params(axis="x", labelrotation=45)
+                    fig.tight_layout()
+                
+                show_png("video_topic_heatmap", (aspect_video_sentiment, selected_creator), draw_heatmap, figsize=(15, 8))
+
+        # Per-video extracted aspects (TF-IDF bundles only)
+        if bundle.has("aspect_video_counts"):
+            st.subheader("Extracted Aspects per Video")
+            
+            # Net sentiment (positive - negative mentions) of the strongest canonical aspects in every video
+            extracted = bundle.extracted_aspects()
+            net_matrix = extracted.net_matrix(bundle.method)
+            net_overview = net_matrix.frame(columns=net_matrix.strongest_columns(15))
+            def build_figure():
+                fig = px.imshow(
+                    net_overview,
+                    labels=dict(x="Aspect", y="Video", color="Net mentions"),
+                    color_continuous_scale="RdYlGn",
+                    color_continuous_midpoint=0,
+                    aspect="auto",
+                    height=max(400, min(800, 100 + 20 * len(net_overview)))
+                )
+                fig.update_layout(
+                    title="Net sentiment of the most discussed aspects per video",
+                    xaxis_title="Aspect",
+                    yaxis_title="Video ID",
+                    xaxis_tickangle=-45,
+                    hoverlabel=dict(
+                        bgcolor="white",
+                        font_size=12,
+                        font_family="Arial"
+                    )
+                )
+                fig.update_traces(
+                    hovertemplate="<b>Video:</b> %{y}<br><b>Aspect:</b> %{x}<br><b>Net mentions:</b> %{z:.0f}<extra></extra>"
+                )
+                return fig
+            
+            plotly_chart("extracted_aspect_net_heatmap", data_version, {}, build_figure)
+            
+            # Fragment: the video picker only reruns this block
+            @st.fragment
+            def extracted_aspects_section():
+                extracted = bundle.extracted_aspects()
+                selected_video = st.selectbox("Select video:", extracted.videos)
+                
+                # Phrases are grouped into canonical aspects; rare ones fall into OTHER_ASPECT
+                video_aspects = extracted.video_aspects(bundle.method, selected_video)
+                other_mentions = video_aspects["mentions"].get(OTHER_ASPECT, 0)
+                video_aspects = video_aspects.drop(index=OTHER_ASPECT, errors="ignore")
+                st.caption(
+                    f"{len(video_aspects)} canonical aspects in this video; "
+                    f"{other_mentions} mentions of rare phrases are not shown"
+                )
+                
+                top_aspects = video_aspects.head(20)
+                def build_figure():
+                    fig = px.bar(
+                        top_aspects.reset_index(),
+                        x="extracted_aspects",
+                        y=["positive", "neutral", "negative"],
+                        title=f"Most mentioned aspects in {selected_video}",
+                        labels={"extracted_aspects": "Aspect", "value": "Mentions", "variable": "Sentiment"},
+                        color_discrete_map=sentiment_colors
+                    )
+                    fig.update_layout(
+                        xaxis_tickangle=-45,
+                        barmode='stack',
+                        hoverlabel=dict(
+                            bgcolor="white",
+                            font_size=12,
+                            font_family="Arial"
+                        )
+                    )
+                    return fig
+                
+                plotly_chart("video_extracted_aspects", data_version, {"video": selected_video}, build_figure)
+                
+                export_button(
+                    "📥 Download this data",
+                    f"{selected_video}_extracted_aspects.csv",
+                    data_version,
+                    lambda: video_aspects.reset_index()
+                )
+            
+            extracted_aspects_section()
+            
+            with st.expander("Aspect vocabulary"):
+                vocabulary = bundle.extracted_aspects().vocabulary()
+                st.write(
+                    f"{len(vocabulary)} extracted phrases are grouped into "
+                    f"{len(bundle.extracted_aspects().canonical_aspects())} canonical aspects "
+                    f"(normalization without stop-words, character n-gram fuzzy matching, word containment "
+                    f"and a minimum frequency); {(vocabulary['canonical'] == OTHER_ASPECT).sum()} phrases match none. "
+                    f"The keyword heatmaps and rankings above use the same canonical aspects."
+                )
+                export_button(
+                    "📥 Download the aspect mapping",
+                    "aspect_vocabulary.csv",
+                    data_version,
+                    lambda: vocabulary
+                )
@@ -1,6 +1,32 @@
+# 可做数值对比的分析类型 -> (aspect来源, 情感方法)
+METHOD_ANALYSES = {
+    "Topics As Aspects - VADER Sentiment Analysis": ("topics", "vader"),
+    "Topics As Aspects - ROBERTA ABSA Sentiment Analysis": ("topics", "roberta"),
+    "TD-IDF Extracted Aspects - VADER Sentiment Analysis": ("tfidf", "vader"),
+    "TD-IDF Extracted Aspects - ROBERTA ABSA Sentiment Analysis": ("tfidf", "roberta"),
+    "TD-IDF Extracted Aspects - BART ABSA Sentiment Analysis": ("tfidf", "bart"),
+}
+
 def show_creator_comparison():
     import streamlit as st
     
+    # 对比方式：方法对比只计算一份联合数据集；并排显示则渲染两个完整页面
+    mode = st.radio(
+        "Comparison mode:",
+        ["Compare sentiment methods", "Side by side"],
+        horizontal=True
+    )
+    
+    if mode == "Compare sentiment methods":
+        method_labels = list(METHOD_ANALYSES)
+        col1, col2 = st.columns(2)
+        with col1:
+            first = st.selectbox("Select First Method", options=method_labels, index=0, key="method_1")
+        with col2:
+            second = st.selectbox("Select Second Method", options=method_labels, index=1, key="method_2")
+        show_method_comparison(first, second)
+        return
+    
     # 定义所有可用的分析类型
     analysis_types = [
         "Video Summary",
@@ -78,3 +104,124 @@ def display_analysis(analysis_type):
         show_tdidf_roberta_sentiment_analysis()
     elif analysis_type == "TD-IDF Extracted Aspects - BART ABSA Sentiment Analysis":
         show_tdidf_bart_sentiment_analysis()
+
+# 两种情感方法的数值对比（每对数据版本只计算一次联合数据集）
+def show_method_comparison(first, second):
+    import streamlit as st
+    import plotly.express as px
+    from app.data.method_comparison import load_method_comparison
+    from app.utils.figures import plotly_chart
+    from app.utils.exports import export_button
+    
+    if first == second:
+        st.info("Select two different methods to see where they disagree.")
+        return
+    
+    comparison = load_method_comparison(METHOD_ANALYSES[first], METHOD_ANALYSES[second])
+    summary = comparison.summary()
+    pair = {"first": first, "second": second}
+    
+    st.caption(f"Deltas are **{second}** minus **{first}**. Net sentiment = % positive − % negative.")
+    
+    # 关键指标
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Creator agreement", f"{summary['creator_agreement']:.0f}%", help="Creators whose dominant sentiment is the same under both methods")
+    col2.metric("Aspect agreement", f"{summary['aspect_agreement']:.0f}%", help="Shared (creator, aspect) pairs with the same dominant sentiment")
+    col3.metric("Creator rank correlation", f"{summary['creator_rank_correlation']:.2f}")
+    col4.metric("Mean |Δ net| per aspect", f"{summary['mean_abs_net_delta']:.1f} pts")
+    st.caption(
+        f"{summary['shared_aspects']} (creator, aspect) pairs found by both methods; "
+        f"{comparison.only_a} only by the first, {comparison.only_b} only by the second."
+    )
+    
+    # 每个创作者的净情感对比
+    st.subheader("Net Sentiment per Creator")
+    creators = comparison.creators
+    
+    def build_figure():
+        plot_data = creators.melt(
+            id_vars="creator",
+            value_vars=["net_a", "net_b"],
+            var_name="Method",
+            value_name="Net sentiment"
+        ).replace({"Method": {"net_a": first, "net_b": second}})
+        fig = px.bar(
+            plot_data,
+            x="creator",
+            y="Net sentiment",
+            color="Method",
+            barmode="group",
+            labels={"creator": "Creator", "Net sentiment": "Net sentiment (pts)"}
+        )
+        fig.update_layout(legend=dict(orientation="h", yanchor="bottom", y=1.02))
+        return fig
+    
+    plotly_chart("method_comparison_creators", comparison.version, pair, build_figure)
+    
+    st.dataframe(
+        creators[["creator", "dominant_a", "dominant_b", "net_a", "net_b", "delta_net", "rank_a", "rank_b", "rank_change"]].rename(columns={
+            "creator": "Creator",
+            "dominant_a": "Dominant (1st)",
+            "dominant_b": "Dominant (2nd)",
+            "net_a": "Net (1st)",
+            "net_b": "Net (2nd)",
+            "delta_net": "Δ Net",
+            "rank_a": "Rank (1st)",
+            "rank_b": "Rank (2nd)",
+            "rank_change": "Rank change"
+        }).round(1),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # 创作者 x 话题 的净情感差异热图
+    st.subheader("Aspect Disagreement")
+    delta_matrix = comparison.delta_matrix()
+    if delta_matrix.empty:
+        st.warning("The two methods share no aspects.")
+    else:
+        def build_figure():
+            limit = max(abs(delta_matrix.min().min()), abs(delta_matrix.max().max()), 1)
+            fig = px.imshow(
+                delta_matrix,
+                labels=dict(x="Aspect", y="Creator", color="Δ Net"),
+                color_continuous_scale="RdBu",
+                zmin=-limit,
+                zmax=limit,
+                aspect="auto"
+            )
+            fig.update_traces(
+                hovertemplate="<b>Creator:</b> %{y}<br><b>Aspect:</b> %{x}<br><b>Δ Net:</b> %{z:.1f}<extra></extra>"
+            )
+            fig.update_layout(xaxis_tickangle=-45)
+            return fig
+        
+        plotly_chart("method_comparison_aspects", comparison.version, pair, build_figure)
+        
+        # 选定创作者：按分歧大小排列的话题
+        selected_creator = st.selectbox("Select creator:", creators["creator"].tolist(), key="method_comparison_creator")
+        rows = comparison.creator_aspects(selected_creator).head(15)
+        
+        def build_figure():
+            fig = px.bar(
+                rows,
+                x="delta_net",
+                y="aspect",
+                orientation="h",
+                color="agree",
+                color_discrete_map={True: "#1f77b4", False: "#d62728"},
+                labels={"delta_net": "Δ Net (pts)", "aspect": "Aspect", "agree": "Same dominant sentiment"},
+                title=f"Largest disagreements for {selected_creator}"
+            )
+            fig.update_layout(yaxis=dict(autorange="reversed"))
+            return fig
+        
+        plotly_chart("method_comparison_creator_aspects", comparison.version, dict(pair, creator=selected_creator), build_figure)
+    
+    export_button(
+        "📥 Download the joint dataset",
+        "method_comparison_aspects.csv",
+        comparison.version,
+        lambda: comparison.aspects,
+        params=pair
+    )
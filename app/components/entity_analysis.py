@@ -4,11 +4,13 @@ import numpy as np
 import altair as alt
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 import io
 import seaborn as sns
 from matplotlib.colors import LinearSegmentedColormap
+from app.data.entities import load_entity_summary, load_wordclouds, STYLE_TEXT, STYLE_WEIGHTED
+from app.utils.rendering import show_png
+from app.utils.figures import webgl_if_large
 
 def show_entity_analysis():
     col1, col2 = st.columns([2, 8])
@@ -19,7 +21,7 @@ def show_entity_analysis():
         st.header("Entity Sentiment Analysis")
         # st.markdown("<h1 class='main-header'>Video Comments Analysis</h1>", unsafe_allow_html=True)
     st.markdown("---")
-    df_entity_summary = pd.read_csv('data/entity_sentiment_summary3.csv')
+    df_entity_summary = load_entity_summary()
     
     # 读取数据，添加错误处理
     # try:
@@ -132,222 +134,135 @@ def show_entity_analysis():
             yaxis_title="Average Sentiment Score"
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(webgl_if_large(fig), use_container_width=True)
     
     # 4. 热图 - 实体和标签的情感
     st.subheader("Entity-Label Sentiment Heatmap")
     
-    # 提供两种热图展示选项
-    heatmap_option = st.radio(
-        "Select heatmap style",
-        ["Show All Entities", "Show only the top 15 entities with the highest sum of sentiment scores"],
-        horizontal=True
-    )
-    
-    # 获取实体和热图数据
-    if heatmap_option == "Show All Entities":
-        # 使用所有实体，与PLP2相同的实现
-        pivot_table = df_entity_summary.pivot_table(
-            index="Entity", 
-            columns="Label", 
-            values="Avg_Sentiment"
-        ).fillna(0)
-        
-        # 使用matplotlib创建热图
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        sns.heatmap(
-            pivot_table, 
-            cmap="coolwarm", 
-            annot=False,
-            ax=ax
+    # 片段：切换热图样式只重新运行这一部分
+    @st.fragment
+    def entity_heatmap_section():
+        # 提供两种热图展示选项
+        heatmap_option = st.radio(
+            "Select heatmap style",
+            ["Show All Entities", "Show only the top 15 entities with the highest sum of sentiment scores"],
+            horizontal=True
         )
         
-        plt.title("Heatmap of Average Sentiment per Entity and Label")
-        plt.tight_layout()
-    
-    else:
-        # 增强版本：获取出现频率最高的前15个实体
-        top_freq_entities = df_entity_summary.groupby("Entity")["Avg_Sentiment"].sum().nlargest(15).index.tolist()
-        filtered_df = df_entity_summary[df_entity_summary["Entity"].isin(top_freq_entities)]
-        
-        # 创建透视表
-        pivot_table = filtered_df.pivot_table(
-            index="Entity", 
-            columns="Label", 
-            values="Avg_Sentiment"
-        ).fillna(0)
-        
-        # 使用matplotlib创建热图
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # 创建自定义颜色映射：从红色（负面）到白色（中性）到蓝色（正面）
-        colors = ["#d62728", "#ffffff", "#1f77b4"]  # 红、白、蓝
-        cmap = LinearSegmentedColormap.from_list("sentiment_cmap", colors, N=100)
+        # 获取实体和热图数据
+        if heatmap_option == "Show All Entities":
+            # 使用所有实体，与PLP2相同的实现
+            pivot_table = df_entity_summary.pivot_table(
+                index="Entity", 
+                columns="Label", 
+                values="Avg_Sentiment"
+            ).fillna(0)
+            
+            # 使用matplotlib创建热图
+            def draw_heatmap(fig):
+                ax = fig.subplots()
+                
+                sns.heatmap(
+                    pivot_table, 
+                    cmap="coolwarm", 
+                    annot=False,
+                    ax=ax
+                )
+                
+                ax.set_title("Heatmap of Average Sentiment per Entity and Label")
+                fig.tight_layout()
         
-        sns.heatmap(
-            pivot_table, 
-            cmap=cmap, 
-            annot=True, 
-            fmt=".2f", 
-            linewidths=0.5,
-            vmin=0, 
-            vmax=1,
-            center=0,
-            ax=ax
-        )
+        else:
+            # 增强版本：获取出现频率最高的前15个实体
+            top_freq_entities = df_entity_summary.groupby("Entity")["Avg_Sentiment"].sum().nlargest(15).index.tolist()
+            filtered_df = df_entity_summary[df_entity_summary["Entity"].isin(top_freq_entities)]
+            
+            # 创建透视表
+            pivot_table = filtered_df.pivot_table(
+                index="Entity", 
+                columns="Label", 
+                values="Avg_Sentiment"
+            ).fillna(0)
+            
+            # 使用matplotlib创建热图
+            def draw_heatmap(fig):
+                ax = fig.subplots()
+                
+                # 创建自定义颜色映射：从红色（负面）到白色（中性）到蓝色（正面）
+                colors = ["#d62728", "#ffffff", "#1f77b4"]  # 红、白、蓝
+                cmap = LinearSegmentedColormap.from_list("sentiment_cmap", colors, N=100)
+                
+                sns.heatmap(
+                    pivot_table, 
+                    cmap=cmap, 
+                    annot=True, 
+                    fmt=".2f", 
+                    linewidths=0.5,
+                    vmin=0, 
+                    vmax=1,
+                    center=0,
+                    ax=ax
+                )
+                
+                ax.set_title("Heatmap of Average Sentiment per Entity and Label (Top 15 Entities)")
+                fig.tight_layout()
         
-        plt.title("Heatmap of Average Sentiment per Entity and Label (Top 15 Entities)")
-        plt.tight_layout()
+        # 渲染为PNG（按输入缓存，渲染后释放figure）并显示
+        show_png("entity_heatmap", (pivot_table, heatmap_option), draw_heatmap, figsize=(12, 8))
     
-    # 将matplotlib图表显示在Streamlit中
-    st.pyplot(fig)
+    entity_heatmap_section()
     
     # 5. 词云图 - 积极实体
     st.subheader("Word Clouds by Sentiment")
     
-    # 添加词云风格选择
-    wordcloud_style = st.radio(
-        "Select wordcloud style",
-        ["Intuitive positive emotion word cloud", "A word cloud using a weighted system that takes into account the frequency and sentiment scores of entities"],
-        horizontal=True
-    )
-    
-    if wordcloud_style == "Intuitive positive emotion word cloud":
-        # 使用与PLP2相同的实现
-        st.write("Word Cloud of Positive Entities (Sentiment > 0.6)")
-        positive_entities = df_entity_summary[df_entity_summary["Avg_Sentiment"] > 0.6]
+    # 片段：切换词云风格只重新运行这一部分（图片来自缓存）
+    @st.fragment
+    def wordcloud_section():
+        # 添加词云风格选择
+        wordcloud_style = st.radio(
+            "Select wordcloud style",
+            ["Intuitive positive emotion word cloud", "A word cloud using a weighted system that takes into account the frequency and sentiment scores of entities"],
+            horizontal=True
+        )
         
-        if len(positive_entities) > 0:
-            # 简单合并实体名称 - 确保所有实体都是字符串类型
-            # 将所有实体转换为字符串，避免数字类型引起的错误
-            text_pos = " ".join(positive_entities["Entity"].astype(str))
+        # 词云按数据版本和风格预先生成（启动时在后台线程中），这里只取缓存的PNG
+        if wordcloud_style == "Intuitive positive emotion word cloud":
+            # 使用与PLP2相同的实现
+            st.write("Word Cloud of Positive Entities (Sentiment > 0.6)")
+            images = load_wordclouds(STYLE_TEXT)
             
-            # 创建词云 - 与PLP2参数完全相同
-            wordcloud = WordCloud(
-                width=800, 
-                height=400, 
-                background_color='white'
-            ).generate(text_pos)
-            
-            # 显示词云
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud, interpolation="bilinear")
-            ax.axis("off")
-            ax.set_title("Word Cloud of Positive Entities")
-            st.pyplot(fig)
-        else:
-            st.write("No positive entities found.")
-    
-    else:
-        # 高级词云版本 - 三列布局
-        cloud_col1, cloud_col2, cloud_col3 = st.columns(3)
+            if "positive" in images:
+                st.image(images["positive"], use_container_width=True)
+            else:
+                st.write("No positive entities found.")
         
-        with cloud_col1:
-            st.write("Positive Entities (Sentiment > 0.6)")
-            positive_entities = df_entity_summary[df_entity_summary["Avg_Sentiment"] > 0.6]
+        else:
+            # 高级词云版本 - 三列布局
+            images = load_wordclouds(STYLE_WEIGHTED)
+            cloud_col1, cloud_col2, cloud_col3 = st.columns(3)
             
-            if len(positive_entities) > 0:
-                # 创建频率字典
-                freq_dict = {}
-                for _, row in positive_entities.iterrows():
-                    entity = row["Entity"]
-                    sentiment = row["Avg_Sentiment"]
-                    # 确保使用行中的Frequency字段
-                    frequency = row.get("Frequency", 1)  # 如果没有频率字段，默认为1
-                    # 使用频率和情感得分的组合作为权重
-                    weight = frequency * (1 + sentiment)
-                    freq_dict[entity] = freq_dict.get(entity, 0) + weight
-                
-                if freq_dict:
-                    # 创建词云
-                    wordcloud = WordCloud(
-                        width=300, 
-                        height=300, 
-                        background_color='white',
-                        colormap='Blues',
-                        max_font_size=100
-                    ).generate_from_frequencies(freq_dict)
-                    
-                    # 显示词云
-                    fig, ax = plt.subplots(figsize=(5, 5))
-                    ax.imshow(wordcloud, interpolation="bilinear")
-                    ax.axis("off")
-                    st.pyplot(fig)
+            with cloud_col1:
+                st.write("Positive Entities (Sentiment > 0.6)")
+                if "positive" in images:
+                    st.image(images["positive"], use_container_width=True)
                 else:
                     st.write("No positive entities found.")
-            else:
-                st.write("No positive entities found.")
-        
-        with cloud_col2:
-            st.write("Neutral Entities (0.4 ≤ Sentiment ≤ 0.6)")
-            neutral_entities = df_entity_summary[(df_entity_summary["Avg_Sentiment"] >= 0.4) & 
-                                            (df_entity_summary["Avg_Sentiment"] <= 0.6)]
             
-            if len(neutral_entities) > 0:
-                # 创建频率字典
-                freq_dict = {}
-                for _, row in neutral_entities.iterrows():
-                    entity = row["Entity"]
-                    # 确保使用行中的Frequency字段
-                    frequency = row.get("Frequency", 1)  # 如果没有频率字段，默认为1
-                    freq_dict[entity] = freq_dict.get(entity, 0) + frequency
-                
-                if freq_dict:
-                    # 创建词云
-                    wordcloud = WordCloud(
-                        width=300, 
-                        height=300, 
-                        background_color='white',
-                        colormap='Greys',
-                        max_font_size=100
-                    ).generate_from_frequencies(freq_dict)
-                    
-                    # 显示词云
-                    fig, ax = plt.subplots(figsize=(5, 5))
-                    ax.imshow(wordcloud, interpolation="bilinear")
-                    ax.axis("off")
-                    st.pyplot(fig)
+            with cloud_col2:
+                st.write("Neutral Entities (0.4 ≤ Sentiment ≤ 0.6)")
+                if "neutral" in images:
+                    st.image(images["neutral"], use_container_width=True)
                 else:
                     st.write("No neutral entities found.")
-            else:
-                st.write("No neutral entities found.")
-        
-        with cloud_col3:
-            st.write("Negative Entities (Sentiment < 0.4)")
-            negative_entities = df_entity_summary[df_entity_summary["Avg_Sentiment"] < 0.4]
             
-            if len(negative_entities) > 0:
-                # 创建频率字典
-                freq_dict = {}
-                for _, row in negative_entities.iterrows():
-                    entity = row["Entity"]
-                    sentiment = row["Avg_Sentiment"]
-                    # 确保使用行中的Frequency字段
-                    frequency = row.get("Frequency", 1)  # 如果没有频率字段，默认为1
-                    # 使用频率和情感得分的绝对值作为权重
-                    weight = frequency * (1 + abs(sentiment))
-                    freq_dict[entity] = freq_dict.get(entity, 0) + weight
-                
-                if freq_dict:
-                    # 创建词云
-                    wordcloud = WordCloud(
-                        width=300, 
-                        height=300, 
-                        background_color='white',
-                        colormap='Reds',
-                        max_font_size=100
-                    ).generate_from_frequencies(freq_dict)
-                    
-                    # 显示词云
-                    fig, ax = plt.subplots(figsize=(5, 5))
-                    ax.imshow(wordcloud, interpolation="bilinear")
-                    ax.axis("off")
-                    st.pyplot(fig)
+            with cloud_col3:
+                st.write("Negative Entities (Sentiment < 0.4)")
+                if "negative" in images:
+                    st.image(images["negative"], use_container_width=True)
                 else:
                     st.write("No negative entities found.")
-            else:
-                st.write("No negative entities found.")
+    
+    wordcloud_section()
     
     # # 6. 添加交互式散点图 - 实体频率与情感
     # st.subheader("Entity Frequency vs. Sentiment")
@@ -4,6 +4,7 @@ import numpy as np
 import altair as alt
 import plotly.express as px
 import plotly.graph_objects as go
+from app.utils.figures import webgl_if_large
 
 def show_sentiment_methods(aspects_data):
     st.header("Sentiment Analysis Methods Comparison")
@@ -159,7 +160,7 @@ def show_sentiment_methods(aspects_data):
         )
         
         fig.update_layout(height=250 * len(selected_methods))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(webgl_if_large(fig), use_container_width=True)
         
         # 计算方法间的相关性
         corr_matrix = scatter_data[selected_methods].corr()
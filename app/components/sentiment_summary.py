@@ -7,6 +7,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import seaborn as sns
 import matplotlib.pyplot as plt
+from app.data.datasets import dataset_version
+from app.utils.figures import plotly_chart
+from app.utils.rendering import show_png
 
 def show_sentiment_summary():
     # st.header("Video-Level Summary")
@@ -21,6 +24,7 @@ def show_sentiment_summary():
     
     try:
         df = pd.read_csv('data/video_sentiment_summary.csv')
+        data_version = dataset_version('data/video_sentiment_summary.csv')
         
         summary = df.groupby("Content Creator").agg({
             "Positive Comments": "sum",
@@ -79,69 +83,77 @@ def show_sentiment_summary():
 
         with col2:
             st.subheader("Average Positive Sentiment per Content Creator")
-            # Create bar chart with Pyplot
-            fig, ax = plt.subplots(figsize=(10, 5))
-            sns.barplot(data=summary.sort_values("% Positive", ascending=False),
-                        x="Content Creator", y="% Positive", palette="Blues_d", ax=ax)
-            plt.title("Average Positive Sentiment per Content Creator")
-            plt.xticks(rotation=45, ha="right")
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Create bar chart with matplotlib (rendered to cached PNG)
+            def draw_ranking(fig):
+                ax = fig.subplots()
+                sns.barplot(data=summary.sort_values("% Positive", ascending=False),
+                            x="Content Creator", y="% Positive", palette="Blues_d", ax=ax)
+                ax.set_title("Average Positive Sentiment per Content Creator")
+                ax.tick_params(axis="x", labelrotation=45)
+                for label in ax.get_xticklabels():
+                    label.set_horizontalalignment("right")
+                fig.tight_layout()
+            
+            show_png("positive_ranking", (summary,), draw_ranking, figsize=(10, 5))
 
         # Sentiment stacked bar chart
         st.subheader("Sentiment Breakdown per Content Creator")
         
         # Create stacked bar chart
-        fig = px.bar(
-            summary,
-            x="Content Creator",
-            y=["Positive Comments", "Negative Comments", "Neutral Comments"],
-            title="Sentiment Breakdown per Content Creator",
-            labels={"value": "Number of Comments", "variable": "Sentiment"},
-            barmode="stack",
-            color_discrete_sequence=["#2ca02c", "#d62728", "#1f77b4"]  # Custom colors for positive, negative, neutral
-        )
-        
-        fig.update_layout(
-            xaxis_title="Content Creator",
-            yaxis_title="Number of Comments",
-            legend_title="Sentiment",
-            bargap=0.15,
-            height=500
-        )
+        def build_breakdown():
+            fig = px.bar(
+                summary,
+                x="Content Creator",
+                y=["Positive Comments", "Negative Comments", "Neutral Comments"],
+                title="Sentiment Breakdown per Content Creator",
+                labels={"value": "Number of Comments", "variable": "Sentiment"},
+                barmode="stack",
+                color_discrete_sequence=["#2ca02c", "#d62728", "#1f77b4"]  # Custom colors for positive, negative, neutral
+            )
+            
+            fig.update_layout(
+                xaxis_title="Content Creator",
+                yaxis_title="Number of Comments",
+                legend_title="Sentiment",
+                bargap=0.15,
+                height=500
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart("sentiment_breakdown", data_version, {}, build_breakdown)
         
         # Add sentiment distribution radar chart
         st.subheader("Sentiment distribution radar chart")
         
         # Prepare radar chart data
-        fig = go.Figure()
-        
-        for creator in summary["Content Creator"]:
-            creator_data = summary[summary["Content Creator"] == creator]
-            fig.add_trace(go.Scatterpolar(
-                r=[
-                    creator_data["% Positive"].iloc[0],
-                    creator_data["% Negative"].iloc[0],
-                    creator_data["% Neutral"].iloc[0]
-                ],
-                theta=["Positive", "Negative", "Neutral"],
-                fill='toself',
-                name=creator
-            ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                )
-            ),
-            showlegend=True,
-            height=500
-        )
+        def build_radar():
+            fig = go.Figure()
+            
+            for creator in summary["Content Creator"]:
+                creator_data = summary[summary["Content Creator"] == creator]
+                fig.add_trace(go.Scatterpolar(
+                    r=[
+                        creator_data["% Positive"].iloc[0],
+                        creator_data["% Negative"].iloc[0],
+                        creator_data["% Neutral"].iloc[0]
+                    ],
+                    theta=["Positive", "Negative", "Neutral"],
+                    fill='toself',
+                    name=creator
+                ))
+            
+            fig.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        visible=True,
+                    )
+                ),
+                showlegend=True,
+                height=500
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart("sentiment_radar", data_version, {}, build_radar)
         
         # Add sentiment percentage comparison
         st.subheader("Sentiment Percentage Comparison")
@@ -155,32 +167,34 @@ def show_sentiment_summary():
         )
         
         # Create grouped bar chart
-        fig = px.bar(
-            melted,
-            x="Content Creator",
-            y="Percentage",
-            color="Sentiment",
-            barmode="group",
-            title="Sentiment Percentage Comparison per Creator",
-            labels={"Percentage": "Sentiment (%)"},
-            color_discrete_map={
-                "% Positive": "#2ca02c", 
-                "% Negative": "#d62728", 
-                "% Neutral": "#1f77b4"
-            }
-        )
-        
-        # Enhance layout
-        fig.update_layout(
-            yaxis=dict(range=[0, 100]),
-            xaxis_title="Content Creator",
-            yaxis_title="Percentage",
-            legend_title="Sentiment Type",
-            bargap=0.2,
-            height=500
-        )
+        def build_percentages():
+            fig = px.bar(
+                melted,
+                x="Content Creator",
+                y="Percentage",
+                color="Sentiment",
+                barmode="group",
+                title="Sentiment Percentage Comparison per Creator",
+                labels={"Percentage": "Sentiment (%)"},
+                color_discrete_map={
+                    "% Positive": "#2ca02c", 
+                    "% Negative": "#d62728", 
+                    "% Neutral": "#1f77b4"
+                }
+            )
+            
+            # Enhance layout
+            fig.update_layout(
+                yaxis=dict(range=[0, 100]),
+                xaxis_title="Content Creator",
+                yaxis_title="Percentage",
+                legend_title="Sentiment Type",
+                bargap=0.2,
+                height=500
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart("sentiment_percentages", data_version, {}, build_percentages)
         
         # Add pie charts for each creator
         st.subheader("Sentiment Distribution by Creator")
@@ -205,26 +219,28 @@ def show_sentiment_summary():
                     
                     with cols[col_idx]:
                         st.write(f"**{creator_name}**")
-                        fig = go.Figure(
-                            go.Pie(
-                                labels=["Positive", "Negative", "Neutral"],
-                                values=[
-                                    row_data["Positive Comments"],
-                                    row_data["Negative Comments"],
-                                    row_data["Neutral Comments"]
-                                ],
-                                textinfo='percent',
-                                hole=0.4,  # Make it a donut chart
-                                marker=dict(colors=["#2ca02c", "#d62728", "#1f77b4"])
+                        def build_pie():
+                            fig = go.Figure(
+                                go.Pie(
+                                    labels=["Positive", "Negative", "Neutral"],
+                                    values=[
+                                        row_data["Positive Comments"],
+                                        row_data["Negative Comments"],
+                                        row_data["Neutral Comments"]
+                                    ],
+                                    textinfo='percent',
+                                    hole=0.4,  # Make it a donut chart
+                                    marker=dict(colors=["#2ca02c", "#d62728", "#1f77b4"])
+                                )
                             )
-                        )
-                        
-                        fig.update_layout(
-                            height=250,
-                            margin=dict(t=20, b=0, l=0, r=0)
-                        )
+                            
+                            fig.update_layout(
+                                height=250,
+                                margin=dict(t=20, b=0, l=0, r=0)
+                            )
+                            return fig
                         
-                        st.plotly_chart(fig, use_container_width=True)
+                        plotly_chart("creator_pie", data_version, {"creator": creator_name}, build_pie)
         
         # Add download functionality for data
         st.subheader("Download Analysis Data")
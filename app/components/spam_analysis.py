@@ -4,6 +4,7 @@ import pandas as pd
 import os
 import matplotlib.pyplot as plt
 import time
+from app.utils.jobs import get_scheduler, get_user_id, show_job_status, PRIORITY_INTERACTIVE, PRIORITY_BULK
 
 @st.cache_resource
 def load_model_and_vectorizer(model_version):
@@ -71,6 +72,61 @@ def load_all_models_and_predict(comment):
     
     return results
 
+def predict_batch(comments, model_version, job=None, chunk_size=500):
+    """Predict a list of comments with one model, reporting progress to the job"""
+    model, vectorizer, status = load_model_and_vectorizer(model_version)
+    if isinstance(status, str):
+        raise RuntimeError(f"Could not load model v{model_version}: {status}")
+
+    predictions = []
+    total = len(comments)
+    for start in range(0, total, chunk_size):
+        if job is not None and job.cancelled:
+            break
+        chunk = [c if isinstance(c, str) else "" for c in comments[start:start + chunk_size]]
+        predictions.extend(model.predict(vectorizer.transform(chunk).toarray()))
+        if job is not None:
+            job.set_progress(min(start + chunk_size, total) / total)
+
+    return pd.DataFrame({"Comment": comments[:len(predictions)], "Prediction": predictions})
+
+def batch_job_status():
+    """Status and results of the current user's batch job"""
+    job_id = st.session_state.get("spam_batch_job")
+    if not job_id:
+        return
+    job = show_job_status(job_id)
+    if job is None:
+        if st.button("Cancel Batch"):
+            get_scheduler().cancel(job_id)
+        return
+    if st.session_state.get("spam_batch_polling"):
+        # 任务结束后整页重跑一次，去掉轮询计时器
+        st.session_state.spam_batch_polling = False
+        st.rerun()
+    if job.result is not None:
+        result_df = job.result
+        spam_total = (result_df["Prediction"] == "SPAM COMMENT").sum()
+        st.metric("Spam in batch", f"{spam_total} / {len(result_df)}")
+        st.dataframe(result_df, use_container_width=True)
+        # CSV 只生成一次，之后的重跑直接复用
+        if st.session_state.get("spam_batch_csv", (None, None))[0] != job_id:
+            st.session_state.spam_batch_csv = (job_id, result_df.to_csv(index=False).encode("utf-8"))
+        st.download_button(
+            label="Download Predictions as CSV",
+            data=st.session_state.spam_batch_csv[1],
+            file_name="spam_batch_predictions.csv",
+            mime="text/csv",
+        )
+
+def show_batch_job_status():
+    """Poll the current user's batch job without rerunning the whole page, only while it is queued or running"""
+    job_id = st.session_state.get("spam_batch_job")
+    job = get_scheduler().get(job_id) if job_id else None
+    active = job is not None and not job.finished
+    st.session_state.spam_batch_polling = active
+    st.fragment(batch_job_status, run_every=1.0 if active else None)()
+
 def show_spam_analysis():
     # Custom CSS for better styling
     st.markdown("""
@@ -204,9 +260,21 @@ def show_spam_analysis():
             # Add a slight delay for UX
             time.sleep(0.5)
             
-            # Get results from all models
-            all_results = load_all_models_and_predict(user_input)
+            # Get results from all models - runs on the shared worker pool at
+            # interactive priority so it is never stuck behind bulk batches
+            job = get_scheduler().submit(
+                get_user_id(), load_all_models_and_predict, user_input,
+                priority=PRIORITY_INTERACTIVE, label="Analyze comment"
+            )
+            try:
+                all_results = job.wait(timeout=60)
+            except TimeoutError:
+                get_scheduler().cancel(job.id)
+                all_results = None
             
+        if all_results is None:
+            st.error("The analysis did not finish within 60 seconds. Please try again.")
+        else:
             # Update statistics based on primary model
             primary_result = all_results[st.session_state.primary_model]["result"] if not all_results[st.session_state.primary_model]["is_error"] else "ERROR"
             
@@ -254,7 +322,7 @@ def show_spam_analysis():
     
     # Content Tabs
     # st.markdown("---")
-    tab1, tab2, tab3 = st.tabs(["History", "Model Information", "Instructions"])
+    tab1, tab_batch, tab2, tab3 = st.tabs(["History", "Batch Analysis", "Model Information", "Instructions"])
     
     with tab1:
         if st.session_state.history:
@@ -270,6 +338,26 @@ def show_spam_analysis():
         else:
             st.info("No history yet. Analyzed comments will appear here.")
     
+    with tab_batch:
+        st.write("Upload a CSV file to classify many comments at once. Batches run in the background at low priority.")
+        uploaded_file = st.file_uploader("Comments CSV", type=["csv"])
+        if uploaded_file is not None:
+            batch_df = pd.read_csv(uploaded_file)
+            comment_column = st.selectbox("Comment column", batch_df.columns)
+            if st.button("Run Batch Analysis", type="primary"):
+                # 新批次替换旧批次，先取消旧的，避免占用该用户的并发名额
+                previous_job = st.session_state.get("spam_batch_job")
+                if previous_job:
+                    get_scheduler().cancel(previous_job)
+                job = get_scheduler().submit(
+                    get_user_id(), predict_batch,
+                    batch_df[comment_column].tolist(), st.session_state.primary_model,
+                    priority=PRIORITY_BULK,
+                    label=f"Batch of {len(batch_df)} comments"
+                )
+                st.session_state.spam_batch_job = job.id
+        show_batch_job_status()
+
     with tab2:
         st.markdown("""
         <div class="model-info">
@@ -307,7 +395,8 @@ def show_spam_analysis():
         3. **View the results** from each model displayed as color-coded cards.
         4. **Select a primary model** from the dropdown to determine which model's results are used for statistics.
         5. **Check the History tab** to view previously analyzed comments.
-        6. **Explore the Model Information tab** to learn about the different algorithms used.
+        6. **Use the Batch Analysis tab** to classify a whole CSV of comments with the primary model.
+        7. **Explore the Model Information tab** to learn about the different algorithms used.
         
         ### Understanding Results
         
@@ -5,6 +5,10 @@ import seaborn as sns
 import random
 import numpy as np
 from datetime import datetime
+from app.data.spam import load_spam_comments, load_spam_cube, slice_cube, rollup, sample_comments
+from app.data.search import search_comment_rows, fetch_page
+from app.data.similarity import find_similar_comments
+from app.utils.rendering import show_png
 
 def show_spam_summary(selected_creator=None):
     """
@@ -25,46 +29,39 @@ def show_spam_summary(selected_creator=None):
         # st.markdown("<h1 class='main-header'>Video Comments Analysis</h1>", unsafe_allow_html=True)
     st.markdown("---")
 
-    # Load data
+    # Load data (comment rows are shared read-only; aggregates come from the precomputed cube)
     try:
-        df = pd.read_csv('data/comments_analysis_v4.csv')
-        # Convert timestamp to datetime
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        df = load_spam_comments()
+        cube = load_spam_cube()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return
     
-    # Basic data cleaning
-    df['is_spam'] = df['Prediction'] == 'SPAM COMMENT'
-    
-    # Display basic stats
-    total_comments = len(df)
-    spam_count = df['is_spam'].sum()
-    spam_percentage = (spam_count / total_comments) * 100 if total_comments > 0 else 0
-    
     # Filter by creator if specified
+    cube_filtered = slice_cube(cube, selected_creator)
     if selected_creator:
-        df_filtered = df[df['Content Creator'] == selected_creator]
-        if len(df_filtered) == 0:
+        if cube_filtered.empty:
             st.warning(f"No data found for: {selected_creator}")
             return
+        df_filtered = df[df['Content Creator'] == selected_creator]
         st.subheader(f"Analysis for ⭐{selected_creator}⭐")
     else:
         df_filtered = df
         st.subheader("Overall Analysis")
     
     # Create columns for metrics
+    total_count = int(cube_filtered['total'].sum())
+    creator_spam_count = int(cube_filtered['spam'].sum())
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Comments", len(df_filtered))
+        st.metric("Total Comments", total_count)
     
     with col2:
-        creator_spam_count = df_filtered['is_spam'].sum()
         st.metric("Spam Comments", creator_spam_count)
     
     with col3:
-        creator_spam_percentage = (creator_spam_count / len(df_filtered)) * 100 if len(df_filtered) > 0 else 0
+        creator_spam_percentage = (creator_spam_count / total_count) * 100 if total_count > 0 else 0
         st.metric("Spam Percentage", f"{creator_spam_percentage:.1f}%")
     
     # Visualizations section
@@ -78,68 +75,79 @@ def show_spam_summary(selected_creator=None):
         
         with col1:
             # Pie chart of spam vs non-spam
-            fig, ax = plt.subplots(figsize=(8, 6))
-            labels = ['Spam', 'Not Spam']
             sizes = [
-                df_filtered['is_spam'].sum(),
-                len(df_filtered) - df_filtered['is_spam'].sum()
+                creator_spam_count,
+                total_count - creator_spam_count
             ]
-            colors = ['#ff9999', '#66b3ff']
-            explode = (0.1, 0)
             
-            ax.pie(sizes, explode=explode, labels=labels, colors=colors,
-                   autopct='%1.1f%%', shadow=True, startangle=90)
-            ax.axis('equal')
-            plt.title('Spam vs. Non-Spam Comments')
-            st.pyplot(fig)
+            def draw_pie(fig):
+                ax = fig.subplots()
+                labels = ['Spam', 'Not Spam']
+                colors = ['#ff9999', '#66b3ff']
+                explode = (0.1, 0)
+                
+                ax.pie(sizes, explode=explode, labels=labels, colors=colors,
+                       autopct='%1.1f%%', shadow=True, startangle=90)
+                ax.axis('equal')
+                ax.set_title('Spam vs. Non-Spam Comments')
+            
+            show_png("spam_pie", (sizes,), draw_pie, figsize=(8, 6))
         
         with col2:
             if not selected_creator:
                 # Bar chart showing spam percentage by creator
-                creator_spam = df.groupby('Content Creator')['is_spam'].agg(['sum', 'count'])
-                creator_spam['percentage'] = creator_spam['sum'] / creator_spam['count'] * 100
+                creator_spam = rollup(cube, 'Content Creator')
+                
+                def draw_creator_bars(fig):
+                    ax = fig.subplots()
+                    sns.barplot(x=creator_spam.index, y=creator_spam['percentage'], palette='viridis', ax=ax)
+                    ax.tick_params(axis='x', labelrotation=45)
+                    for label in ax.get_xticklabels():
+                        label.set_horizontalalignment('right')
+                    ax.set_title('Spam Percentage by Content Creator')
+                    ax.set_ylabel('Spam Percentage (%)')
+                    ax.set_xlabel('Content Creator')
+                    fig.tight_layout()
                 
-                fig, ax = plt.subplots(figsize=(10, 6))
-                sns.barplot(x=creator_spam.index, y=creator_spam['percentage'], palette='viridis', ax=ax)
-                plt.xticks(rotation=45, ha='right')
-                plt.title('Spam Percentage by Content Creator')
-                plt.ylabel('Spam Percentage (%)')
-                plt.xlabel('Content Creator')
-                plt.tight_layout()
-                st.pyplot(fig)
+                show_png("spam_by_creator", (creator_spam,), draw_creator_bars)
             else:
                 # For selected creator, show video-wise spam distribution if available
-                if 'Video ID' in df_filtered.columns and df_filtered['Video ID'].nunique() > 1:
-                    video_spam = df_filtered.groupby('Video ID')['is_spam'].agg(['sum', 'count'])
-                    video_spam['percentage'] = video_spam['sum'] / video_spam['count'] * 100
+                video_spam = rollup(cube_filtered, 'Video ID')
+                if len(video_spam) > 1:
+                    def draw_video_bars(fig):
+                        ax = fig.subplots()
+                        sns.barplot(x=video_spam.index, y=video_spam['percentage'], palette='viridis', ax=ax)
+                        ax.tick_params(axis='x', labelrotation=90)
+                        ax.set_title('Spam Percentage by Video')
+                        ax.set_ylabel('Spam Percentage (%)')
+                        ax.set_xlabel('Video ID')
+                        fig.tight_layout()
                     
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    sns.barplot(x=video_spam.index, y=video_spam['percentage'], palette='viridis', ax=ax)
-                    plt.xticks(rotation=90)
-                    plt.title('Spam Percentage by Video')
-                    plt.ylabel('Spam Percentage (%)')
-                    plt.xlabel('Video ID')
-                    plt.tight_layout()
-                    st.pyplot(fig)
+                    show_png("spam_by_video", (video_spam,), draw_video_bars)
 
                     # Additional analysis section
                     st.subheader("Additional Analysis")
                     
                     # Comment length analysis
-                    df_filtered['comment_length'] = df_filtered['Comment'].str.len()
+                    length_data = pd.DataFrame({
+                        'comment_length': df_filtered['Comment'].str.len(),
+                        'is_spam': df_filtered['is_spam']
+                    })
                     
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    sns.histplot(data=df_filtered, x='comment_length', hue='is_spam', 
-                                multiple='stack', bins=30, palette=['blue', 'red'])
-                    plt.title('Comment Length Distribution')
-                    plt.xlabel('Comment Length (characters)')
-                    plt.ylabel('Count')
-                    plt.legend(['Not Spam', 'Spam'])
-                    st.pyplot(fig)
+                    def draw_lengths(fig):
+                        ax = fig.subplots()
+                        sns.histplot(data=length_data, x='comment_length', hue='is_spam', 
+                                    multiple='stack', bins=30, palette=['blue', 'red'], ax=ax)
+                        ax.set_title('Comment Length Distribution')
+                        ax.set_xlabel('Comment Length (characters)')
+                        ax.set_ylabel('Count')
+                        ax.legend(['Not Spam', 'Spam'])
+                    
+                    show_png("spam_comment_lengths", (length_data,), draw_lengths)
                     
                     # Average comment length comparison
-                    avg_length_spam = df_filtered[df_filtered['is_spam']]['comment_length'].mean()
-                    avg_length_nonspam = df_filtered[~df_filtered['is_spam']]['comment_length'].mean()
+                    avg_length_spam = length_data.loc[length_data['is_spam'], 'comment_length'].mean()
+                    avg_length_nonspam = length_data.loc[~length_data['is_spam'], 'comment_length'].mean()
                     
                     col1, col2 = st.columns(2)
                     with col1:
@@ -170,32 +178,32 @@ def show_spam_summary(selected_creator=None):
     
     with tab2:
         # Time series analysis if timestamp data is available
-        if 'Timestamp' in df_filtered.columns and df_filtered['Timestamp'].notna().any():
-            df_filtered['year_month'] = df_filtered['Timestamp'].dt.strftime('%Y-%m')
-            
-            # Group by year-month and calculate spam percentage
-            time_analysis = df_filtered.groupby('year_month')['is_spam'].agg(['sum', 'count']).reset_index()
-            time_analysis['percentage'] = time_analysis['sum'] / time_analysis['count'] * 100
+        time_analysis = rollup(cube_filtered, 'year_month').sort_index().reset_index()
+        if not time_analysis.empty:
             
             # Plot the time series
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.plot(time_analysis['year_month'], time_analysis['percentage'], marker='o', linestyle='-')
-            ax.set_xlabel('Time Period')
-            ax.set_ylabel('Spam Percentage (%)')
-            ax.set_title('Spam Comment Trend Over Time')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            st.pyplot(fig)
+            def draw_trend(fig):
+                ax = fig.subplots()
+                ax.plot(time_analysis['year_month'], time_analysis['percentage'], marker='o', linestyle='-')
+                ax.set_xlabel('Time Period')
+                ax.set_ylabel('Spam Percentage (%)')
+                ax.set_title('Spam Comment Trend Over Time')
+                ax.tick_params(axis='x', labelrotation=45)
+                fig.tight_layout()
+            
+            show_png("spam_trend", (time_analysis,), draw_trend, figsize=(12, 6))
             
             # Additional visualization: Volume of comments over time
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.bar(time_analysis['year_month'], time_analysis['count'], color='skyblue')
-            ax.set_xlabel('Time Period')
-            ax.set_ylabel('Number of Comments')
-            ax.set_title('Comment Volume Over Time')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            st.pyplot(fig)
+            def draw_volume(fig):
+                ax = fig.subplots()
+                ax.bar(time_analysis['year_month'], time_analysis['total'], color='skyblue')
+                ax.set_xlabel('Time Period')
+                ax.set_ylabel('Number of Comments')
+                ax.set_title('Comment Volume Over Time')
+                ax.tick_params(axis='x', labelrotation=45)
+                fig.tight_layout()
+            
+            show_png("spam_volume", (time_analysis,), draw_volume, figsize=(12, 6))
         else:
             st.info("Timestamp data not available for time series analysis")
     
@@ -205,13 +213,10 @@ def show_spam_summary(selected_creator=None):
         
         # Button to show random spam comments
         if st.button("Show Random Spam Comments"):
-            spam_comments = df_filtered[df_filtered['is_spam'] == True]
+            sampled_comments = sample_comments(True, selected_creator, k=10)
             
-            if len(spam_comments) > 0:
-                sample_size = min(10, len(spam_comments))
-                sampled_comments = spam_comments.sample(sample_size)
-                
-                for i, (idx, row) in enumerate(sampled_comments.iterrows()):
+            if len(sampled_comments) > 0:
+                for i, row in enumerate(sampled_comments.to_dict('records')):
                     with st.expander(f"Spam Comment #{i+1} - {row['Content Creator']}"):
                         st.write(f"**Comment:** {row['Comment']}")
                         if pd.notna(row['Timestamp']):
@@ -223,13 +228,10 @@ def show_spam_summary(selected_creator=None):
         
         # Button to show random non-spam comments for comparison
         if st.button("Show Random Non-Spam Comments"):
-            nonspam_comments = df_filtered[df_filtered['is_spam'] == False]
+            sampled_comments = sample_comments(False, selected_creator, k=10)
             
-            if len(nonspam_comments) > 0:
-                sample_size = min(10, len(nonspam_comments))
-                sampled_comments = nonspam_comments.sample(sample_size)
-                
-                for i, (idx, row) in enumerate(sampled_comments.iterrows()):
+            if len(sampled_comments) > 0:
+                for i, row in enumerate(sampled_comments.to_dict('records')):
                     with st.expander(f"Non-Spam Comment #{i+1} - {row['Content Creator']}"):
                         st.write(f"**Comment:** {row['Comment']}")
                         if pd.notna(row['Timestamp']):
@@ -238,4 +240,41 @@ def show_spam_summary(selected_creator=None):
                             st.write(f"**Video:** {row['Video Title']}")
             else:
                 st.info("No non-spam comments found")
+        
+        # Keyword search over every comment
+        st.subheader("Search Comments")
+        st.caption('Words are combined with AND; use OR between alternatives and "quotes" for exact phrases (URLs and @users work as phrases).')
+        search_col1, search_col2 = st.columns([3, 1])
+        with search_col1:
+            search_query = st.text_input("Search query", placeholder='e.g. "bit.ly" OR giveaway')
+        with search_col2:
+            label_option = st.selectbox("Label", ["All", "Spam", "Non-Spam"])
+        
+        if search_query:
+            is_spam_filter = {"All": None, "Spam": True, "Non-Spam": False}[label_option]
+            page_size = 20
+            hit_rows = search_comment_rows(search_query, selected_creator, is_spam_filter)
+            total_hits = len(hit_rows)
+            total_pages = max(1, (total_hits + page_size - 1) // page_size)
+            page_number = st.number_input("Results page", min_value=1, max_value=total_pages, value=1, step=1)
+            hits = fetch_page(hit_rows, page_number, page_size)
+            
+            st.write(f"**{total_hits}** matching comments (page {page_number} of {total_pages})")
+            if total_hits > 0:
+                st.dataframe(
+                    hits[['Content Creator', 'Comment', 'Timestamp', 'Prediction']],
+                    use_container_width=True,
+                    hide_index=True
+                )
+        
+        # Nearest neighbours in the spam models' TF-IDF space
+        st.subheader("Find Similar Comments")
+        st.caption("Paste a comment to find the most similar comments in the corpus, e.g. to spot coordinated spam.")
+        similar_query = st.text_area("Comment to compare", height=80)
+        if st.button("Find Similar Comments") and similar_query.strip():
+            similar = find_similar_comments(similar_query, k=10, creator=selected_creator)
+            if similar.empty:
+                st.info("No similar comments found")
+            else:
+                st.dataframe(similar, use_container_width=True, hide_index=True)
     
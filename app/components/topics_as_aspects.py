@@ -6,6 +6,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import seaborn as sns
+from app.utils.figures import webgl_if_large
 
 def show_topics_as_aspects():
 
@@ -34,7 +35,7 @@ def show_topics_as_aspects():
                             title="VADER vs RoBERTa Sentiment Scores",
                             labels={"vader_sentiment": "VADER Sentiment", "sentiment_roberta": "RoBERTa Sentiment"},
                             opacity=0.6)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(webgl_if_large(fig), use_container_width=True)
     except Exception as e:
         st.error(f"Error loading or processing the first dataset: {e}")
     
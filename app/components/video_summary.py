@@ -6,6 +6,94 @@ import plotly.express as px
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import seaborn as sns
+from app.data.datasets import dataset_version
+from app.data.comment_sentiment import (
+    COMMENT_SENTIMENT_PATH, load_comment_sentiment, load_sentiment_histogram, load_comment_viewer
+)
+from app.utils.figures import plotly_chart, webgl_if_large
+from app.utils.downsample import downsample_frame, point_budget
+from app.data.activity import (
+    COMMENT_TIME_SERIES_PATH, RESOLUTIONS, WEEKDAYS,
+    load_comment_time_series, choose_resolution, load_activity_heatmap, calendar_matrix
+)
+
+def create_binned_histogram(hist, title, xaxis_title, group_column="channel"):
+    """
+    Overlayed percentage histogram drawn from precomputed bins
+    
+    Parameters:
+    -----------
+    hist : DataFrame
+        Output of load_sentiment_histogram (one row per group and bin)
+    """
+    fig = px.bar(
+        hist,
+        x="bin_center",
+        y="percent",
+        color=group_column,
+        title=title,
+        labels={"bin_center": "Sentiment Score", "percent": "Percentage of Comments", "count": "Number of Comments"},
+        hover_data={"bin_start": ":.3f", "bin_end": ":.3f", "count": True, "bin_center": False},
+        opacity=0.7,
+        color_discrete_sequence=px.colors.qualitative.Bold,
+        barmode="overlay"  # Overlay bars for easier comparison between channels
+    )
+    if not hist.empty:
+        fig.update_traces(width=float(hist["bin_end"].iloc[0] - hist["bin_start"].iloc[0]))
+    fig.update_layout(
+        legend_title_text="Channel",
+        xaxis_title=xaxis_title,
+        yaxis_title="Percentage of Comments",
+        bargap=0
+    )
+    return fig
+
+@st.fragment
+def show_comment_viewer(df, default_window=100):
+    """
+    Filterable, sortable window over the comment-level data
+    
+    Filtering and sorting run on the server; only the selected window of
+    rows (the first ``default_window`` by default) is sent to the browser.
+    """
+    viewer = load_comment_viewer()
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        channels = st.multiselect("Channels:", sorted(viewer.categories.get("channel", {})))
+    with col2:
+        comment_search = st.text_input("Comment contains:") if "comment" in viewer.lower else ""
+    with col3:
+        sort_by = st.selectbox("Sort by:", ["(file order)"] + list(df.columns))
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        score_range = st.slider("VADER sentiment range:", -1.0, 1.0, (-1.0, 1.0), step=0.05)
+    with col2:
+        descending = st.checkbox("Descending", value=False)
+    with col3:
+        window_size = st.selectbox("Rows shown:", [default_window, 500, 1000])
+    
+    ranges = {}
+    if score_range != (-1.0, 1.0) and "sentiment_vader" in df.columns:
+        ranges["sentiment_vader"] = score_range
+    rows = viewer.matching_rows(
+        categories={"channel": channels} if channels else None,
+        text={"comment": comment_search} if comment_search else None,
+        ranges=ranges,
+        sort_by=None if sort_by == "(file order)" else sort_by,
+        ascending=not descending
+    )
+    
+    start_row = 0
+    if len(rows) > window_size:
+        start_row = st.number_input(
+            "Start at row:", min_value=1, max_value=len(rows), value=1, step=window_size
+        ) - 1
+    
+    window = viewer.window(rows, start_row, window_size)
+    st.dataframe(window, use_container_width=True)
+    st.caption(f"Showing rows {min(start_row + 1, len(rows))}–{start_row + len(window)} of {len(rows):,} matching comments ({len(df):,} total)")
 
 def show_video_summary():
     col1, col2 = st.columns([2, 8])
@@ -19,10 +107,10 @@ def show_video_summary():
 
     try:
         # Load data
-        df = pd.read_csv("data/comment_sentiment_roberta_and_vader.csv")
+        df = load_comment_sentiment()
 
         st.subheader("Preview of the sentiment data")
-        st.dataframe(df)
+        show_comment_viewer(df)
         # Show data preview in an expandable section
         # with st.expander("Preview of the sentiment data"):
         #     st.dataframe(df.head(10))
@@ -30,45 +118,30 @@ def show_video_summary():
         # Create two columns for the first set of charts
         col1, col2 = st.columns(2)
         
+        # 直方图在服务端分箱，浏览器只接收每个频道的分箱结果
+        data_version = dataset_version(COMMENT_SENTIMENT_PATH)
+        
         # VADER Sentiment Chart
         with col1:
-            fig_vader = px.histogram(
-                df, 
-                x="sentiment_vader", 
-                color="channel",
-                title="VADER Sentiment Distribution by Channel",
-                labels={"sentiment_vader": "Sentiment Score", "count": "Number of Comments"},
-                opacity=0.7,
-                color_discrete_sequence=px.colors.qualitative.Bold,
-                histnorm='percent',  # Show as percentage for better comparison
-                barmode='overlay'  # Overlay bars for easier comparison between channels
-            )
-            fig_vader.update_layout(
-                legend_title_text="Channel",
-                xaxis_title="VADER Sentiment Score (Negative → Positive)",
-                yaxis_title="Percentage of Comments",
+            plotly_chart(
+                "vader_histogram", data_version, {},
+                lambda: create_binned_histogram(
+                    load_sentiment_histogram("sentiment_vader"),
+                    title="VADER Sentiment Distribution by Channel",
+                    xaxis_title="VADER Sentiment Score (Negative → Positive)",
+                )
             )
-            st.plotly_chart(fig_vader, use_container_width=True)
         
         # RoBERTa Sentiment Chart
         with col2:
-            fig_roberta = px.histogram(
-                df, 
-                x="sentiment_roberta", 
-                color="channel",
-                title="RoBERTa ABSA Sentiment Distribution by Channel",
-                labels={"sentiment_roberta": "Sentiment Score", "count": "Number of Comments"},
-                opacity=0.7,
-                color_discrete_sequence=px.colors.qualitative.Bold,
-                histnorm='percent',  # Show as percentage for better comparison
-                barmode='overlay'  # Overlay bars for easier comparison between channels
-            )
-            fig_roberta.update_layout(
-                legend_title_text="Channel",
-                xaxis_title="RoBERTa Sentiment Score (Negative → Positive)",
-                yaxis_title="Percentage of Comments",
+            plotly_chart(
+                "roberta_histogram", data_version, {},
+                lambda: create_binned_histogram(
+                    load_sentiment_histogram("sentiment_roberta"),
+                    title="RoBERTa ABSA Sentiment Distribution by Channel",
+                    xaxis_title="RoBERTa Sentiment Score (Negative → Positive)",
+                )
             )
-            st.plotly_chart(fig_roberta, use_container_width=True)
         
         # Add some analytical insights
         # st.subheader("Sentiment Model Comparison")
@@ -363,126 +436,192 @@ def show_video_summary():
             marker=dict(line=dict(width=1, color='DarkSlateGrey'))
         )
         
-        st.plotly_chart(fig_scatter, use_container_width=True)
+        st.plotly_chart(webgl_if_large(fig_scatter), use_container_width=True)
         
         st.subheader("Number of Comments Over Time by Content Creator")
         try:
-            # 使用正确格式的时间序列数据文件
-            comment_time_series = pd.read_csv("data/comment_time_series_roberta_and_vader..csv")
-            
-            # 将日期列转换为datetime类型
-            comment_time_series['date'] = pd.to_datetime(comment_time_series['date'])
-            
-            # 将宽格式数据转换为长格式以便绘图
-            # 除了date列外的所有列都是创作者
-            creators = comment_time_series.columns[1:]
-            
-            # 使用melt函数转换数据格式
-            melted_df = comment_time_series.melt(
-                id_vars=['date'],
-                value_vars=creators,
-                var_name='channel',
-                value_name='count'
-            )
-            
-            # 使用Plotly创建交互式时间序列图
-            fig = px.line(
-                melted_df, 
-                x="date", 
-                y="count", 
-                color="channel",
-                title="Number of Comments Over Time by Content Creator",
-                labels={"date": "Date", "count": "Number of Comments", "channel": "Content Creator"}
-            )
-            
-            # 改进布局
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Number of Comments",
-                xaxis_tickangle=-45,
-                legend_title="Content Creator",
-                hovermode="x unified",
-                height=500
-            )
-            
-            # 添加范围滑块以便更好地导航日期
-            fig.update_xaxes(rangeslider_visible=True)
-            
-            # 显示图表
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # 添加日期范围选择器，用于更详细的分析
-            st.write("Select date range for more detailed analysis:")
-            
-            # 获取日期范围
-            date_min = comment_time_series['date'].min()
-            date_max = comment_time_series['date'].max()
-            
-            # 转换为日期对象，以便在date_input中使用
-            date_min = pd.to_datetime(date_min).date()
-            date_max = pd.to_datetime(date_max).date()
+            # 使用正确格式的时间序列数据文件（按日期索引，每列一个创作者）
+            daily_counts = load_comment_time_series()
+            time_series_version = dataset_version(COMMENT_TIME_SERIES_PATH)
             
-            selected_range = st.date_input(
-                "Date range", 
-                [date_min, date_max],
-                min_value=date_min,
-                max_value=date_max
-            )
-            
-            if len(selected_range) == 2:
-                # 将选定日期转换为datetime以便过滤
-                start_date = pd.Timestamp(selected_range[0])
-                end_date = pd.Timestamp(selected_range[1])
+            # 片段：分辨率、日期范围和热图选项只重新运行这一部分
+            @st.fragment
+            def comment_activity_section():
+                # 长历史按LTTB降采样（每个创作者保留峰值）并转换为长格式；需要时可切换为完整分辨率
+                full_resolution = st.checkbox(
+                    "Full resolution",
+                    value=False,
+                    help="Plot every daily point instead of a peak-preserving downsample (zooming into the chart does not add points)"
+                )
+                
+                # 使用Plotly创建交互式时间序列图
+                fig = px.line(
+                    downsample_frame(daily_counts, max_points=point_budget(columns=1), full_resolution=full_resolution,
+                                     var_name='channel', value_name='count'), 
+                    x="date", 
+                    y="count", 
+                    color="channel",
+                    title="Number of Comments Over Time by Content Creator",
+                    labels={"date": "Date", "count": "Number of Comments", "channel": "Content Creator"}
+                )
+                
+                # 改进布局
+                fig.update_layout(
+                    xaxis_title="Date",
+                    yaxis_title="Number of Comments",
+                    xaxis_tickangle=-45,
+                    legend_title="Content Creator",
+                    hovermode="x unified",
+                    height=500
+                )
+                
+                # 添加范围滑块以便更好地导航日期
+                fig.update_xaxes(rangeslider_visible=True)
+                
+                # 显示图表
+                st.plotly_chart(webgl_if_large(fig), use_container_width=True)
                 
-                # 过滤数据
-                filtered_df = melted_df[
-                    (melted_df['date'] >= start_date) & 
-                    (melted_df['date'] <= end_date)
-                ]
+                # 添加日期范围选择器，用于更详细的分析
+                st.write("Select date range for more detailed analysis:")
                 
-                # 创建过滤后的视图
-                if not filtered_df.empty:
-                    fig_filtered = px.line(
-                        filtered_df, 
-                        x="date", 
-                        y="count", 
-                        color="channel",
-                        title=f"Comments from {selected_range[0]} to {selected_range[1]}",
-                        labels={"date": "Date", "count": "Number of Comments", "channel": "Content Creator"}
+                # 获取日期范围
+                date_min = daily_counts.index.min()
+                date_max = daily_counts.index.max()
+                
+                # 转换为日期对象，以便在date_input中使用
+                date_min = pd.to_datetime(date_min).date()
+                date_max = pd.to_datetime(date_max).date()
+                
+                selected_range = st.date_input(
+                    "Date range", 
+                    [date_min, date_max],
+                    min_value=date_min,
+                    max_value=date_max
+                )
+                
+                if len(selected_range) == 2:
+                    # 将选定日期转换为datetime以便过滤
+                    start_date = pd.Timestamp(selected_range[0])
+                    end_date = pd.Timestamp(selected_range[1])
+                    
+                    # 过滤数据，再按选定范围重新降采样（范围越小细节越多）
+                    filtered_df = downsample_frame(
+                        daily_counts.loc[start_date:end_date],
+                        max_points=point_budget(columns=1),
+                        full_resolution=full_resolution,
+                        var_name='channel',
+                        value_name='count'
                     )
                     
-                    fig_filtered.update_layout(
-                        xaxis_title="Date",
-                        yaxis_title="Number of Comments",
-                        xaxis_tickangle=-45,
-                        legend_title="Content Creator",
-                        hovermode="x unified"
+                    # 创建过滤后的视图
+                    if not filtered_df.empty:
+                        fig_filtered = px.line(
+                            filtered_df, 
+                            x="date", 
+                            y="count", 
+                            color="channel",
+                            title=f"Comments from {selected_range[0]} to {selected_range[1]}",
+                            labels={"date": "Date", "count": "Number of Comments", "channel": "Content Creator"}
+                        )
+                        
+                        fig_filtered.update_layout(
+                            xaxis_title="Date",
+                            yaxis_title="Number of Comments",
+                            xaxis_tickangle=-45,
+                            legend_title="Content Creator",
+                            hovermode="x unified"
+                        )
+                        
+                        st.plotly_chart(webgl_if_large(fig_filtered), use_container_width=True)
+                    else:
+                        st.warning("No data available for the selected date range.")
+                
+                # 添加评论活跃度热图
+                st.subheader("Comment Activity Heatmap")
+                
+                heatmap_view = st.radio(
+                    "Heatmap view:",
+                    ("Timeline", "Calendar"),
+                    horizontal=True
+                )
+                
+                if heatmap_view == "Timeline":
+                    # 使用上面选择的日期范围；分辨率按范围和创作者数量自动选择
+                    if len(selected_range) == 2:
+                        heatmap_start, heatmap_end = pd.Timestamp(selected_range[0]), pd.Timestamp(selected_range[1])
+                    else:
+                        heatmap_start, heatmap_end = daily_counts.index.min(), daily_counts.index.max()
+                    
+                    resolution_option = st.selectbox(
+                        "Heatmap resolution:",
+                        ["Auto"] + list(RESOLUTIONS)
                     )
+                    if resolution_option == "Auto":
+                        resolution = choose_resolution(heatmap_start, heatmap_end, daily_counts.shape[1])
+                        st.caption(f"Showing {resolution.lower()} totals for the selected date range.")
+                    else:
+                        resolution = resolution_option
+                    
+                    def build_figure():
+                        heatmap_data = load_activity_heatmap(heatmap_start, heatmap_end, resolution)
+                        
+                        # 创建热图
+                        fig = px.imshow(
+                            heatmap_data.T,  # 转置以便创作者在y轴
+                            labels=dict(x="Date", y="Content Creator", color="Comment Count"),
+                            title=f"Comment Activity Heatmap ({resolution})",
+                            color_continuous_scale="YlOrRd",
+                            aspect="auto"
+                        )
+                        
+                        # 调整布局
+                        fig.update_layout(height=500)
+                        return fig
                     
-                    st.plotly_chart(fig_filtered, use_container_width=True)
+                    # 显示热图
+                    plotly_chart(
+                        "activity_heatmap", time_series_version,
+                        {"start": heatmap_start, "end": heatmap_end, "resolution": resolution},
+                        build_figure
+                    )
                 else:
-                    st.warning("No data available for the selected date range.")
-            
-            # 添加评论活跃度热图
-            st.subheader("Comment Activity Heatmap")
-            
-            # 重新整理数据以创建热图 - 使用原始宽格式数据
-            # 将日期设为索引以便更好地显示
-            heatmap_data = comment_time_series.set_index('date')
-            
-            # 创建热图
-            fig = px.imshow(
-                heatmap_data.T,  # 转置以便创作者在y轴
-                labels=dict(x="Date", y="Content Creator", color="Comment Count"),
-                title="Comment Activity Heatmap",
-                color_continuous_scale="YlOrRd"
-            )
-            
-            # 调整布局
-            fig.update_layout(height=500)
+                    # 单个创作者的日历视图（星期 × 周）
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        calendar_creator = st.selectbox("Content Creator:", list(daily_counts.columns))
+                    with col2:
+                        years = sorted(daily_counts.index.year.unique(), reverse=True)
+                        calendar_year = st.selectbox("Year:", years)
+                    
+                    def build_figure():
+                        counts, labels = calendar_matrix(calendar_creator, calendar_year)
+                        fig = go.Figure(go.Heatmap(
+                            z=counts,
+                            y=WEEKDAYS,
+                            x=np.arange(1, counts.shape[1] + 1),
+                            customdata=labels,
+                            colorscale="YlOrRd",
+                            xgap=2,
+                            ygap=2,
+                            hoverongaps=False,
+                            colorbar=dict(title="Comments"),
+                            hovertemplate="%{customdata}<br>Comments: %{z}<extra></extra>"
+                        ))
+                        fig.update_layout(
+                            title=f"Daily Comments for {calendar_creator} in {calendar_year}",
+                            xaxis_title="Week of Year",
+                            yaxis=dict(autorange="reversed"),
+                            height=300
+                        )
+                        return fig
+                    
+                    plotly_chart(
+                        "activity_calendar", time_series_version,
+                        {"creator": calendar_creator, "year": calendar_year},
+                        build_figure
+                    )
             
-            # 显示热图
-            st.plotly_chart(fig, use_container_width=True)
+            comment_activity_section()
             
         except Exception as e:
             st.error(f"Error loading or processing time series data: {e}")
@@ -0,0 +1,94 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from app.data.datasets import dataset_version
+
+COMMENT_TIME_SERIES_PATH = 'data/comment_time_series_roberta_and_vader..csv'
+
+# 热图单元格预算：超过后自动从日合并为周或月
+MAX_HEATMAP_CELLS = 2000
+MIN_HEATMAP_COLUMNS = 30
+
+RESOLUTIONS = {'Daily': 'D', 'Weekly': 'W', 'Monthly': 'M'}
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_comment_time_series(path, version):
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df.set_index('date').sort_index()
+
+
+def load_comment_time_series(path=COMMENT_TIME_SERIES_PATH):
+    """Daily comment counts, one column per creator (treat as read-only)"""
+    return _load_comment_time_series(path, dataset_version(path))
+
+
+def choose_resolution(start, end, n_creators, max_cells=MAX_HEATMAP_CELLS):
+    """
+    Finest of daily / weekly / monthly bins that keeps the heatmap within budget
+
+    The column budget shrinks as more creators (rows) are shown, but never
+    goes below MIN_HEATMAP_COLUMNS.
+    """
+    max_columns = max(MIN_HEATMAP_COLUMNS, max_cells // max(n_creators, 1))
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    if days <= max_columns:
+        return 'Daily'
+    if days / 7 <= max_columns:
+        return 'Weekly'
+    return 'Monthly'
+
+
+@st.cache_resource(max_entries=6, show_spinner=False)
+def _build_binned_activity(path, version, freq):
+    daily = _load_comment_time_series(path, version)
+    if freq == 'D':
+        return daily
+    # 每个日期映射到所在周/月的起始日，一次groupby求和
+    periods = daily.index.to_period(freq).start_time
+    return daily.groupby(periods).sum()
+
+
+def load_activity_heatmap(start=None, end=None, resolution='Daily', path=COMMENT_TIME_SERIES_PATH):
+    """
+    Comment counts binned at ``resolution`` (bin start date x creator)
+
+    Bins are computed once per dataset version and resolution; a date
+    range only slices the cached bins (bins overlapping either end of the
+    range are kept whole).
+    """
+    freq = RESOLUTIONS[resolution]
+    binned = _build_binned_activity(path, dataset_version(path), freq)
+    if start is not None:
+        start = pd.Timestamp(start).to_period(freq).start_time
+    return binned.loc[start:end]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _build_calendar(path, version, creator, year):
+    daily = _load_comment_time_series(path, version)[creator]
+    days = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D')
+    values = daily.reindex(days, fill_value=0).to_numpy(dtype=float)
+
+    # 行为星期几，列为该年的第几周（第一周从1月1日所在的周一算起）
+    offset = days[0].weekday()
+    rows = days.weekday.to_numpy()
+    cols = (np.arange(len(days)) + offset) // 7
+
+    counts = np.full((7, cols[-1] + 1), np.nan)
+    counts[rows, cols] = values
+    labels = np.full(counts.shape, '', dtype=object)
+    labels[rows, cols] = days.strftime('%Y-%m-%d')
+    return counts, labels
+
+
+def calendar_matrix(creator, year, path=COMMENT_TIME_SERIES_PATH):
+    """
+    One creator's daily counts for a year laid out as weekday x week
+
+    Returns (counts, date labels); cells outside the year are NaN / ''.
+    """
+    return _build_calendar(path, dataset_version(path), creator, int(year))
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+
+class SparseAspectMatrix:
+    """
+    Video x aspect scores stored as a CSR matrix
+
+    Videos and aspects are integer-coded (a code is the position in
+    ``videos`` / ``aspects``, both sorted), so memory and slicing cost
+    scale with the non-zero scores rather than videos x aspects. Views
+    slice rows and columns from the matrix and only densify that slice.
+    """
+
+    def __init__(self, matrix, videos, aspects):
+        self.matrix = matrix.tocsr()
+        self.videos = pd.Index(videos, name="video")
+        self.aspects = pd.Index(aspects)
+        self._video_keys = pd.Series(self.videos.astype(str).str.lower())
+
+    @classmethod
+    def from_frame(cls, df, video_column, aspect_columns):
+        """Build from a wide table (one row per video, one column per aspect; first row per video wins)"""
+        df = df.drop_duplicates(video_column).sort_values(video_column, kind="stable")
+        aspects = sorted(aspect_columns)
+        # 稠密转CSR时零值不会被存储
+        matrix = sparse.csr_matrix(df[aspects].to_numpy(dtype=float))
+        return cls(matrix, df[video_column].to_numpy(), aspects)
+
+    def matching_rows(self, search=""):
+        """Row positions whose video id contains ``search`` (case-insensitive)"""
+        search = (search or "").strip().lower()
+        if not search:
+            return np.arange(len(self.videos))
+        return np.flatnonzero(self._video_keys.str.contains(search, regex=False).to_numpy())
+
+    def frame(self, rows=None, columns=None):
+        """Dense DataFrame of a row / column slice"""
+        rows = np.arange(len(self.videos)) if rows is None else rows
+        columns = np.arange(len(self.aspects)) if columns is None else columns
+        block = self.matrix[rows][:, columns].toarray()
+        return pd.DataFrame(block, index=self.videos[rows], columns=self.aspects[columns])
+
+    def strongest_columns(self, k):
+        """Positions of the ``k`` columns with the largest total absolute score, strongest first"""
+        weight = np.asarray(abs(self.matrix).sum(axis=0)).ravel()
+        return np.argsort(-weight, kind="stable")[:k]
+
+    def column_means(self, rows=None):
+        """Mean score per aspect over the given rows (unstored entries count as zero)"""
+        block = self.matrix if rows is None else self.matrix[rows]
+        if block.shape[0] == 0:
+            return pd.Series(np.nan, index=self.aspects)
+        return pd.Series(np.asarray(block.sum(axis=0)).ravel() / block.shape[0], index=self.aspects)
+
+
+# 预计算的每行最大/最小k个话题的上限
+TOP_K_MAX = 20
+
+
+def top_k_columns(values, k, largest=True):
+    """
+    Column positions of the ``k`` largest (or smallest) values of every row, best first
+
+    One vectorized np.argpartition over the whole matrix, then only the
+    k selected values per row are sorted. NaN values rank last.
+    """
+    values = np.asarray(values, dtype=float)
+    k = min(k, values.shape[1])
+    if k == 0:
+        return np.empty((values.shape[0], 0), dtype=np.intp)
+    keyed = -values if largest else values
+    keyed = np.where(np.isnan(keyed), np.inf, keyed)
+    part = np.argpartition(keyed, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(keyed, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class TopAspects:
+    """
+    Highest and lowest scoring aspects of every row (creator), precomputed up to ``max_k``
+
+    Any k <= max_k is then a slice of the stored positions.
+    """
+
+    def __init__(self, scores, max_k=TOP_K_MAX):
+        self.scores = scores
+        self.rows = {label: position for position, label in enumerate(scores.index)}
+        values = scores.to_numpy(dtype=float)
+        self.max_k = min(max_k, values.shape[1])
+        self._highest = top_k_columns(values, self.max_k, largest=True)
+        self._lowest = top_k_columns(values, self.max_k, largest=False)
+
+    def _pick(self, positions, row, k):
+        if k > self.max_k and self.max_k < self.scores.shape[1]:
+            raise ValueError(f"k={k} exceeds the precomputed maximum of {self.max_k}")
+        columns = positions[self.rows[row], :k]
+        return self.scores.iloc[self.rows[row], columns]
+
+    def highest(self, row, k=5):
+        """The k highest scores of a row as a Series (aspect -> score), highest first"""
+        return self._pick(self._highest, row, k)
+
+    def lowest(self, row, k=5):
+        """The k lowest scores of a row as a Series (aspect -> score), lowest first"""
+        return self._pick(self._lowest, row, k)
@@ -0,0 +1,352 @@
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+import pandas as pd
+
+from app.data.datasets import dataset_version, bundle_version
+from app.data.comment_sentiment import COMMENT_SENTIMENT_PATH, load_comment_sentiment
+from app.data.aspect_matrix import SparseAspectMatrix, TopAspects
+from app.data.tfidf_aspects import ASPECT_VIDEO_PATHS, load_aspect_video_counts
+from app.data.aspect_vocabulary import map_labels
+from app.data.time_pyramid import TimePyramid
+from app.utils.anomalies import DEFAULT_WINDOW, DEFAULT_THRESHOLD, detect_anomalies
+
+# 话题（aspect）来源
+SOURCE_TFIDF = "tfidf"
+SOURCE_TOPICS = "topics"
+
+SENTIMENT_LABELS = ["Positive", "Negative", "Neutral"]
+
+# 每个 bundle 中按参数（创作者、控件取值）缓存的派生结构的上限
+PARAMETERIZED_CACHE_SIZE = 32
+
+# 每个 (aspect来源, 情感方法) 组合背后的文件
+# 文件命名并不统一，所以逐一列出；同一文件可被多个组合共用（只读取一次）
+BUNDLES = {
+    (SOURCE_TFIDF, "bart"): {
+        "counts": "data/TD_IDF_sentiment_counts_bart.csv",
+        "comments_per_creator": "data/TD_IDF_comments_per_creator_sentiment_bart.csv",
+        "topic_summary": "data/TD_IDF_sentiment_df_bart.csv",
+        "topic_matrix": "data/TD_IDF_aspect_sentiment_per_creator_bart_new.csv",
+        "topic_per_creator": "data/TD_IDF_aspect_sentiment_per_creator_bart.csv",
+        "time_series": "data/TD_IDF_positive_comment_time_series_bart.csv",
+        "aspect_matrix": "data/TD_IDF_aspect_sentiment_matrix_bart.csv",
+        "aspect_video": "data/TD_IDF_aspect_sentiment_matrix_creators_bart.csv",
+        "aspect_video_counts": ASPECT_VIDEO_PATHS["bart"],
+        "comments": COMMENT_SENTIMENT_PATH,
+    },
+    (SOURCE_TFIDF, "roberta"): {
+        "counts": "data/roberta_sentiment_counts.csv",
+        "comments_per_creator": "data/TD_IDF_comments_per_creator_sentiment_roberta.csv",
+        "topic_summary": "data/TD_IDF_sentiment_df_roberta.csv",
+        "topic_matrix": "data/TD_IDF_aspect_sentiment_per_creator_roberta_new.csv",
+        "topic_per_creator": "data/TD_IDF_topic_sentiment_per_creator_roberta.csv",
+        "time_series": "data/TD_IDF_positive_comment_time_series_roberta.csv",
+        "aspect_matrix": "data/TD_IDF_aspect_sentiment_matrix_roberta.csv",
+        "aspect_video": "data/TD_IDF_aspect_sentiment_matrix_creators_roberta.csv",
+        "aspect_video_counts": ASPECT_VIDEO_PATHS["roberta"],
+        "comments": COMMENT_SENTIMENT_PATH,
+    },
+    (SOURCE_TFIDF, "vader"): {
+        "counts": "data/TD_IDF_sentiment_counts_vader.csv",
+        "comments_per_creator": "data/TD_IDF_comments_per_creator_sentiment_vader.csv",
+        "topic_summary": "data/TD_IDF_sentiment_df_vader.csv",
+        "topic_matrix": "data/TD_IDF_aspect_sentiment_per_creator_vader_new.csv",
+        "topic_per_creator": "data/TD_IDF_aspect_sentiment_per_creator_vader.csv",
+        "time_series": "data/TD_IDF_positive_comment_time_series_vader.csv",
+        "aspect_matrix": "data/TD_IDF_aspect_sentiment_matrix_vader.csv",
+        "aspect_video": "data/TD_IDF_aspect_sentiment_matrix_creators_vader.csv",
+        "aspect_video_counts": ASPECT_VIDEO_PATHS["vader"],
+        "comments": COMMENT_SENTIMENT_PATH,
+    },
+    (SOURCE_TOPICS, "roberta"): {
+        "counts": "data/roberta_sentiment_counts.csv",
+        "comments_per_creator": "data/comments_per_creator_sentiment_roberta.csv",
+        "topic_summary": "data/topic_sentiment_summary_roberta.csv",
+        "topic_matrix": "data/topic_sentiment_matrix_roberta.csv",
+        "topic_per_creator": "data/topic_sentiment_per_creator_roberta.csv",
+        "time_series": "data/positive_comment_time_series_roberta.csv",
+        "aspect_matrix": "data/topic_sentiment_matrix_comparison_between_creators_roberta.csv",
+        "aspect_video": "data/topic_sentiment_matrix_creator_roberta.csv",
+        "comments": COMMENT_SENTIMENT_PATH,
+        "topic_distribution": "data/absa_results_roberta.csv",
+    },
+    (SOURCE_TOPICS, "vader"): {
+        "counts": "data/vader_sentiment_counts.csv",
+        "comments_per_creator": "data/comments_per_creator_sentiment_vader.csv",
+        "topic_summary": "data/topic_sentiment_summary_vader.csv",
+        "topic_matrix": "data/topic_sentiment_matrix_vader.csv",
+        "topic_per_creator": "data/topic_sentiment_per_creator_vader.csv",
+        "time_series": "data/positive_comment_time_series_vader.csv",
+        "aspect_matrix": "data/topic_sentiment_matrix_comparison_between_creators_vader.csv",
+        "aspect_video": "data/topic_sentiment_matrix_creator_vader.csv",
+        "comments": COMMENT_SENTIMENT_PATH,
+    },
+}
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _read_table(path, version):
+    return pd.read_csv(path)
+
+
+def read_table(path):
+    """One CSV, read once per file version and shared by every bundle that lists it (treat as read-only)"""
+    return _read_table(path, dataset_version(path))
+
+
+def creator_keyword_scores(raw):
+    """
+    Creator x keyword mean scores from a TF-IDF aspect sentiment matrix file
+
+    The file has one column per (creator, keyword): the header row holds
+    the creator (pandas suffixes repeats with ".1", ".2", ...), the first
+    data row the keyword and the remaining rows one video each. Every cell
+    of the result is the mean over the creator's videos.
+    """
+    columns = raw.columns[1:]
+    scores = raw.iloc[1:][columns].astype(float).mean()
+    long = pd.DataFrame({
+        "creator": columns.str.replace(r"\.\d+$", "", regex=True),
+        "aspect": raw.iloc[0][columns].astype(str).to_numpy(),
+        "score": scores.to_numpy(),
+    })
+    matrix = long.pivot_table(index="creator", columns="aspect", values="score", aggfunc="mean", sort=False)
+    return matrix.rename_axis(index=None, columns=None)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_comment_topic_counts(path, version, creator):
+    df = load_comment_sentiment(path)
+    creator_df = df[df["channel"] == creator].explode("topics")
+    return creator_df.groupby(["video_id", "topics", "sentiment_vader"]).size().unstack(fill_value=0)
+
+
+def comment_topic_counts(creator, path=COMMENT_SENTIMENT_PATH):
+    """(video, topic) x sentiment comment counts for one creator, shared by all bundles"""
+    return _build_comment_topic_counts(path, dataset_version(path), creator)
+
+
+class AspectSentimentBundle:
+    """
+    Tables behind one (aspect source, sentiment method) analysis page
+
+    Raw files go through the path-keyed read_table cache; derived
+    structures (transposes, percentages, per-creator slices and sparse
+    video x aspect matrices)
+    are built on first use and then reused by every session until one of
+    the bundle's files changes.
+    """
+
+    def __init__(self, source, method, paths, version):
+        self.source = source
+        self.method = method
+        self.paths = paths
+        self.version = version
+        self._derived = {}
+        self._parameterized = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _cached(self, key, build):
+        """
+        Build once and reuse
+
+        Plain string keys name a fixed set of structures and are kept for
+        the bundle's lifetime. Tuple keys carry parameters (creator, widget
+        values) and go to a bounded LRU, so slider positions cannot grow
+        the bundle without limit.
+        """
+        with self._lock:
+            if isinstance(key, str):
+                if key not in self._derived:
+                    self._derived[key] = build()
+                return self._derived[key]
+            if key in self._parameterized:
+                self._parameterized.move_to_end(key)
+                return self._parameterized[key]
+            value = build()
+            self._parameterized[key] = value
+            while len(self._parameterized) > PARAMETERIZED_CACHE_SIZE:
+                self._parameterized.popitem(last=False)
+            return value
+
+    def has(self, name):
+        return name in self.paths
+
+    def table(self, name):
+        """Raw file for a role in BUNDLES (treat as read-only)"""
+        return read_table(self.paths[name])
+
+    # Overview / By Creator
+
+    def sentiment_counts(self):
+        """Creator x sentiment comment counts"""
+        def build():
+            counts = self.table("counts")
+            return counts.set_index(counts.columns[0]).astype(int).transpose()
+        return self._cached("sentiment_counts", build)
+
+    def sentiment_percentages(self):
+        """Share of each sentiment's comments per creator (%)"""
+        def build():
+            counts = self.sentiment_counts()
+            return (counts / counts.sum() * 100).round(1)
+        return self._cached("sentiment_percentages", build)
+
+    def comments_per_creator(self):
+        return self.table("comments_per_creator")
+
+    def topic_distribution(self):
+        """Per-topic sentiment counts (sorted, wide) and their long form for plotting"""
+        def build():
+            topics = self.table("topic_distribution").sort_values(by=SENTIMENT_LABELS, ascending=False)
+            melted = topics.melt(
+                id_vars="Topics",
+                value_vars=SENTIMENT_LABELS,
+                var_name="Sentiment",
+                value_name="Count"
+            )
+            return topics, melted
+        return self._cached("topic_distribution", build)
+
+    # By Topic
+
+    def topic_summary(self):
+        return self.table("topic_summary")
+
+    def topic_matrix(self):
+        """Creator x topic sentiment scores"""
+        return self._cached("topic_matrix", lambda: self.table("topic_matrix").set_index("topic").T)
+
+    def topic_creators(self):
+        return self._cached("topic_creators", lambda: self.table("topic_per_creator")["channel"].unique())
+
+    def creator_topics(self, creator, percentage=False):
+        """Topic x sentiment counts for one creator, or row percentages"""
+        def build():
+            if percentage:
+                subset = self.creator_topics(creator)
+                return subset.div(subset.sum(axis=1), axis=0) * 100
+            grouped = self.table("topic_per_creator")
+            return grouped[grouped["channel"] == creator].set_index("topics")[SENTIMENT_LABELS]
+        return self._cached(("creator_topics", creator, percentage), build)
+
+    # Time Series
+
+    def positive_time_series(self):
+        """Daily positive comments per creator, indexed by date"""
+        def build():
+            df = self.table("time_series").copy()
+            date_col = 'date' if 'date' in df.columns else df.columns[0]
+            df[date_col] = pd.to_datetime(df[date_col])
+            return df.set_index(date_col)
+        return self._cached("positive_time_series", build)
+
+    def time_pyramid(self):
+        """Prefix-sum pyramid of the positive comment series (see app.data.time_pyramid.TimePyramid)"""
+        return self._cached("time_pyramid", lambda: TimePyramid(self.positive_time_series()))
+
+    def aggregated_time_series(self, aggregation="Daily"):
+        """Positive comments per creator over the whole history at a level of PYRAMID_LEVELS"""
+        return self._cached(
+            ("aggregated_time_series", aggregation),
+            lambda: self.time_pyramid().aggregate(level=aggregation)
+        )
+
+    def anomaly_bands(self, aggregation="Daily", method="zscore", window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+        """
+        Anomalies of every creator's series (see app.utils.anomalies.detect_anomalies)
+
+        Detection runs once over the full history of all creators; views
+        slice the result to their date range and creators.
+        """
+        return self._cached(
+            ("anomaly_bands", aggregation, method, window, threshold),
+            lambda: detect_anomalies(self.aggregated_time_series(aggregation), method, window, threshold)
+        )
+
+    # Aspect-Based
+    # TF-IDF 的关键词列经 extracted_aspects 的规范话题映射后再使用，同一规范话题的列取平均
+
+    def canonical_columns(self, labels):
+        """Aspect label -> canonical aspect for this bundle's tables (identity for topic bundles)"""
+        if self.source != SOURCE_TFIDF:
+            return {label: label for label in labels}
+        vocabulary = self.extracted_aspects().vocabulary()
+        return dict(zip(labels, map_labels(list(labels), vocabulary)))
+
+    def _merge_columns(self, df):
+        """
+        Average the columns of a wide score table that map to the same canonical aspect
+
+        Scores are means, not counts: "look" and "looks" merged into one
+        column stay on the same scale as an unmerged column. Missing values
+        are ignored.
+        """
+        mapping = self.canonical_columns(df.columns)
+        return df.T.groupby(pd.Index([mapping[column] for column in df.columns], name=df.columns.name)).mean().T
+
+    def creator_aspect_matrix(self):
+        """Creator x aspect sentiment scores"""
+        def build():
+            if self.source != SOURCE_TFIDF:
+                return self.table("aspect_matrix").T
+            return self._merge_columns(creator_keyword_scores(self.table("aspect_matrix")))
+        return self._cached("creator_aspect_matrix", build)
+
+    def aspect_video(self):
+        """Per-video aspect scores with channel and video columns"""
+        return self.table("aspect_video")
+
+    def aspects(self):
+        return self.aspect_video().columns[2:]
+
+    def video_creators(self):
+        return self._cached("video_creators", lambda: self.aspect_video()["channel"].unique())
+
+    def _canonical_aspect_video(self):
+        def build():
+            df = self.aspect_video()
+            return pd.concat([df[["channel", "video"]], self._merge_columns(df[self.aspects()])], axis=1)
+        return self._cached("canonical_aspect_video", build)
+
+    def creator_matrix(self, creator):
+        """One creator's video x canonical aspect scores as a SparseAspectMatrix"""
+        def build():
+            df = self._canonical_aspect_video()
+            return SparseAspectMatrix.from_frame(df[df["channel"] == creator], "video", df.columns[2:])
+        return self._cached(("creator_matrix", creator), build)
+
+    def top_aspects(self):
+        """Most positive / negative aspects of every creator over all their videos (see TopAspects)"""
+        def build():
+            means = pd.DataFrame({
+                creator: self.creator_matrix(creator).column_means()
+                for creator in self.video_creators()
+            }).T
+            return TopAspects(means)
+        return self._cached("top_aspects", build)
+
+
+    # Extracted aspects (TF-IDF bundles only)
+
+    def extracted_aspects(self):
+        """Joint per-video extracted-aspect counts shared by the TF-IDF methods (see app.data.tfidf_aspects)"""
+        return load_aspect_video_counts()
+
+
+@st.cache_resource(max_entries=2 * len(BUNDLES), show_spinner=False)
+def _build_bundle(source, method, version):
+    return AspectSentimentBundle(source, method, BUNDLES[(source, method)], version)
+
+
+def load_aspect_bundle(source, method):
+    """
+    Shared engine for one (aspect source, sentiment method) combination
+
+    Rebuilt only when one of its files changes; switching between
+    methods reuses every bundle (and every shared file) already warm.
+    """
+    paths = BUNDLES[(source, method)]
+    return _build_bundle(source, method, bundle_version(*paths.values()))
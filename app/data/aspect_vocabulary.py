@@ -0,0 +1,244 @@
+import re
+
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+# 模糊归并参数：字符n-gram长度、Jaccard相似度阈值、最低出现次数
+NGRAM_SIZE = 3
+FUZZY_THRESHOLD = 0.75
+MIN_FREQUENCY = 3
+
+# 去掉停用词和过短的词后才选规范话题，避免 "i"、"you" 之类成为话题。
+# 只列代词、冠词、助动词、介词连词和口头语——不用通用停用词表，
+# 否则 "fire"、"front"、"system" 这类话题词也会被删掉
+MIN_TOKEN_LENGTH = 2
+STOP_WORDS = frozenset({
+    # 代词和限定词
+    "me", "my", "mine", "myself", "we", "us", "our", "ours", "you", "your", "yours", "he", "him", "his",
+    "she", "her", "hers", "it", "its", "they", "them", "their", "theirs", "this", "that", "these", "those",
+    "who", "whom", "whose", "what", "which", "some", "any", "all", "each", "every", "other", "another",
+    "one", "ones", "someone", "anyone", "everyone", "somebody", "anybody", "everybody", "nobody",
+    "something", "anything", "everything", "nothing", "an", "the", "no", "not",
+    # 助动词和情态动词
+    "am", "is", "are", "was", "were", "be", "been", "being", "do", "does", "did", "have", "has", "had",
+    "can", "could", "will", "would", "shall", "should", "may", "might", "must",
+    # 介词、连词和副词
+    "of", "to", "in", "on", "at", "by", "for", "with", "from", "about", "as", "into", "near", "than",
+    "and", "or", "but", "if", "so", "then", "because", "when", "where", "how", "why", "there", "here",
+    "very", "too", "also", "just", "really", "even", "still", "only", "much", "many", "more", "most",
+    # 缩写和口头语
+    "id", "im", "ive", "ill", "dont", "didnt", "doesnt", "isnt", "wasnt", "arent", "cant", "couldnt",
+    "wont", "wouldnt", "shouldnt", "thats", "theres", "youre", "youve", "theyre", "hes", "shes", "whats",
+    "lets", "ur", "lol", "yeah", "yes", "ok", "okay", "oh", "gonna", "wanna", "thing", "stuff", "lot",
+    "way", "guy",
+})
+
+# 以 s 结尾但不是复数的缩写和专名，原样保留
+KEEP_AS_IS = frozenset({"nacs", "ccs", "gps", "abs", "bms", "news", "texas", "vegas"})
+# 三个字母的缩写复数（"evs" -> "ev"）；一般规则只处理更长的词，以免 "gas" 变成 "ga"
+SHORT_PLURALS = {
+    "evs": "ev", "tvs": "tv", "ads": "ad", "kms": "km", "hrs": "hr", "yrs": "yr", "vws": "vw", "gms": "gm",
+    "eqs": "eq", "pcs": "pc",
+}
+
+# 只剩停用词、或既不相似也不包含任何规范话题的长尾短语
+OTHER_ASPECT = "(other)"
+
+_POSSESSIVE = re.compile(r"'s\b")
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def _singular(word):
+    if word in KEEP_AS_IS:
+        return word
+    if word in SHORT_PLURALS:
+        return SHORT_PLURALS[word]
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_aspect(text):
+    """
+    Lower-case, strip punctuation and possessives, drop stop-words and short tokens,
+    singularize and drop immediately repeated words (may return "")
+    """
+    words = _NON_WORD.sub(" ", _POSSESSIVE.sub("", str(text).lower())).split()
+    words = [_singular(word) for word in words if len(word) >= MIN_TOKEN_LENGTH and word not in STOP_WORDS]
+    words = [word for word in words if word not in STOP_WORDS]
+    # 去掉连续重复的词（"partner partner" -> "partner"）
+    words = [word for i, word in enumerate(words) if i == 0 or word != words[i - 1]]
+    return " ".join(words)
+
+
+def ngram_index(labels, n=NGRAM_SIZE):
+    """Binary labels x character n-gram CSR matrix (labels padded with spaces) and the n-gram vocabulary"""
+    rows, grams = [], []
+    for row, label in enumerate(labels):
+        padded = f" {label} "
+        label_grams = {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+        rows.extend([row] * len(label_grams))
+        grams.extend(label_grams)
+    gram_codes, vocabulary = pd.factorize(pd.Series(grams, dtype=object))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.asarray(rows, dtype=np.int64), gram_codes)),
+        shape=(len(labels), len(vocabulary))
+    )
+    return matrix, vocabulary
+
+
+def _best_matches(grams, head_grams, threshold):
+    """For each row of ``grams``, the most similar row of ``head_grams`` by n-gram Jaccard (-1 below threshold)"""
+    shared = (grams @ head_grams.T).tocoo()
+    sizes = np.asarray(grams.sum(axis=1)).ravel()
+    head_sizes = np.asarray(head_grams.sum(axis=1)).ravel()
+    jaccard = shared.data / (sizes[shared.row] + head_sizes[shared.col] - shared.data)
+
+    best = np.full(grams.shape[0], -1)
+    keep = jaccard >= threshold
+    rows, cols, scores = shared.row[keep], shared.col[keep], jaccard[keep]
+    # 每行取相似度最高的候选（相同时取更常见的，即列号更小的）
+    order = np.lexsort((cols, -scores, rows))
+    rows, cols = rows[order], cols[order]
+    first = np.r_[True, rows[1:] != rows[:-1]][:len(rows)]
+    best[rows[first]] = cols[first]
+    return best
+
+
+def _token_matrix(forms, vocabulary=None):
+    """Binary forms x word CSR matrix; words missing from a given ``vocabulary`` are ignored"""
+    vocabulary = {} if vocabulary is None else vocabulary
+    grow = not vocabulary
+    rows, cols = [], []
+    for row, form in enumerate(forms):
+        for word in set(form.split()):
+            col = vocabulary.setdefault(word, len(vocabulary)) if grow else vocabulary.get(word)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(forms), len(vocabulary))
+    )
+    return matrix, vocabulary
+
+
+def _contained_matches(forms, head_forms):
+    """
+    For each form, the head whose words are all contained in it (-1 if none)
+
+    The head with the most words wins ("charging station" over
+    "charging"); among equally long heads the earlier (more frequent) one.
+    """
+    head_words, vocabulary = _token_matrix(head_forms)
+    words, _ = _token_matrix(forms, vocabulary)
+    head_sizes = np.asarray(head_words.sum(axis=1)).ravel()
+    shared = (words @ head_words.T).tocoo()
+    keep = shared.data == head_sizes[shared.col]
+    rows, cols = shared.row[keep], shared.col[keep]
+    order = np.lexsort((cols, -head_sizes[cols], rows))
+    rows, cols = rows[order], cols[order]
+    best = np.full(len(forms), -1)
+    first = np.r_[True, rows[1:] != rows[:-1]][:len(rows)]
+    best[rows[first]] = cols[first]
+    return best
+
+
+def _similar_pairs(grams, threshold):
+    """{row: [other rows with n-gram Jaccard >= threshold, most similar first]} within one matrix"""
+    shared = (grams @ grams.T).tocoo()
+    sizes = np.asarray(grams.sum(axis=1)).ravel()
+    jaccard = shared.data / (sizes[shared.row] + sizes[shared.col] - shared.data)
+    keep = (jaccard >= threshold) & (shared.row != shared.col)
+    pairs = {}
+    for row, _, col in sorted(zip(shared.row[keep], -jaccard[keep], shared.col[keep])):
+        pairs.setdefault(row, []).append(col)
+    return pairs
+
+
+def canonicalize(aspects, frequencies, threshold=FUZZY_THRESHOLD, min_frequency=MIN_FREQUENCY, n=NGRAM_SIZE):
+    """
+    Mapping table from raw aspect phrases to canonical aspects
+
+    1. Phrases are normalized (normalize_aspect, which also drops
+       stop-words); equal forms are merged and forms left empty go to
+       OTHER_ASPECT.
+    2. Forms mentioned at least ``min_frequency`` times are canonical
+       candidates. Going from the most frequent down, a candidate whose
+       character n-gram Jaccard similarity to an earlier canonical aspect
+       reaches ``threshold`` is merged into it.
+    3. Every rarer form is mapped to its most similar canonical aspect;
+       failing that, to the longest canonical aspect all of whose words it
+       contains ("ev charging" -> "charging"), and only then to
+       OTHER_ASPECT.
+
+    Returns a DataFrame with one row per input phrase: aspect, normalized,
+    canonical and frequency (of the phrase itself).
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    normalized = pd.Series([normalize_aspect(aspect) for aspect in aspects], dtype=object)
+    form_codes, forms = pd.factorize(normalized)
+    form_frequency = np.bincount(form_codes, weights=frequencies, minlength=len(forms))
+
+    canonical_of_form = np.full(len(forms), OTHER_ASPECT, dtype=object)
+    eligible = np.asarray([form != "" for form in forms], dtype=bool)
+    heads = np.flatnonzero(eligible & (form_frequency >= min_frequency))
+    heads = heads[np.argsort(-form_frequency[heads], kind="stable")]
+    if len(heads) > 0:
+        grams, _ = ngram_index(forms, n)
+
+        # 常见形式之间按频率从高到低合并（只和已确定的规范话题比较）
+        head_grams = grams[heads]
+        similar = _similar_pairs(head_grams, threshold)
+        head_target = np.arange(len(heads))
+        for i in range(len(heads)):
+            earlier = [j for j in similar.get(i, ()) if j < i and head_target[j] == j]
+            if earlier:
+                head_target[i] = earlier[0]
+        canonical_of_form[heads] = forms[heads[head_target]]
+
+        # 长尾形式先按字符相似度、再按包含的规范话题词归入
+        roots = heads[np.flatnonzero(head_target == np.arange(len(heads)))]
+        tail = np.setdiff1d(np.flatnonzero(eligible), heads)
+        if len(tail) > 0:
+            best = _best_matches(grams[tail], grams[roots], threshold)
+            unmatched = best < 0
+            if unmatched.any():
+                best[unmatched] = _contained_matches(forms[tail[unmatched]], forms[roots])
+            matched = best >= 0
+            canonical_of_form[tail[matched]] = forms[roots[best[matched]]]
+
+    return pd.DataFrame({
+        "aspect": np.asarray(aspects, dtype=object),
+        "normalized": normalized.to_numpy(),
+        "canonical": canonical_of_form[form_codes],
+        "frequency": frequencies,
+    })
+
+
+def map_labels(labels, vocabulary):
+    """
+    Canonical aspect for arbitrary aspect labels (e.g. the keyword columns of a wide table)
+
+    A label whose normalized form occurs in ``vocabulary`` (a canonicalize
+    result) takes that form's canonical aspect; otherwise the longest
+    contained canonical aspect, otherwise its own normalized form (or the
+    label itself when nothing is left after normalization).
+    """
+    known = vocabulary[vocabulary["canonical"] != OTHER_ASPECT]
+    form_map = dict(zip(known["normalized"], known["canonical"]))
+    canonicals = pd.unique(known["canonical"])
+    forms = [normalize_aspect(label) for label in labels]
+    contained = _contained_matches(forms, canonicals) if len(canonicals) else np.full(len(forms), -1)
+    mapped = []
+    for label, form, match in zip(labels, forms, contained):
+        if form in form_map:
+            mapped.append(form_map[form])
+        elif match >= 0:
+            mapped.append(canonicals[match])
+        else:
+            mapped.append(form or str(label))
+    return mapped
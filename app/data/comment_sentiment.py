@@ -0,0 +1,90 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from app.data.datasets import dataset_version
+from app.data.grid import FrameViewer
+
+COMMENT_SENTIMENT_PATH = 'data/comment_sentiment_roberta_and_vader.csv'
+SENTIMENT_COLUMNS = ['sentiment_vader', 'sentiment_roberta']
+DEFAULT_BINS = 40
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_comment_sentiment(path, version):
+    return pd.read_csv(path)
+
+
+def load_comment_sentiment(path=COMMENT_SENTIMENT_PATH):
+    """Comment-level VADER/RoBERTa scores, reloaded only when the file changes (treat as read-only)"""
+    return _load_comment_sentiment(path, dataset_version(path))
+
+
+def bin_by_group(values, groups, edges):
+    """
+    Histogram of ``values`` per group over shared bin edges
+
+    Returns (group labels, counts) where counts has shape (n_groups, n_bins).
+    All groups are binned in one np.bincount pass over (group, bin) codes.
+    NaN values and values outside the edges are dropped.
+    """
+    values = np.asarray(values, dtype=float)
+    codes, labels = pd.factorize(pd.Series(groups), sort=True)
+    n_bins = len(edges) - 1
+
+    valid = ~np.isnan(values) & (codes >= 0) & (values >= edges[0]) & (values <= edges[-1])
+    # 右端点归入最后一个区间（与 np.histogram 一致）
+    bins = np.clip(np.searchsorted(edges, values[valid], side='right') - 1, 0, n_bins - 1)
+    flat = np.bincount(codes[valid] * n_bins + bins, minlength=len(labels) * n_bins)
+    return labels, flat.reshape(len(labels), n_bins)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_sentiment_histogram(path, version, column, group_column, n_bins):
+    df = _load_comment_sentiment(path, version)
+    values = df[column].to_numpy(dtype=float)
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return pd.DataFrame(columns=[group_column, 'bin_start', 'bin_end', 'bin_center', 'count', 'percent'])
+
+    low, high = finite.min(), finite.max()
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, n_bins + 1)
+    labels, counts = bin_by_group(values, df[group_column].to_numpy(), edges)
+
+    # 每个组各自归一化为百分比（等同于 histnorm='percent'）
+    totals = counts.sum(axis=1, keepdims=True)
+    percent = np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+    return pd.DataFrame({
+        group_column: np.repeat(np.asarray(labels), n_bins),
+        'bin_start': np.tile(edges[:-1], len(labels)),
+        'bin_end': np.tile(edges[1:], len(labels)),
+        'bin_center': np.tile((edges[:-1] + edges[1:]) / 2, len(labels)),
+        'count': counts.ravel(),
+        'percent': percent.ravel(),
+    })
+
+
+def load_sentiment_histogram(column, group_column='channel', n_bins=DEFAULT_BINS, path=COMMENT_SENTIMENT_PATH):
+    """
+    Per-group bin counts and percentages of a comment-level score column
+
+    Computed once per dataset version; charts only need these
+    n_groups x n_bins rows, however many comments the file holds.
+    """
+    return _build_sentiment_histogram(path, dataset_version(path), column, group_column, n_bins)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_comment_viewer(path, version):
+    df = _load_comment_sentiment(path, version)
+    text_columns = [column for column in ('comment', 'topics') if column in df.columns]
+    category_columns = [column for column in ('channel',) if column in df.columns]
+    return FrameViewer(df, text_columns=text_columns, category_columns=category_columns)
+
+
+def load_comment_viewer(path=COMMENT_SENTIMENT_PATH):
+    """Windowed viewer over the comment-level scores (see app.data.grid.FrameViewer)"""
+    return _build_comment_viewer(path, dataset_version(path))
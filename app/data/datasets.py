@@ -0,0 +1,20 @@
+import os
+
+
+def dataset_version(path):
+    """
+    Cheap fingerprint of a data file used as a cache key
+
+    Changes whenever the file is replaced or rewritten, so every cache keyed
+    on it is rebuilt automatically when the source data is refreshed.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def bundle_version(*paths):
+    """Combined fingerprint of several data files (changes if any of them changes)"""
+    return "|".join(str(dataset_version(path)) for path in paths)
@@ -0,0 +1,123 @@
+import io
+
+import streamlit as st
+import pandas as pd
+from wordcloud import WordCloud
+
+from app.data.datasets import dataset_version
+from app.utils.jobs import get_scheduler, PRIORITY_BULK
+
+ENTITY_DATA_PATH = 'data/entity_sentiment_summary3.csv'
+
+# 词云风格
+STYLE_TEXT = "text"
+STYLE_WEIGHTED = "weighted"
+
+# 情感阈值（与页面上的说明一致）
+POSITIVE_THRESHOLD = 0.6
+NEGATIVE_THRESHOLD = 0.4
+
+WEIGHTED_COLORMAPS = {"positive": "Blues", "neutral": "Greys", "negative": "Reds"}
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_entity_summary(path, version):
+    return pd.read_csv(path)
+
+
+def load_entity_summary(path=ENTITY_DATA_PATH):
+    """Entity-level sentiment summary, reloaded only when the file changes (treat as read-only)"""
+    return _load_entity_summary(path, dataset_version(path))
+
+
+def entity_weights(df):
+    """
+    Word cloud weights per sentiment bucket, computed column-wise
+
+    positive: frequency * (1 + sentiment), neutral: frequency,
+    negative: frequency * (1 + |sentiment|). Entities listed under several
+    labels have their weights summed. Frequency defaults to 1 when the
+    file has no Frequency column.
+    """
+    sentiment = df["Avg_Sentiment"]
+    frequency = df["Frequency"] if "Frequency" in df.columns else 1
+    entities = df["Entity"]
+
+    buckets = {
+        "positive": (sentiment > POSITIVE_THRESHOLD, frequency * (1 + sentiment)),
+        "neutral": ((sentiment >= NEGATIVE_THRESHOLD) & (sentiment <= POSITIVE_THRESHOLD), frequency * 1.0),
+        "negative": (sentiment < NEGATIVE_THRESHOLD, frequency * (1 + sentiment.abs())),
+    }
+    weights = {}
+    for name, (mask, weight) in buckets.items():
+        weight = pd.Series(weight, index=df.index)[mask]
+        weights[name] = weight.groupby(entities[mask]).sum().to_dict()
+    return weights
+
+
+def _to_png(wordcloud):
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _text_wordcloud(df):
+    positive = df[df["Avg_Sentiment"] > POSITIVE_THRESHOLD]
+    if len(positive) == 0:
+        return {}
+    # 将所有实体转换为字符串，避免数字类型引起的错误
+    text = " ".join(str(entity) for entity in positive["Entity"].dropna())
+    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+    return {"positive": _to_png(wordcloud)}
+
+
+def _weighted_wordclouds(df):
+    images = {}
+    for name, freq_dict in entity_weights(df).items():
+        if not freq_dict:
+            continue
+        wordcloud = WordCloud(
+            width=300,
+            height=300,
+            background_color='white',
+            colormap=WEIGHTED_COLORMAPS[name],
+            max_font_size=100
+        ).generate_from_frequencies({str(entity): weight for entity, weight in freq_dict.items()})
+        images[name] = _to_png(wordcloud)
+    return images
+
+
+@st.cache_resource(max_entries=4, show_spinner="Generating word clouds...")
+def _build_wordclouds(path, version, style):
+    df = _load_entity_summary(path, version)
+    if style == STYLE_TEXT:
+        return _text_wordcloud(df)
+    return _weighted_wordclouds(df)
+
+
+def load_wordclouds(style, path=ENTITY_DATA_PATH):
+    """
+    PNG bytes of the word clouds for a style, keyed by sentiment bucket
+
+    Generated once per dataset version and style; buckets without
+    entities are missing from the result.
+    """
+    return _build_wordclouds(path, dataset_version(path), style)
+
+
+def _prewarm(path, version):
+    for style in (STYLE_TEXT, STYLE_WEIGHTED):
+        _build_wordclouds(path, version, style)
+
+
+@st.cache_resource(show_spinner=False)
+def _start_prewarm(path, version):
+    return get_scheduler().submit(
+        "system", _prewarm, path, version, priority=PRIORITY_BULK, label="Word cloud precompute"
+    ).id
+
+
+def prewarm_wordclouds(path=ENTITY_DATA_PATH):
+    """Generate every word cloud style in the background (once per dataset version)"""
+    if dataset_version(path) is not None:
+        _start_prewarm(path, dataset_version(path))
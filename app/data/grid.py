@@ -0,0 +1,146 @@
+import threading
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from app.data.datasets import dataset_version
+
+
+def _sort_key(column):
+    """Numeric sort key for a column; '12%' style strings are parsed, 'N/A' sorts last"""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=float)
+    numeric = pd.to_numeric(column.astype(str).str.rstrip('%'), errors='coerce')
+    if numeric.notna().any():
+        return numeric.to_numpy(dtype=float)
+    return None
+
+
+class TopicGrid:
+    """
+    Searchable, sortable and pageable view over a topic table
+
+    The key column is lower-cased once and every column's sort order is
+    precomputed, so a query is a substring mask over the key index, a
+    lookup of the precomputed order and a slice of the requested page.
+    """
+
+    def __init__(self, df, key_column=None):
+        self.df = df
+        self.key_column = key_column or df.columns[0]
+        self.keys = df[self.key_column].fillna("").astype(str).str.lower().to_numpy(dtype=str)
+        self.orders = {}
+        for column in df.columns:
+            key = _sort_key(df[column])
+            if key is None:
+                order = np.argsort(df[column].fillna("").astype(str).str.lower().to_numpy(dtype=str), kind='stable')
+                self.orders[column] = (order, order[::-1])
+            else:
+                # 缺失值在升序和降序中都排在最后
+                missing = np.isnan(key)
+                ascending = np.lexsort((key, missing))
+                descending = np.lexsort((-key, missing))
+                self.orders[column] = (ascending, descending)
+
+    @property
+    def columns(self):
+        return list(self.df.columns)
+
+    def matching_rows(self, search="", sort_by=None, ascending=True):
+        """Row positions matching ``search`` in the requested order"""
+        if sort_by in self.orders:
+            order = self.orders[sort_by][0 if ascending else 1]
+        else:
+            order = np.arange(len(self.df))
+        search = search.strip().lower()
+        if not search:
+            return order
+        mask = np.char.find(self.keys, search) >= 0
+        return order[mask[order]]
+
+    def page(self, rows, page=1, page_size=10):
+        """Only the rows of one page"""
+        start = (page - 1) * page_size
+        return self.df.iloc[rows[start:start + page_size]]
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _build_topic_grid(path, version):
+    return TopicGrid(pd.read_csv(path))
+
+
+def load_topic_grid(path):
+    """Topic grid for a CSV, rebuilt only when the file changes"""
+    return _build_topic_grid(path, dataset_version(path))
+
+
+class FrameViewer:
+    """
+    Windowed, server-side filtered and sorted view over a large frame
+
+    Only the requested window of rows ever leaves the server. Lower-cased
+    text columns and per-category row positions are built once; sort
+    orders are computed on first use and then reused.
+    """
+
+    def __init__(self, df, text_columns=(), category_columns=()):
+        self.df = df
+        self.lower = {
+            column: df[column].fillna("").astype(str).str.lower()
+            for column in text_columns
+        }
+        self.categories = {
+            column: {key: np.asarray(positions) for key, positions in df.groupby(column, sort=True).indices.items()}
+            for column in category_columns
+        }
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def _order(self, column, ascending):
+        with self._lock:
+            if column not in self._orders:
+                key = _sort_key(self.df[column])
+                if key is None:
+                    key = self.df[column].fillna("").astype(str).str.lower().to_numpy()
+                    order = np.argsort(key, kind='stable')
+                    self._orders[column] = (order, order[::-1])
+                else:
+                    missing = np.isnan(key)
+                    self._orders[column] = (np.lexsort((key, missing)), np.lexsort((-key, missing)))
+            return self._orders[column][0 if ascending else 1]
+
+    def matching_rows(self, categories=None, text=None, ranges=None, sort_by=None, ascending=True):
+        """
+        Row positions passing every filter, in the requested order
+
+        Parameters:
+        -----------
+        categories : dict, optional
+            {column: selected values} for category columns
+        text : dict, optional
+            {column: substring} matched case-insensitively
+        ranges : dict, optional
+            {column: (low, high)} inclusive numeric bounds
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, values in (categories or {}).items():
+            if values:
+                allowed = np.zeros(len(self.df), dtype=bool)
+                for value in values:
+                    allowed[self.categories[column].get(value, [])] = True
+                mask &= allowed
+        for column, needle in (text or {}).items():
+            needle = (needle or "").strip().lower()
+            if needle:
+                mask &= self.lower[column].str.contains(needle, regex=False).to_numpy()
+        for column, (low, high) in (ranges or {}).items():
+            values = self.df[column].to_numpy(dtype=float)
+            mask &= (values >= low) & (values <= high)
+
+        order = self._order(sort_by, ascending) if sort_by else np.arange(len(self.df))
+        return order[mask[order]]
+
+    def window(self, rows, start=0, size=100):
+        """Only the rows of one window"""
+        return self.df.iloc[rows[start:start + size]]
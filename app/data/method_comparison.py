@@ -0,0 +1,115 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from app.data.aspect_sentiment import SENTIMENT_LABELS, load_aspect_bundle
+
+
+def _shares(counts):
+    """Row-wise sentiment shares (%), net sentiment (positive - negative) and dominant label"""
+    counts = counts[SENTIMENT_LABELS].astype(float)
+    totals = counts.sum(axis=1)
+    shares = counts.div(totals.where(totals > 0), axis=0) * 100
+    result = shares.rename(columns=str.lower)
+    result["comments"] = totals
+    result["net"] = shares["Positive"] - shares["Negative"]
+    result["dominant"] = counts.idxmax(axis=1)
+    return result
+
+
+def _rank(values):
+    """1 = most positive"""
+    return values.rank(ascending=False, method="min")
+
+
+def _join(a, b):
+    """Inner join of two share tables with _a/_b suffixes, deltas (b - a), agreement and rank change"""
+    joint = a.join(b, how="inner", lsuffix="_a", rsuffix="_b")
+    for column in [label.lower() for label in SENTIMENT_LABELS] + ["net"]:
+        joint[f"delta_{column}"] = joint[f"{column}_b"] - joint[f"{column}_a"]
+    joint["agree"] = joint["dominant_a"] == joint["dominant_b"]
+    return joint
+
+
+class MethodComparison:
+    """
+    Joint per-creator and per-aspect dataset for two sentiment bundles
+
+    Built once per pair of bundle versions, so the comparison page costs
+    about one page's worth of loading instead of two full pages. Deltas
+    are always second minus first.
+
+    Attributes:
+    -----------
+    creators : DataFrame
+        One row per creator present in both bundles: sentiment shares,
+        net sentiment, dominant label and rank for each side, their
+        deltas, agreement and rank change (positive = ranked higher by
+        the second method)
+    aspects : DataFrame
+        The same per (creator, aspect) for aspects both bundles extracted;
+        ranks are within each creator
+    only_a, only_b : int
+        Number of (creator, aspect) pairs found by only one side
+    """
+
+    def __init__(self, bundle_a, bundle_b):
+        self.version = f"{bundle_a.version}||{bundle_b.version}"
+
+        creators = _join(_shares(bundle_a.sentiment_counts()), _shares(bundle_b.sentiment_counts()))
+        creators["rank_a"] = _rank(creators["net_a"])
+        creators["rank_b"] = _rank(creators["net_b"])
+        creators["rank_change"] = creators["rank_a"] - creators["rank_b"]
+        self.creators = creators.rename_axis("creator").reset_index()
+
+        topics_a = bundle_a.table("topic_per_creator").set_index(["channel", "topics"])
+        topics_b = bundle_b.table("topic_per_creator").set_index(["channel", "topics"])
+        aspects = _join(_shares(topics_a), _shares(topics_b))
+        # 按创作者分组，在组内对两种方法分别排名
+        by_creator = aspects.groupby(level=0)
+        aspects["rank_a"] = by_creator["net_a"].rank(ascending=False, method="min")
+        aspects["rank_b"] = by_creator["net_b"].rank(ascending=False, method="min")
+        aspects["rank_change"] = aspects["rank_a"] - aspects["rank_b"]
+        self.aspects = aspects.rename_axis(["creator", "aspect"]).reset_index()
+
+        self.only_a = len(topics_a.index.difference(topics_b.index))
+        self.only_b = len(topics_b.index.difference(topics_a.index))
+
+    def summary(self):
+        """Headline agreement figures"""
+        ranks = self.creators[["rank_a", "rank_b"]].to_numpy(dtype=float)
+        # 排名的皮尔逊相关即斯皮尔曼相关（并列排名时为近似值）
+        rank_correlation = np.corrcoef(ranks.T)[0, 1] if len(ranks) > 1 and ranks.std(axis=0).all() else np.nan
+        return {
+            "creator_agreement": self.creators["agree"].mean() * 100 if len(self.creators) else np.nan,
+            "aspect_agreement": self.aspects["agree"].mean() * 100 if len(self.aspects) else np.nan,
+            "creator_rank_correlation": rank_correlation,
+            "mean_abs_net_delta": self.aspects["delta_net"].abs().mean(),
+            "shared_aspects": len(self.aspects),
+        }
+
+    def creator_aspects(self, creator):
+        """One creator's aspect rows, largest disagreement first"""
+        rows = self.aspects[self.aspects["creator"] == creator]
+        return rows.reindex(rows["delta_net"].abs().sort_values(ascending=False).index)
+
+    def delta_matrix(self, top_n=20):
+        """Creator x aspect net-sentiment deltas for the ``top_n`` most commented shared aspects"""
+        volume = self.aspects.groupby("aspect")[["comments_a", "comments_b"]].sum().sum(axis=1)
+        top = volume.nlargest(top_n).index
+        rows = self.aspects[self.aspects["aspect"].isin(top)]
+        return rows.pivot(index="creator", columns="aspect", values="delta_net").reindex(columns=top)
+
+
+@st.cache_resource(max_entries=8, show_spinner="Comparing methods...")
+def _build_method_comparison(first, second, version_a, version_b):
+    return MethodComparison(load_aspect_bundle(*first), load_aspect_bundle(*second))
+
+
+def load_method_comparison(first, second):
+    """
+    Joint comparison of two (aspect source, sentiment method) bundles
+
+    Rebuilt only when a file behind either bundle changes.
+    """
+    return _build_method_comparison(first, second, load_aspect_bundle(*first).version, load_aspect_bundle(*second).version)
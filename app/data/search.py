@@ -0,0 +1,173 @@
+import re
+import shlex
+import itertools
+
+import streamlit as st
+import numpy as np
+
+from app.data.datasets import dataset_version
+from app.data.spam import SPAM_DATA_PATH, load_spam_comments, load_sample_index
+
+# URL、@用户名、#话题都会被拆成连续的词，所以可以按短语搜索
+TOKEN_PATTERN = re.compile(r"[a-z0-9_@#]+")
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Token -> sorted row-position and token-position posting lists over a text column
+
+    Postings are stored CSR-style (one flat array plus offsets per token),
+    so a lookup is a dictionary hit and two slices. Token positions are
+    global (rows are laid end to end with a one-position gap), so a phrase
+    is an intersection of shifted position lists and never spans two rows.
+    """
+
+    def __init__(self, texts):
+        vocab = {}
+        occurrences = []
+        row_starts = np.zeros(len(texts) + 1, dtype=np.int64)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            occurrences.extend(vocab.setdefault(token, len(vocab)) for token in tokens)
+            row_starts[row + 1] = row_starts[row] + len(tokens) + 1
+
+        token_ids = np.asarray(occurrences, dtype=np.int64)
+        lengths = np.diff(row_starts) - 1
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        # 每个词在全局中的位置：行起点 + 行内序号
+        positions = np.arange(len(token_ids), dtype=np.int64) + rows
+
+        order = np.lexsort((positions, token_ids))
+        token_ids, rows = token_ids[order], rows[order]
+        self.vocab = vocab
+        self.row_starts = row_starts[:-1]
+        self.positions = positions[order]
+        self.position_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids, minlength=len(vocab)), out=self.position_offsets[1:])
+
+        # 行倒排表：同一行重复出现的词只记一次
+        first = np.r_[True, (token_ids[1:] != token_ids[:-1]) | (rows[1:] != rows[:-1])]
+        self.postings = rows[first]
+        self.offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids[first], minlength=len(vocab)), out=self.offsets[1:])
+        self.num_rows = len(texts)
+
+    def lookup(self, token):
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=np.int64)
+        return self.postings[self.offsets[token_id]:self.offsets[token_id + 1]]
+
+    def token_positions(self, token):
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=np.int64)
+        return self.positions[self.position_offsets[token_id]:self.position_offsets[token_id + 1]]
+
+    def lookup_phrase(self, phrase):
+        """Rows containing the tokens of ``phrase`` consecutively"""
+        if len(phrase) == 1:
+            return self.lookup(phrase[0])
+        # 第 i 个词的位置减 i 后求交集，得到短语的起始位置；从最短的表开始
+        shifted = sorted((self.token_positions(token) - i for i, token in enumerate(phrase)), key=len)
+        starts = shifted[0]
+        for positions in shifted[1:]:
+            if len(starts) == 0:
+                break
+            starts = np.intersect1d(starts, positions, assume_unique=True)
+        return np.unique(np.searchsorted(self.row_starts, starts, side="right") - 1)
+
+    def lookup_all(self, terms):
+        """Rows containing every term (AND); a term is a token list matched as a phrase"""
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+        # 单词直接用行倒排表（从最短的开始）求交集，短语只在仍有候选时才按位置匹配
+        words = sorted((self.lookup(term[0]) for term in terms if len(term) == 1), key=len)
+        phrases = map(self.lookup_phrase, (term for term in terms if len(term) > 1))
+        result = None
+        for rows in itertools.chain(words, phrases):
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
+
+    def search(self, clauses):
+        """Sorted rows matching any clause of parse_query's output (OR of ANDs)"""
+        hits = np.empty(0, dtype=np.int64)
+        for clause in clauses:
+            hits = np.union1d(hits, self.lookup_all(clause))
+        return hits
+
+
+def parse_query(query):
+    """
+    Split a query into OR-clauses of AND-terms
+
+    ``tesla "model 3" OR rivian`` -> [[["tesla"], ["model", "3"]], [["rivian"]]]
+    Each term is a token list; multi-token terms are matched as phrases.
+    """
+    try:
+        parts = shlex.split(query)
+    except ValueError:
+        parts = query.replace('"', " ").split()
+
+    clauses, current = [], []
+    for part in parts:
+        if part == "OR":
+            if current:
+                clauses.append(current)
+            current = []
+            continue
+        if part == "AND":
+            continue
+        tokens = tokenize(part)
+        if tokens:
+            current.append(tokens)
+    if current:
+        clauses.append(current)
+    return clauses
+
+
+@st.cache_resource(max_entries=2, show_spinner="Building comment search index...")
+def _build_comment_index(path, version):
+    return InvertedIndex(load_spam_comments(path)['Comment'].tolist())
+
+
+def load_comment_index(path=SPAM_DATA_PATH):
+    return _build_comment_index(path, dataset_version(path))
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _search_comment_rows(path, version, query, creator, is_spam):
+    hits = _build_comment_index(path, version).search(parse_query(query))
+
+    # 按创作者和垃圾标签过滤：复用采样索引里的行位置
+    if creator or is_spam is not None:
+        sample_index = load_sample_index(path)
+        labels = (True, False) if is_spam is None else (bool(is_spam),)
+        allowed = [sample_index.get((creator or None, label), np.empty(0, dtype=np.int64)) for label in labels]
+        hits = np.intersect1d(hits, np.concatenate(allowed))
+    return hits
+
+
+def search_comment_rows(query, creator=None, is_spam=None, path=SPAM_DATA_PATH):
+    """
+    Full-text search over the spam comment corpus, returning sorted row positions (treat as read-only)
+
+    Terms are answered from the row postings and phrases from the token
+    positions, without re-reading any comment text. Results are cached per
+    (query, creator, label), so paging through them does not search again.
+    """
+    return _search_comment_rows(path, dataset_version(path), query, creator or None, is_spam)
+
+
+def fetch_page(rows, page=1, page_size=20, path=SPAM_DATA_PATH):
+    """Fetch only the comment rows of one result page"""
+    start = (page - 1) * page_size
+    return load_spam_comments(path).take(rows[start:start + page_size])
@@ -0,0 +1,88 @@
+import pickle
+
+import streamlit as st
+import numpy as np
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.preprocessing import normalize
+
+from app.data.datasets import dataset_version
+from app.data.spam import SPAM_DATA_PATH, load_spam_comments, load_sample_index
+
+DEFAULT_VECTORIZER_VERSION = 1
+
+
+@st.cache_resource
+def load_vectorizer(vectorizer_version):
+    """The fitted vectorizer shipped with a spam model version"""
+    with open(f'spam_model/vectorizer_v{vectorizer_version}.pkl', 'rb') as f:
+        return pickle.load(f)
+
+
+class SimilarityIndex:
+    """
+    L2-normalised TF-IDF rows of the comment corpus in the spam vectorizer's space
+
+    The spam vectorizers are plain term counters, so IDF weights are fitted on
+    the corpus on top of their vocabulary. With unit-length rows, cosine
+    similarity is a sparse dot product.
+    """
+
+    def __init__(self, texts, vectorizer):
+        self.vectorizer = vectorizer
+        counts = vectorizer.transform(texts)
+        self.tfidf = TfidfTransformer(sublinear_tf=True).fit(counts)
+        self.matrix = normalize(self.tfidf.transform(counts)).astype(np.float32).tocsr()
+
+    def embed(self, texts):
+        return normalize(self.tfidf.transform(self.vectorizer.transform(texts))).astype(np.float32)
+
+    def top_k(self, texts, k=10, rows=None, block_size=50000):
+        """
+        Nearest corpus rows for each query text
+
+        Scores are computed one block of corpus rows at a time and merged
+        with argpartition, so memory stays at block_size x len(texts).
+        Returns (positions, scores), each shaped (len(texts), k), best first.
+        """
+        queries = self.embed(texts).T.tocsc()
+        candidates = np.arange(self.matrix.shape[0]) if rows is None else np.asarray(rows)
+
+        best_rows = np.empty((queries.shape[1], 0), dtype=np.int64)
+        best_scores = np.empty((queries.shape[1], 0), dtype=np.float32)
+        for start in range(0, len(candidates), block_size):
+            block_rows = candidates[start:start + block_size]
+            scores = (self.matrix[block_rows] @ queries).toarray().T
+            best_rows = np.hstack([best_rows, np.broadcast_to(block_rows, scores.shape)])
+            best_scores = np.hstack([best_scores, scores])
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+@st.cache_resource(max_entries=2, show_spinner="Indexing comments for similarity search...")
+def _build_similarity_index(path, version, vectorizer_version):
+    texts = load_spam_comments(path)['Comment'].fillna("").astype(str).tolist()
+    return SimilarityIndex(texts, load_vectorizer(vectorizer_version))
+
+
+def load_similarity_index(path=SPAM_DATA_PATH, vectorizer_version=DEFAULT_VECTORIZER_VERSION):
+    return _build_similarity_index(path, dataset_version(path), vectorizer_version)
+
+
+def find_similar_comments(text, k=10, creator=None, path=SPAM_DATA_PATH, vectorizer_version=DEFAULT_VECTORIZER_VERSION):
+    """Most similar corpus comments to ``text`` with their spam labels and cosine scores"""
+    index = load_similarity_index(path, vectorizer_version)
+    rows = None
+    if creator:
+        sample_index = load_sample_index(path)
+        rows = np.sort(np.concatenate([
+            sample_index.get((creator, label), np.empty(0, dtype=np.int64)) for label in (True, False)
+        ]))
+    positions, scores = index.top_k([text], k=k, rows=rows)
+    result = load_spam_comments(path).take(positions[0])[['Content Creator', 'Comment', 'Prediction']].copy()
+    result.insert(0, 'Similarity', scores[0].round(3))
+    return result[result['Similarity'] > 0]
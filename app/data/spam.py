@@ -0,0 +1,100 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from app.data.datasets import dataset_version
+
+SPAM_DATA_PATH = 'data/comments_analysis_v4.csv'
+SPAM_LABEL = 'SPAM COMMENT'
+
+# 立方体的维度
+CUBE_DIMENSIONS = ['Content Creator', 'Video ID', 'year_month']
+
+
+# cache_resource: the comment frame is shared read-only, avoiding a full copy per rerun
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_spam_comments(path, version):
+    df = pd.read_csv(path)
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+    df['is_spam'] = df['Prediction'] == SPAM_LABEL
+    return df
+
+
+def load_spam_comments(path=SPAM_DATA_PATH):
+    """Comment-level spam predictions, reloaded only when the file changes (treat as read-only)"""
+    return _load_spam_comments(path, dataset_version(path))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_spam_cube(path, version):
+    df = _load_spam_comments(path, version)
+    keys = pd.DataFrame({
+        'Content Creator': df['Content Creator'],
+        'Video ID': df['Video ID'] if 'Video ID' in df.columns else None,
+        'year_month': df['Timestamp'].dt.to_period('M').astype(str).where(df['Timestamp'].notna()),
+        'is_spam': df['is_spam'],
+    })
+    cube = keys.groupby(CUBE_DIMENSIONS, dropna=False, observed=True)['is_spam'].agg(['sum', 'count'])
+    cube = cube.rename(columns={'sum': 'spam', 'count': 'total'}).reset_index()
+    cube['spam'] = cube['spam'].astype(int)
+    return cube
+
+
+def load_spam_cube(path=SPAM_DATA_PATH):
+    """
+    Pre-aggregated (creator x video x month) spam and total comment counts
+
+    Every chart on the Spam Summary overview and time tabs is a roll-up of
+    this frame, so widget interactions cost O(cube slice) instead of
+    re-grouping the full comment table.
+    """
+    return _build_spam_cube(path, dataset_version(path))
+
+
+def slice_cube(cube, creator=None):
+    """Restrict the cube to one content creator (or return it unchanged)"""
+    if creator:
+        return cube[cube['Content Creator'] == creator]
+    return cube
+
+
+def rollup(cube, by):
+    """Sum spam/total over the remaining dimensions and add a percentage column"""
+    grouped = cube.groupby(by, dropna=True)[['spam', 'total']].sum()
+    grouped['percentage'] = grouped['spam'] / grouped['total'] * 100
+    return grouped
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_sample_index(path, version):
+    df = _load_spam_comments(path, version)
+    is_spam = df['is_spam'].to_numpy()
+    creators = df['Content Creator'].to_numpy()
+    index = {}
+    for label in (True, False):
+        label_positions = np.flatnonzero(is_spam == label)
+        index[(None, label)] = label_positions
+        label_creators = creators[label_positions]
+        for creator in pd.unique(label_creators):
+            index[(creator, label)] = label_positions[label_creators == creator]
+    return index
+
+
+def load_sample_index(path=SPAM_DATA_PATH):
+    """Row positions of the comment frame keyed by (creator or None, is_spam)"""
+    return _build_sample_index(path, dataset_version(path))
+
+
+def sample_comments(is_spam, creator=None, k=10, path=SPAM_DATA_PATH, rng=None):
+    """
+    Draw up to ``k`` random comments with the given label
+
+    Positions are drawn from the precomputed index and only the chosen rows
+    are fetched, so the cost does not depend on the size of the corpus.
+    """
+    positions = load_sample_index(path).get((creator or None, bool(is_spam)))
+    if positions is None or len(positions) == 0:
+        return load_spam_comments(path).iloc[0:0]
+    rng = rng or np.random.default_rng()
+    chosen = positions[rng.choice(len(positions), size=min(k, len(positions)), replace=False)]
+    return load_spam_comments(path).take(chosen)
@@ -0,0 +1,179 @@
+import threading
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+from app.data.datasets import bundle_version
+from app.data.aspect_matrix import SparseAspectMatrix
+from app.data.aspect_vocabulary import OTHER_ASPECT, canonicalize
+
+TFIDF_METHODS = ("bart", "roberta", "vader")
+ASPECT_VIDEO_PATHS = {method: f"data/TD_IDF_aspect_video_sentiment_{method}.csv" for method in TFIDF_METHODS}
+
+KEY_COLUMNS = ["video_id", "extracted_aspects"]
+COUNT_COLUMNS = ["negative", "neutral", "positive"]
+
+
+class AspectVideoCounts:
+    """
+    Per (video, extracted aspect) sentiment counts of every TF-IDF method in one columnar table
+
+    The key strings are dictionary-encoded once: ``video_codes`` and
+    ``aspect_codes`` index into the sorted ``videos`` and ``aspects``
+    labels, and each method only adds an (n_rows, 3) int32 block of
+    negative / neutral / positive counts.
+    """
+
+    def __init__(self, videos, aspects, video_codes, aspect_codes, counts):
+        self.videos = pd.Index(videos, name="video_id")
+        self.aspects = pd.Index(aspects, name="extracted_aspects")
+        self.video_codes = video_codes
+        self.aspect_codes = aspect_codes
+        self.counts = counts
+        self._frames = {}
+        self._net = {}
+        self._canonical = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frames(cls, frames):
+        """
+        Build from one DataFrame per method (as read from the CSVs)
+
+        When every file lists the same keys in the same order (the usual
+        case) the first file's keys are encoded and the others only
+        contribute their counts; otherwise the keys are outer-joined and
+        missing counts are 0.
+        """
+        frames = {method: df.rename(columns=str.lower) for method, df in frames.items()}
+        first = next(iter(frames.values()))
+        aligned = all(
+            len(df) == len(first) and all(df[column].equals(first[column]) for column in KEY_COLUMNS)
+            for df in frames.values()
+        )
+        if not aligned:
+            keys = pd.concat([df[KEY_COLUMNS] for df in frames.values()]).drop_duplicates()
+            frames = {
+                method: keys.merge(df, on=KEY_COLUMNS, how="left").fillna({column: 0 for column in COUNT_COLUMNS})
+                for method, df in frames.items()
+            }
+            first = next(iter(frames.values()))
+
+        video_codes, videos = pd.factorize(first["video_id"].astype(str), sort=True)
+        aspect_codes, aspects = pd.factorize(first["extracted_aspects"].astype(str), sort=True)
+        counts = {method: df[COUNT_COLUMNS].to_numpy(dtype=np.int32) for method, df in frames.items()}
+        return cls(videos, aspects, video_codes.astype(np.int32), aspect_codes.astype(np.int32), counts)
+
+    @property
+    def methods(self):
+        return list(self.counts)
+
+    def frame(self, method):
+        """One method's rows in the original CSV layout, with categorical (shared) key columns"""
+        with self._lock:
+            if method not in self._frames:
+                counts = self.counts[method]
+                df = pd.DataFrame({
+                    "video_id": pd.Categorical.from_codes(self.video_codes, categories=self.videos),
+                    "extracted_aspects": pd.Categorical.from_codes(self.aspect_codes, categories=self.aspects),
+                })
+                for position, column in enumerate(COUNT_COLUMNS):
+                    df[column] = counts[:, position]
+                self._frames[method] = df
+            return self._frames[method]
+
+    def _canonical_state(self):
+        with self._lock:
+            if self._canonical is None:
+                # 各方法的提及次数相同，用第一个方法的计数作为频率
+                counts = next(iter(self.counts.values()))
+                frequency = np.bincount(self.aspect_codes, weights=counts.sum(axis=1), minlength=len(self.aspects))
+                vocabulary = canonicalize(self.aspects, frequency)
+                codes, labels = pd.factorize(vocabulary["canonical"], sort=True)
+                # (other) 不作为一个话题出现在矩阵中
+                other = labels.get_indexer([OTHER_ASPECT])[0]
+                if other >= 0:
+                    codes = np.where(codes == other, -1, codes - (codes > other))
+                    labels = labels.delete(other)
+                self._canonical = (vocabulary, codes.astype(np.int32), labels)
+            return self._canonical
+
+    def vocabulary(self):
+        """Raw -> canonical aspect mapping table (see app.data.aspect_vocabulary.canonicalize)"""
+        return self._canonical_state()[0]
+
+    def canonical_aspects(self):
+        """Canonical aspect labels (sorted, without OTHER_ASPECT)"""
+        return self._canonical_state()[2]
+
+    def _row_aspects(self, canonical):
+        """(aspect code per row, aspect labels); rows mapped to OTHER_ASPECT get -1"""
+        if not canonical:
+            return self.aspect_codes, self.aspects
+        _, codes, labels = self._canonical_state()
+        return codes[self.aspect_codes], labels
+
+    def net_matrix(self, method, canonical=True):
+        """
+        Video x aspect net sentiment (positive - negative mentions) as a SparseAspectMatrix
+
+        With ``canonical`` the columns are canonical aspects (mentions of
+        merged phrases are summed and OTHER_ASPECT is left out). Built once
+        per (method, canonical).
+        """
+        key = (method, canonical)
+        if key not in self._net:
+            matrix = self._build_net_matrix(method, canonical)
+            with self._lock:
+                self._net.setdefault(key, matrix)
+        return self._net[key]
+
+    def _build_net_matrix(self, method, canonical):
+        counts = self.counts[method]
+        aspect_codes, aspects = self._row_aspects(canonical)
+        keep = aspect_codes >= 0
+        net = (counts[keep, 2] - counts[keep, 0]).astype(float)
+        matrix = sparse.csr_matrix(
+            (net, (self.video_codes[keep], aspect_codes[keep])),
+            shape=(len(self.videos), len(aspects))
+        )
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        return SparseAspectMatrix(matrix, self.videos, aspects)
+
+    def video_aspects(self, method, video, canonical=True):
+        """
+        One video's aspects with their counts, most mentioned first
+
+        With ``canonical`` merged phrases are summed and phrases below the
+        frequency floor are collected in an OTHER_ASPECT row.
+        """
+        code = self.videos.get_loc(video)
+        rows = np.flatnonzero(self.video_codes == code)
+        counts = self.counts[method][rows]
+        if canonical:
+            labels = self.vocabulary()["canonical"].to_numpy()[self.aspect_codes[rows]]
+        else:
+            labels = self.aspects[self.aspect_codes[rows]]
+        df = pd.DataFrame(counts, columns=COUNT_COLUMNS)
+        df = df.groupby(pd.Index(labels, name="extracted_aspects")).sum()
+        df["mentions"] = df[COUNT_COLUMNS].sum(axis=1)
+        df["net"] = df["positive"] - df["negative"]
+        return df.sort_values("mentions", ascending=False, kind="stable")
+
+
+@st.cache_resource(max_entries=2, show_spinner="Loading extracted aspects...")
+def _build_aspect_video_counts(version):
+    return AspectVideoCounts.from_frames({method: pd.read_csv(path) for method, path in ASPECT_VIDEO_PATHS.items()})
+
+
+def load_aspect_video_counts():
+    """
+    Joint per-video extracted-aspect counts of the TF-IDF methods
+
+    All three method files are loaded together, once per version of any
+    of them, and every TF-IDF view reads from this table.
+    """
+    return _build_aspect_video_counts(bundle_version(*ASPECT_VIDEO_PATHS.values()))
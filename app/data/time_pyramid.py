@@ -0,0 +1,73 @@
+import pandas as pd
+import numpy as np
+
+# 聚合粒度 -> 周期频率（None 为按天的原始数据）；周以周日结束，与 resample('W') 一致
+PYRAMID_LEVELS = {"Daily": None, "Weekly": "W-SUN", "Monthly": "M"}
+
+
+class TimePyramid:
+    """
+    Daily / weekly / monthly aggregates of a wide daily time series from prefix sums
+
+    The cumulative sums and non-missing counts of every column are computed
+    once, together with the first row of every week and month bucket. Any
+    date range at any level is then a difference of prefix sums at the
+    bucket edges (clipped to the range): O(buckets), no resampling, and the
+    same result as slicing the range and calling ``resample(...).mean()``.
+    """
+
+    def __init__(self, daily):
+        if not daily.index.is_monotonic_increasing:
+            daily = daily.sort_index()
+        self.daily = daily
+        self.dates = daily.index
+        values = daily.to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        zeros = np.zeros((1, values.shape[1]))
+        self._sums = np.vstack([zeros, np.cumsum(np.where(observed, values, 0.0), axis=0)])
+        self._counts = np.vstack([zeros, np.cumsum(observed, axis=0)])
+
+        # 每一层：桶的标签（周日 / 月末）、每行所在的桶、每个桶的起始行
+        self._levels = {}
+        for level, freq in PYRAMID_LEVELS.items():
+            if freq is None or len(daily) == 0:
+                continue
+            periods = self.dates.to_period(freq)
+            buckets = pd.period_range(periods[0], periods[-1], freq=freq)
+            # 周期序号连续，减去第一个即为桶号
+            row_bucket = periods.asi8 - buckets[0].ordinal
+            edges = np.searchsorted(row_bucket, np.arange(len(buckets) + 1))
+            labels = pd.DatetimeIndex(buckets.end_time.normalize(), name=self.dates.name)
+            self._levels[level] = (labels, row_bucket, edges)
+
+    def _rows(self, start, end):
+        """Row range [lo, hi) of the dates in [start, end]"""
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side="left")
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        return lo, max(lo, hi)
+
+    def aggregate(self, start=None, end=None, level="Daily", how="mean"):
+        """
+        Per-column mean (or sum) of every ``level`` bucket of the rows in [start, end]
+
+        Buckets at either end of the range only include the rows inside the
+        range; buckets without any row in between are kept (NaN means,
+        zero sums), as resample does.
+        """
+        lo, hi = self._rows(start, end)
+        if level not in self._levels:
+            return self.daily.iloc[lo:hi]
+        labels, row_bucket, edges = self._levels[level]
+        if lo == hi:
+            return pd.DataFrame(columns=self.daily.columns, index=labels[:0], dtype=float)
+
+        first, last = row_bucket[lo], row_bucket[hi - 1]
+        bounds = np.clip(edges[first:last + 2], lo, hi)
+        sums = self._sums[bounds[1:]] - self._sums[bounds[:-1]]
+        if how == "sum":
+            result = sums
+        else:
+            counts = self._counts[bounds[1:]] - self._counts[bounds[:-1]]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = np.where(counts > 0, sums / counts, np.nan)
+        return pd.DataFrame(result, index=labels[first:last + 1], columns=self.daily.columns)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 显示名称 -> 方法
+ANOMALY_METHODS = {
+    "Rolling z-score": "zscore",
+    "EWMA": "ewma",
+    "Rolling median / MAD": "mad",
+}
+DEFAULT_WINDOW = 5
+DEFAULT_THRESHOLD = 2.0
+
+# 正态分布下 MAD / 平均绝对偏差与标准差的换算系数
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def _rolling_median_mad(values, window):
+    """
+    Trailing-window median and scaled MAD of every column, NaN until the window is full
+
+    Where more than half of a window is identical the MAD is 0; the scaled
+    mean absolute deviation from the median is used there instead.
+    """
+    n = values.shape[0]
+    median = np.full(values.shape, np.nan)
+    mad = np.full(values.shape, np.nan)
+    if n >= window:
+        # (n - window + 1, 列数, window) 的只读视图，不复制数据
+        windows = sliding_window_view(values, window, axis=0)
+        window_median = np.median(windows, axis=-1)
+        deviation = np.abs(windows - window_median[..., None])
+        window_mad = MAD_SCALE * np.median(deviation, axis=-1)
+        window_mad = np.where(window_mad > 0, window_mad, MEAN_AD_SCALE * deviation.mean(axis=-1))
+        median[window - 1:] = window_median
+        mad[window - 1:] = window_mad
+    return median, mad
+
+
+class AnomalyBands:
+    """
+    Expected value, bounds and anomaly mask of every series in a wide frame
+
+    All attributes are frames shaped like the input (index = dates,
+    columns = series). A point is an anomaly when it lies outside
+    ``center ± threshold * spread``, where center and spread come from the
+    ``window`` points before it; points without a full window before them
+    are never flagged.
+    """
+
+    def __init__(self, values, center, spread, threshold):
+        self.values = values
+        self.center = center
+        self.lower = center - threshold * spread
+        self.upper = center + threshold * spread
+        self.mask = (values > self.upper) | (values < self.lower)
+
+    def anomalies(self, column, start=None, end=None):
+        """Anomalous points of one series in [start, end]"""
+        mask = self.mask[column].loc[start:end]
+        return self.values[column].loc[start:end][mask]
+
+    def counts(self, start=None, end=None):
+        """Number of anomalies per series in [start, end]"""
+        return self.mask.loc[start:end].sum()
+
+
+def detect_anomalies(frame, method="zscore", window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+    """
+    Anomalies of every column of a wide time series frame in one pass
+
+    Each point is compared with the statistics of the preceding window
+    (the point itself is left out, so a spike cannot widen its own band).
+
+    Parameters:
+    -----------
+    method : str
+        "zscore": trailing rolling mean / standard deviation,
+        "ewma": exponentially weighted mean / standard deviation (span = window),
+        "mad": trailing rolling median / scaled median absolute deviation
+    window : int
+        Window length (or EWMA span) in rows
+    threshold : float
+        Number of standard deviations (or scaled MADs) outside which a point is flagged
+    """
+    frame = frame.astype(float)
+    if method == "zscore":
+        rolling = frame.rolling(window=window)
+        center, spread = rolling.mean(), rolling.std()
+    elif method == "ewma":
+        weighted = frame.ewm(span=window, min_periods=window)
+        center, spread = weighted.mean(), weighted.std()
+    elif method == "mad":
+        median, mad = _rolling_median_mad(frame.to_numpy(), window)
+        center = pd.DataFrame(median, index=frame.index, columns=frame.columns)
+        spread = pd.DataFrame(mad, index=frame.index, columns=frame.columns)
+    else:
+        raise ValueError(f"Unknown anomaly method: {method}")
+    return AnomalyBands(frame, center.shift(1), spread.shift(1), threshold)
@@ -0,0 +1,143 @@
+"""
+Peak-preserving (LTTB) downsampling of long time series before plotting
+
+Limitations:
+
+- Streamlit does not tell the script how wide the browser is. The point
+  budget therefore comes from a fixed nominal width (LAYOUT_WIDTH, the main
+  area of the wide layout) divided by the number of st.columns the chart
+  sits in. Every call site passes its own column count via point_budget().
+  On a narrower window more points are sent than can be drawn; on a much
+  wider screen the line is a little coarser than the display.
+- Zooming into a chart does not load more points. More detail comes from
+  narrowing the date range (which is downsampled again) or from the
+  "Full resolution" checkbox, which plots every point.
+"""
+import numpy as np
+import pandas as pd
+
+# wide 布局下主内容区的大致像素宽度（固定值，见模块说明）；每条曲线每个像素保留约一个点
+LAYOUT_WIDTH = 1400
+POINTS_PER_PIXEL = 1.0
+
+
+def point_budget(columns=1, layout_width=LAYOUT_WIDTH, points_per_pixel=POINTS_PER_PIXEL):
+    """
+    Points per series worth drawing in a chart that spans ``1 / columns`` of the page
+
+    Streamlit does not report the browser width to the script, so the
+    width comes from the page layout; charts placed in st.columns pass the
+    number of columns.
+    """
+    return max(int(layout_width / columns * points_per_pixel), 3)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Positions of the points kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. Every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket, so peaks and troughs survive
+    even at a small fraction of the original resolution.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _valid_runs(values):
+    """(start, end) of every run of consecutive non-NaN values"""
+    valid = np.r_[False, ~np.isnan(values), False]
+    changes = np.flatnonzero(np.diff(valid.astype(np.int8)))
+    return changes[0::2], changes[1::2]
+
+
+def downsample_series(series, max_points):
+    """
+    LTTB-downsample a Series with a numeric or datetime index to about ``max_points`` points
+
+    ``max_points`` comes from point_budget() for the chart's place in the
+    layout. Missing values split the
+    series into runs that are downsampled separately (each gets a share
+    of the budget proportional to its length, at least 3 points), and one
+    NaN is kept between runs so the line still breaks at the gap.
+    """
+    if len(series) <= max_points:
+        return series
+    index = series.index
+    if isinstance(index, pd.DatetimeIndex):
+        x = index.asi8
+    else:
+        x = np.asarray(index, dtype=float)
+    y = series.to_numpy(dtype=float)
+
+    starts, ends = _valid_runs(y)
+    total = (ends - starts).sum()
+    if total == 0:
+        return series.iloc[:0]
+    positions = []
+    for start, end in zip(starts, ends):
+        if positions:
+            # 保留上一段之后的第一个缺失值，使折线在缺口处断开
+            positions.append(np.asarray([start - 1]))
+        budget = max(3, int(round(max_points * (end - start) / total)))
+        positions.append(start + lttb_indices(x[start:end], y[start:end], budget))
+    return series.iloc[np.concatenate(positions)]
+
+
+def downsample_frame(df, columns=None, max_points=None, full_resolution=False,
+                     index_name="date", var_name="variable", value_name="value"):
+    """
+    Wide time series frame -> long frame with each column downsampled on its own
+
+    Every series keeps its own peaks, so the result has about
+    ``max_points`` rows per column whatever the length of the history.
+    With ``full_resolution`` the data is only reshaped.
+
+    Parameters:
+    -----------
+    df : DataFrame
+        One column per series, indexed by date
+    columns : list, optional
+        Columns to include (default: all)
+    max_points : int
+        Points per series, from point_budget(); required unless ``full_resolution``
+    """
+    if max_points is None and not full_resolution:
+        raise ValueError("max_points is required unless full_resolution is set")
+    columns = list(df.columns if columns is None else columns)
+    parts = []
+    for column in columns:
+        series = df[column] if full_resolution else downsample_series(df[column], max_points)
+        parts.append(pd.DataFrame({
+            index_name: series.index,
+            var_name: column,
+            value_name: series.to_numpy(),
+        }))
+    if not parts:
+        return pd.DataFrame(columns=[index_name, var_name, value_name])
+    return pd.concat(parts, ignore_index=True)
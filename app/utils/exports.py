@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import io
+
+import streamlit as st
+
+from app.utils.figures import FigureCache
+
+# CSV按块序列化，不会一次生成整个未压缩的CSV字符串
+CSV_CHUNK_ROWS = 50000
+# 下载按钮需要完整的文件内容，无法真正流式传输；导出最多包含这么多行，
+# 内存峰值因此有上限，超出的行会被截掉并在界面上说明
+EXPORT_MAX_ROWS = 500000
+# 缓存的导出文件个数（每个最多 EXPORT_MAX_ROWS 行）
+EXPORT_CACHE_ENTRIES = 8
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        try:
+            import fastparquet  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+
+def write_csv(df):
+    """Plain CSV; the UTF-8 BOM lets Excel detect the encoding"""
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def write_csv_gz(df, chunk_rows=CSV_CHUNK_ROWS):
+    """Gzip-compressed CSV, serialized chunk by chunk into an in-memory buffer"""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+        with io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+    return buffer.getvalue()
+
+
+def write_parquet(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+# 格式 -> (扩展名, MIME类型, 写入函数)
+FORMATS = {
+    "CSV": ("csv", "text/csv", write_csv),
+    "CSV (gzip)": ("csv.gz", "application/gzip", write_csv_gz),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", write_parquet),
+}
+
+
+def available_formats():
+    """Export formats usable in this environment (Parquet needs pyarrow or fastparquet)"""
+    return [name for name in FORMATS if name != "Parquet" or _parquet_available()]
+
+
+@st.cache_resource
+def get_export_cache():
+    """Process-wide cache of materialized export files"""
+    return FigureCache(max_entries=EXPORT_CACHE_ENTRIES)
+
+
+def _deferred_downloads():
+    """Whether st.download_button accepts a callable that builds the file on click (newer Streamlit)"""
+    try:
+        from streamlit.runtime.media_file_manager import MediaFileManager
+    except ImportError:
+        return False
+    return hasattr(MediaFileManager, "add_deferred")
+
+
+def export_bytes(file_name, version, fmt, build, params=None, max_rows=EXPORT_MAX_ROWS):
+    """
+    Serialized export for (file name, dataset version, parameters, format)
+
+    ``build()`` returns the DataFrame and is only called on a cache miss,
+    so neither the frame nor the file is produced until someone asks.
+    Only the first ``max_rows`` rows are written.
+    """
+    cache = get_export_cache()
+    key = FigureCache.make_key(file_name, version, {"format": fmt, "params": params, "max_rows": max_rows})
+    data = cache.get(key)
+    if data is None:
+        data = FORMATS[fmt][2](build().head(max_rows))
+        cache.put(key, data)
+    return data
+
+
+def export_button(label, file_name, version, build, params=None):
+    """
+    Download control that materializes the file only on request
+
+    Replaces inline base64 links: nothing is serialized or sent to the
+    browser until the user asks. Where Streamlit supports it the file is
+    built when "Download" is clicked; older versions need a "Prepare file"
+    click first. Either way the whole file is held in memory while it is
+    sent, so exports stop at EXPORT_MAX_ROWS rows. ``params`` must hold
+    any widget value the exported frame depends on that is not already
+    part of the file name.
+    """
+    stem = file_name[:-4] if file_name.endswith(".csv") else file_name
+    key = "export_" + hashlib.sha1("|".join(FigureCache.make_key(stem, version, params)).encode()).hexdigest()[:12]
+
+    with st.popover(label):
+        fmt = st.radio("Format:", available_formats(), horizontal=True, key=f"{key}_format")
+        st.caption(f"Exports include at most the first {EXPORT_MAX_ROWS:,} rows.")
+        extension, mime, _ = FORMATS[fmt]
+        if _deferred_downloads():
+            st.download_button(
+                "Download",
+                data=lambda: export_bytes(stem, version, fmt, build, params),
+                file_name=f"{stem}.{extension}",
+                mime=mime,
+                on_click="ignore",
+                key=f"{key}_download"
+            )
+            return
+
+        if st.button("Prepare file", key=f"{key}_prepare"):
+            st.session_state[f"{key}_requested"] = fmt
+
+        if st.session_state.get(f"{key}_requested") == fmt:
+            st.download_button(
+                "Download",
+                data=export_bytes(stem, version, fmt, build, params),
+                file_name=f"{stem}.{extension}",
+                mime=mime,
+                key=f"{key}_download"
+            )
@@ -0,0 +1,119 @@
+import json
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+import plotly.io as pio
+import plotly.graph_objects as go
+
+# 超过这个点数后改用WebGL渲染并关闭逐点悬停
+WEBGL_POINT_THRESHOLD = 5000
+
+
+class FigureCache:
+    """
+    Bounded LRU cache of serialized Plotly figures
+
+    Keys are (dataset version, chart id, parameters). Values are the figure
+    JSON, so cached entries are immutable and every caller gets a fresh
+    Figure object it is free to modify.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(chart_id, version, params):
+        return (str(version), chart_id, json.dumps(params, sort_keys=True, default=str))
+
+    def get(self, key):
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return figure_json
+
+    def put(self, key, figure_json):
+        with self._lock:
+            self._entries[key] = figure_json
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide figure cache shared by every session"""
+    return FigureCache()
+
+
+def cached_figure(chart_id, version, params, build):
+    """
+    Return the figure for (version, chart_id, params), calling ``build()`` only on a miss
+
+    ``version`` should identify the data behind the chart (see
+    app.data.datasets.dataset_version) and ``params`` every widget value the
+    chart depends on.
+    """
+    cache = get_figure_cache()
+    key = FigureCache.make_key(chart_id, version, params)
+    figure_json = cache.get(key)
+    if figure_json is None:
+        fig = build()
+        cache.put(key, fig.to_json())
+        return fig
+    return pio.from_json(figure_json, skip_invalid=True)
+
+
+def plotly_chart(chart_id, version, params, build, **kwargs):
+    """st.plotly_chart backed by the figure cache"""
+    kwargs.setdefault("use_container_width", True)
+    st.plotly_chart(cached_figure(chart_id, version, params, build), **kwargs)
+
+
+def _trace_points(trace):
+    if trace.type == "splom":
+        dimensions = trace.dimensions or ()
+        return len(dimensions[0].values) * len(dimensions) if dimensions and dimensions[0].values is not None else 0
+    for attr in ("x", "y"):
+        values = getattr(trace, attr, None)
+        if values is not None:
+            return len(values)
+    return 0
+
+
+def webgl_if_large(fig, threshold=WEBGL_POINT_THRESHOLD):
+    """
+    Switch a figure to WebGL rendering when it carries more than ``threshold`` points
+
+    Scatter traces become Scattergl, box plots stop drawing every sample
+    (only outliers are kept) and per-point hover is turned off on the
+    large traces. Small figures are returned unchanged.
+    """
+    if sum(_trace_points(trace) for trace in fig.data) <= threshold:
+        return fig
+
+    traces = []
+    for trace in fig.data:
+        if trace.type == "scatter":
+            props = trace.to_plotly_json()
+            props.pop("type", None)
+            trace = go.Scattergl(props, skip_invalid=True)
+        if trace.type in ("scattergl", "splom"):
+            trace.update(hoverinfo="skip", hovertemplate=None, hovertext=None)
+        elif trace.type == "box" and trace.boxpoints == "all":
+            # 箱线图的散点没有WebGL版本，只保留离群点
+            trace.update(boxpoints="outliers")
+        traces.append(trace)
+    return go.Figure(data=traces, layout=fig.layout)
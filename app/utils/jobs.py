@@ -0,0 +1,291 @@
+import heapq
+import inspect
+import itertools
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+# 任务优先级：数值越小越先执行
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _accepts_job(fn):
+    try:
+        return "job" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class Job:
+    """A unit of work submitted to the scheduler"""
+
+    def __init__(self, user_id, fn, args, kwargs, priority, label):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.label = label or getattr(fn, "__name__", "job")
+        self.state = PENDING
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self._done = threading.Event()
+
+    @property
+    def is_bulk(self):
+        return self.priority >= PRIORITY_BULK
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancelled(self):
+        """True once cancellation was requested; job functions should check it and stop early"""
+        return self.cancel_requested or self.state == CANCELLED
+
+    def set_progress(self, value):
+        """Report progress between 0 and 1 from inside the job function"""
+        self.progress = min(max(float(value), 0.0), 1.0)
+
+    def wait(self, timeout=None):
+        """Block until the job finishes and return its result (raises on failure)"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Job '{self.label}' did not finish within {timeout}s")
+        if self.state == FAILED:
+            raise self.error
+        return self.result
+
+
+class JobScheduler:
+    """
+    In-process job queue with a bounded worker pool
+
+    Parameters:
+    -----------
+    max_workers : int
+        Total number of worker threads
+    per_user_limit : int
+        Maximum number of bulk jobs a single user may have running at the same
+        time (interactive jobs are not counted and never held back by it)
+    reserved_interactive : int
+        Workers that bulk jobs are never allowed to occupy, so interactive
+        requests always find a free worker while bulk batches are running
+    """
+
+    def __init__(self, max_workers=4, per_user_limit=2, reserved_interactive=1, history_size=200):
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self.reserved_interactive = min(reserved_interactive, max_workers - 1)
+        self.history_size = history_size
+
+        self._lock = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._jobs = {}
+        self._bulk_per_user = {}
+        self._running_bulk = 0
+        self._shutdown = False
+
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, user_id, fn, *args, priority=PRIORITY_INTERACTIVE, label=None, **kwargs):
+        """
+        Queue ``fn(*args, **kwargs)`` and return the Job
+
+        If ``fn`` accepts a ``job`` keyword argument it receives the Job
+        object so it can report progress and check for cancellation.
+        """
+        job = Job(user_id, fn, args, kwargs, priority, label)
+        with self._lock:
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            self._trim_history()
+            self._lock.notify_all()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """Return a plain dict describing the job, or None if it is unknown"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        return {
+            "id": job.id,
+            "label": job.label,
+            "state": job.state,
+            "progress": job.progress,
+            "error": str(job.error) if job.error else None,
+            "queue_position": self._queue_position(job),
+        }
+
+    def cancel(self, job_id):
+        """
+        Cancel a job
+
+        A pending job is cancelled at once. A running job only gets
+        ``job.cancelled`` set; it stays RUNNING until its function returns
+        and is then marked CANCELLED.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished or job.cancel_requested:
+                return False
+            job.cancel_requested = True
+            if job.state == PENDING:
+                self._finish(job, CANCELLED)
+            self._lock.notify_all()
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+
+    def _finish(self, job, state):
+        """Move a job to a terminal state and wake its waiters (caller holds the lock)"""
+        job.state = state
+        job.finished_at = time.time()
+        job._done.set()
+
+    def _queue_position(self, job):
+        if job.state != PENDING:
+            return 0
+        with self._lock:
+            ordered = sorted(entry for entry in self._queue if entry[2].state == PENDING)
+        for position, entry in enumerate(ordered, start=1):
+            if entry[2] is job:
+                return position
+        return 0
+
+    def _trim_history(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(finished) - self.history_size
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.finished_at)[:excess]:
+                del self._jobs[job.id]
+
+    def _can_run(self, job):
+        if not job.is_bulk:
+            return True
+        if self._bulk_per_user.get(job.user_id, 0) >= self.per_user_limit:
+            return False
+        return self._running_bulk < self.max_workers - self.reserved_interactive
+
+    def _next_job(self):
+        """Pop the highest priority runnable job (caller holds the lock)"""
+        deferred = []
+        picked = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if job.finished:
+                continue
+            if self._can_run(job):
+                picked = job
+                break
+            deferred.append(entry)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        return picked
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None and not self._shutdown:
+                    self._lock.wait()
+                    job = self._next_job()
+                if self._shutdown:
+                    # 已取出的任务不再执行，但要唤醒等待它的调用方
+                    if job is not None:
+                        self._finish(job, CANCELLED)
+                    return
+                job.state = RUNNING
+                job.started_at = time.time()
+                if job.is_bulk:
+                    self._bulk_per_user[job.user_id] = self._bulk_per_user.get(job.user_id, 0) + 1
+                    self._running_bulk += 1
+
+            state = DONE
+            try:
+                kwargs = dict(job.kwargs)
+                if _accepts_job(job.fn):
+                    kwargs["job"] = job
+                result = job.fn(*job.args, **kwargs)
+                if not job.cancel_requested:
+                    job.result = result
+                    job.progress = 1.0
+            except Exception as e:
+                job.error = e
+                state = FAILED
+            finally:
+                with self._lock:
+                    if state == DONE and job.cancel_requested:
+                        state = CANCELLED
+                    if job.is_bulk:
+                        self._bulk_per_user[job.user_id] -= 1
+                        self._running_bulk -= 1
+                    self._finish(job, state)
+                    self._lock.notify_all()
+
+
+@st.cache_resource
+def get_scheduler():
+    """Process-wide scheduler shared by every Streamlit session"""
+    return JobScheduler(max_workers=4, per_user_limit=2, reserved_interactive=1)
+
+
+def get_user_id():
+    """Stable identifier for the current browser session"""
+    if "job_user_id" not in st.session_state:
+        st.session_state.job_user_id = uuid.uuid4().hex
+    return st.session_state.job_user_id
+
+
+def show_job_status(job_id):
+    """Render the status of a job; returns the Job once it has finished, otherwise None"""
+    scheduler = get_scheduler()
+    job = scheduler.get(job_id)
+    if job is None:
+        st.info("This job is no longer available.")
+        return None
+
+    if job.state == PENDING:
+        position = scheduler.status(job_id)["queue_position"]
+        st.info(f"⏳ {job.label}: queued (position {position})")
+    elif job.state == RUNNING:
+        st.progress(job.progress, text=f"⚙️ {job.label}: running ({job.progress:.0%})")
+    elif job.state == DONE:
+        st.success(f"✅ {job.label}: finished in {job.finished_at - job.started_at:.1f}s")
+        return job
+    elif job.state == FAILED:
+        st.error(f"❌ {job.label}: {job.error}")
+        return job
+    else:
+        st.warning(f"{job.label}: cancelled")
+        return job
+    return None
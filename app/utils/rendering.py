@@ -0,0 +1,66 @@
+import hashlib
+import io
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from app.utils.figures import FigureCache
+
+
+@st.cache_resource
+def get_png_cache():
+    """Process-wide cache of rendered PNG bytes"""
+    return FigureCache(max_entries=256)
+
+
+def input_hash(*parts):
+    """Content hash of the inputs of a chart (DataFrames are hashed by value)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            try:
+                digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            except TypeError:
+                # 含有列表等不可哈希的单元格
+                digest.update(part.to_csv().encode())
+            labels = part.columns if isinstance(part, pd.DataFrame) else part.name
+            digest.update(repr(labels).encode())
+        elif isinstance(part, np.ndarray):
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def render_png(chart_id, inputs, draw, figsize=(10, 6), dpi=100):
+    """
+    Render a matplotlib chart to PNG bytes, cached by chart id and input hash
+
+    ``draw(fig)`` receives a fresh matplotlib Figure that is not registered
+    with pyplot, so nothing leaks into pyplot's global figure manager, and
+    the figure is always cleared once the bytes are written.
+    """
+    cache = get_png_cache()
+    key = (chart_id, input_hash(figsize, dpi, *inputs))
+    png = cache.get(key)
+    if png is not None:
+        return png
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        draw(fig)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        png = buffer.getvalue()
+    finally:
+        fig.clear()
+    cache.put(key, png)
+    return png
+
+
+def show_png(chart_id, inputs, draw, figsize=(10, 6), dpi=100):
+    """Render (or reuse) a matplotlib chart and display it"""
+    st.image(render_png(chart_id, inputs, draw, figsize, dpi), use_container_width=True)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.anomalies import detect_anomalies
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2022-01-01", periods=200, freq="D")
+    df = pd.DataFrame({"a": rng.normal(10, 1, 200), "b": rng.normal(0, 1, 200)}, index=index)
+    df.iloc[120, 0] = 40.0
+    df.iloc[150, 1] = -15.0
+    return df
+
+
+@pytest.mark.parametrize("method", ["zscore", "ewma", "mad"])
+def test_spikes_are_flagged(method):
+    df = _frame()
+    bands = detect_anomalies(df, method, window=10, threshold=4.0)
+    assert bands.mask.iloc[120, 0]
+    assert bands.mask.iloc[150, 1]
+    assert pd.Timestamp("2022-05-01") in bands.anomalies("a").index
+    assert bands.counts().ge(1).all()
+
+
+def test_zscore_uses_preceding_window():
+    df = _frame()
+    bands = detect_anomalies(df, "zscore", window=10, threshold=2.0)
+    expected = df["a"].rolling(10).mean().shift(1)
+    pd.testing.assert_series_equal(bands.center["a"], expected, check_names=False)
+    # 窗口未满的点不标记
+    assert not bands.mask.iloc[:10].any().any()
+
+
+def test_mad_matches_pandas_rolling_median():
+    df = _frame()
+    bands = detect_anomalies(df, "mad", window=7)
+    expected = df.rolling(7).median().shift(1)
+    np.testing.assert_allclose(bands.center.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_slicing_by_date():
+    bands = detect_anomalies(_frame(), "zscore", window=10, threshold=4.0)
+    assert bands.counts("2022-01-01", "2022-03-01").sum() == 0
+    assert bands.anomalies("a", "2022-04-01", "2022-05-31").index.tolist() == [pd.Timestamp("2022-05-01")]
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        detect_anomalies(_frame(), "nope")
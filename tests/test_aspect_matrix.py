@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from app.data.aspect_matrix import SparseAspectMatrix, TopAspects, top_k_columns
+
+
+def _wide():
+    return pd.DataFrame({
+        "video": [3, 1, 2, 1],
+        "range": [0, 2, -1, 9],
+        "battery": [1, 0, 0, 9],
+        "tesla": [0, 0, 0, 9],
+    })
+
+
+def test_from_frame_matches_dense_table():
+    matrix = SparseAspectMatrix.from_frame(_wide(), "video", ["range", "battery", "tesla"])
+    expected = _wide().drop_duplicates("video").set_index("video").sort_index()[["battery", "range", "tesla"]]
+    dense = matrix.frame()
+    assert dense.index.tolist() == [1, 2, 3]
+    assert dense.columns.tolist() == ["battery", "range", "tesla"]
+    np.testing.assert_array_equal(dense.to_numpy(), expected.to_numpy(dtype=float))
+    # 零值不存储
+    assert matrix.matrix.nnz == 3
+
+
+def test_matching_rows_and_column_means():
+    matrix = SparseAspectMatrix.from_frame(_wide(), "video", ["range", "battery", "tesla"])
+    assert matrix.matching_rows("").tolist() == [0, 1, 2]
+    assert matrix.matching_rows(" 2 ").tolist() == [1]
+    assert matrix.matching_rows("x").tolist() == []
+    means = matrix.column_means(np.array([0, 1]))
+    assert means.to_dict() == {"battery": 0.0, "range": 0.5, "tesla": 0.0}
+    assert matrix.column_means(np.array([], dtype=int)).isna().all()
+
+
+def test_top_k_columns_orders_and_puts_nan_last():
+    values = np.array([[1.0, np.nan, 3.0, 2.0], [0.0, -1.0, 5.0, np.nan]])
+    assert top_k_columns(values, 2).tolist() == [[2, 3], [2, 0]]
+    assert top_k_columns(values, 2, largest=False).tolist() == [[0, 3], [1, 0]]
+    assert top_k_columns(values, 10).shape == (2, 4)
+
+
+def test_top_aspects_matches_full_sort():
+    rng = np.random.default_rng(0)
+    scores = pd.DataFrame(rng.normal(size=(4, 30)), index=list("abcd"), columns=[f"aspect{i}" for i in range(30)])
+    ranked = TopAspects(scores, max_k=10)
+    for row in scores.index:
+        assert ranked.highest(row, 5).tolist() == scores.loc[row].sort_values(ascending=False).head(5).tolist()
+        assert ranked.lowest(row, 3).tolist() == scores.loc[row].sort_values().head(3).tolist()
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from app.data.aspect_sentiment import SOURCE_TFIDF, AspectSentimentBundle, creator_keyword_scores
+from app.data.aspect_vocabulary import canonicalize
+
+
+class _Extracted:
+    def __init__(self, phrases):
+        self._vocabulary = canonicalize(phrases, [5] * len(phrases))
+
+    def vocabulary(self):
+        return self._vocabulary
+
+
+class _Bundle(AspectSentimentBundle):
+    """TF-IDF bundle over files in a temporary directory, with a fixed extracted-aspect vocabulary"""
+
+    def __init__(self, paths):
+        super().__init__(SOURCE_TFIDF, "vader", paths, version=0)
+
+    def extracted_aspects(self):
+        return _Extracted(["look", "battery", "tesla"])
+
+
+def test_merged_columns_are_averaged(tmp_path):
+    path = tmp_path / "aspect_video.csv"
+    path.write_text(
+        "channel,video,tesla,look,looks,battery\n"
+        "A,1,1,2,4,0\n"
+        "A,2,3,0,2,-1\n"
+        "B,3,0,1,1,1\n"
+    )
+    bundle = _Bundle({"aspect_video": str(path)})
+    merged = bundle.creator_matrix("A").frame()
+    assert sorted(merged.columns) == ["battery", "look", "tesla"]
+    # look 和 looks 取平均而不是相加，和未合并的列在同一尺度上
+    assert merged["look"].tolist() == [3.0, 1.0]
+    assert merged["tesla"].tolist() == [1.0, 3.0]
+
+
+MATRIX_FILE = (
+    ",A,A,A,B,B,B\n"
+    ",tesla,look,looks,tesla,look,looks\n"
+    "0,1,2,4,0,1,1\n"
+    "1,3,0,2,,3,1\n"
+)
+
+
+def test_creator_keyword_scores(tmp_path):
+    path = tmp_path / "matrix.csv"
+    path.write_text(MATRIX_FILE)
+    scores = creator_keyword_scores(pd.read_csv(path))
+    assert list(scores.index) == ["A", "B"]
+    assert sorted(scores.columns) == ["look", "looks", "tesla"]
+    # 每个单元格是该创作者各视频的平均分（缺失值不计入）
+    assert scores.loc["A", "tesla"] == 2.0
+    assert scores.loc["A", "looks"] == 3.0
+    assert scores.loc["B", "tesla"] == 0.0
+
+
+def test_creator_aspect_matrix_uses_canonical_columns(tmp_path):
+    path = tmp_path / "matrix.csv"
+    path.write_text(MATRIX_FILE)
+    matrix = _Bundle({"aspect_matrix": str(path)}).creator_aspect_matrix()
+    assert sorted(matrix.columns) == ["look", "tesla"]
+    assert matrix.loc["A", "look"] == 2.0
+    assert matrix.loc["B", "look"] == 1.5
@@ -0,0 +1,56 @@
+from app.data.aspect_vocabulary import OTHER_ASPECT, canonicalize, map_labels, normalize_aspect
+
+
+def test_normalize_drops_stop_words_and_short_tokens():
+    assert normalize_aspect("The Tesla's batteries!!") == "tesla battery"
+    assert normalize_aspect("partner partner") == "partner"
+    assert normalize_aspect("I") == ""
+    assert normalize_aspect("id") == ""
+    assert normalize_aspect("things") == ""
+    assert normalize_aspect("EV") == "ev"
+
+
+def test_domain_words_survive():
+    for word in ["fire", "system", "front", "back", "top", "full", "side", "part", "show", "bill"]:
+        assert normalize_aspect(word) == word
+    assert normalize_aspect("the battery fire") == "battery fire"
+    assert normalize_aspect("front of the car") == "front car"
+
+
+def test_acronyms_and_short_plurals():
+    assert normalize_aspect("NACS") == "nacs"
+    assert normalize_aspect("CCS") == "ccs"
+    assert normalize_aspect("gas") == "gas"
+    assert normalize_aspect("EVs") == normalize_aspect("EV") == "ev"
+    vocabulary = canonicalize(["ev", "evs", "nacs"], [5, 5, 5]).set_index("aspect")["canonical"]
+    assert vocabulary["evs"] == "ev"
+    assert vocabulary["nacs"] == "nacs"
+
+
+def _vocabulary():
+    phrases = ["battery", "batteries", "charging station", "charging", "ev charging", "i", "you",
+               "batterys", "charging stations near me", "zebra", "tesla"]
+    frequencies = [10, 4, 5, 6, 1, 40, 30, 1, 1, 1, 8]
+    return canonicalize(phrases, frequencies).set_index("aspect")["canonical"]
+
+
+def test_stop_words_never_become_canonical():
+    vocabulary = _vocabulary()
+    assert vocabulary["i"] == OTHER_ASPECT
+    assert vocabulary["you"] == OTHER_ASPECT
+    assert "i" not in set(vocabulary) and "you" not in set(vocabulary)
+
+
+def test_merges_and_fallbacks():
+    vocabulary = _vocabulary()
+    assert vocabulary["batteries"] == "battery"
+    # 长尾：先字符相似度，再按包含的最长规范话题
+    assert vocabulary["batterys"] == "battery"
+    assert vocabulary["ev charging"] == "charging"
+    assert vocabulary["charging stations near me"] == "charging station"
+    assert vocabulary["zebra"] == OTHER_ASPECT
+
+
+def test_map_labels():
+    vocabulary = canonicalize(["battery", "batteries", "charging station"], [10, 4, 5])
+    assert map_labels(["Batteries", "station charging", "range"], vocabulary) == ["battery", "charging station", "range"]
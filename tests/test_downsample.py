@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.downsample import downsample_frame, downsample_series, lttb_indices, point_budget
+
+
+def _series(values):
+    return pd.Series(values, index=pd.date_range("2020-01-01", periods=len(values), freq="D"))
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    y = np.zeros(1000)
+    y[437] = 50.0
+    kept = lttb_indices(np.arange(1000), y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 437 in kept
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_point_budget_follows_layout_width():
+    assert point_budget(layout_width=1000) == 1000
+    assert point_budget(columns=2, layout_width=1000) == 500
+    assert point_budget(layout_width=1000, points_per_pixel=0.5) == 500
+
+
+def test_short_series_unchanged_including_nans():
+    series = _series([1.0, np.nan, 3.0])
+    assert downsample_series(series, max_points=10).equals(series)
+
+
+def test_nan_gaps_are_kept_as_line_breaks():
+    values = np.sin(np.arange(2000) / 10.0)
+    values[800:900] = np.nan
+    shown = downsample_series(_series(values), max_points=100)
+    assert shown.isna().sum() == 1
+    gap = shown.index[shown.isna()][0]
+    assert shown.index[0] < gap < shown.index[-1]
+    # 缺口两侧的点都来自各自的连续段
+    before, after = shown.loc[:gap].iloc[:-1], shown.loc[gap:].iloc[1:]
+    assert before.index[-1] < pd.Timestamp("2020-01-01") + pd.Timedelta(days=800)
+    assert after.index[0] >= pd.Timestamp("2020-01-01") + pd.Timedelta(days=900)
+    assert 95 <= shown.notna().sum() <= 105
+
+
+def test_downsample_frame_per_column_budget():
+    df = pd.DataFrame({"a": np.arange(5000.0), "b": np.arange(5000.0)[::-1]},
+                      index=pd.date_range("2010-01-01", periods=5000, freq="D"))
+    long = downsample_frame(df, max_points=200)
+    assert long.groupby("variable").size().tolist() == [200, 200]
+    assert len(downsample_frame(df, full_resolution=True)) == 10000
+
+
+def test_frame_requires_a_budget_unless_full_resolution():
+    df = pd.DataFrame({"a": np.arange(10.0)}, index=pd.date_range("2020-01-01", periods=10))
+    with pytest.raises(ValueError):
+        downsample_frame(df)
+    assert len(downsample_frame(df, full_resolution=True)) == 10
@@ -0,0 +1,30 @@
+import gzip
+import io
+
+import pandas as pd
+
+from app.utils.exports import export_bytes, write_csv, write_csv_gz
+
+
+def _frame(n):
+    return pd.DataFrame({"id": range(n), "text": [f"row {i}" for i in range(n)]})
+
+
+def test_gzip_chunks_match_plain_csv():
+    df = _frame(25)
+    plain = write_csv(df).decode("utf-8-sig")
+    assert gzip.decompress(write_csv_gz(df, chunk_rows=7)).decode("utf-8") == plain
+
+
+def test_export_is_built_lazily_and_capped():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return _frame(30)
+
+    data = export_bytes("test_export_cap", 1, "CSV", build, max_rows=10)
+    assert pd.read_csv(io.BytesIO(data)).shape == (10, 2)
+    # 相同参数再次请求走缓存，不再调用 build
+    assert export_bytes("test_export_cap", 1, "CSV", build, max_rows=10) == data
+    assert len(calls) == 1
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from app.utils.figures import webgl_if_large
+
+
+def _scatter(n):
+    return go.Figure(go.Scatter(x=np.arange(n), y=np.arange(n), mode="markers",
+                                hovertemplate="%{x}: %{y}<extra></extra>"))
+
+
+def test_small_figure_is_unchanged():
+    fig = _scatter(100)
+    assert webgl_if_large(fig, threshold=1000) is fig
+    assert fig.data[0].type == "scatter"
+    assert fig.data[0].hovertemplate == "%{x}: %{y}<extra></extra>"
+
+
+def test_large_scatter_becomes_webgl_without_hover():
+    trace = webgl_if_large(_scatter(2000), threshold=1000).data[0]
+    assert trace.type == "scattergl"
+    assert trace.hoverinfo == "skip"
+    assert trace.hovertemplate is None
+    assert len(trace.x) == 2000
+
+
+def test_large_box_keeps_only_outliers():
+    df = pd.DataFrame({"group": np.repeat(["a", "b"], 1000), "value": np.random.default_rng(0).normal(size=2000)})
+    small = webgl_if_large(px.box(df.head(50), x="group", y="value", points="all"), threshold=1000)
+    assert small.data[0].boxpoints == "all"
+    large = webgl_if_large(px.box(df, x="group", y="value", points="all"), threshold=1000)
+    assert all(trace.type == "box" and trace.boxpoints == "outliers" for trace in large.data)
+
+
+def test_large_splom_drops_hover():
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(600, 3)), columns=list("abc"))
+    small = webgl_if_large(px.scatter_matrix(df.head(10)), threshold=1000)
+    assert small.data[0].hoverinfo != "skip"
+    large = webgl_if_large(px.scatter_matrix(df), threshold=1000)
+    assert large.data[0].type == "splom"
+    assert large.data[0].hoverinfo == "skip"
@@ -0,0 +1,89 @@
+import threading
+
+from app.utils.jobs import JobScheduler, PRIORITY_BULK, PRIORITY_INTERACTIVE, PENDING, DONE, CANCELLED
+
+
+def _blocking(release, started=None):
+    def run(job=None):
+        if started is not None:
+            started.release()
+        release.wait(5)
+        return "bulk"
+    return run
+
+
+def test_interactive_job_not_blocked_by_users_bulk_jobs():
+    scheduler = JobScheduler(max_workers=4, per_user_limit=2, reserved_interactive=1)
+    release, started = threading.Event(), threading.Semaphore(0)
+    try:
+        bulk = [scheduler.submit("user", _blocking(release, started), priority=PRIORITY_BULK) for _ in range(2)]
+        assert started.acquire(timeout=2) and started.acquire(timeout=2)
+        interactive = scheduler.submit("user", lambda: "ok", priority=PRIORITY_INTERACTIVE)
+        assert interactive.wait(timeout=2) == "ok"
+        assert all(job.state != DONE for job in bulk)
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_per_user_limit_still_applies_to_bulk_jobs():
+    scheduler = JobScheduler(max_workers=4, per_user_limit=2, reserved_interactive=1)
+    release = threading.Event()
+    try:
+        jobs = [scheduler.submit("user", _blocking(release), priority=PRIORITY_BULK) for _ in range(3)]
+        threading.Event().wait(0.2)
+        assert jobs[2].state == PENDING
+        release.set()
+        assert [job.wait(timeout=2) for job in jobs] == ["bulk"] * 3
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_cancelling_running_job_keeps_it_running_until_it_returns():
+    scheduler = JobScheduler(max_workers=2, history_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def run(job=None):
+        started.set()
+        release.wait(5)
+        return "ignored"
+
+    try:
+        job = scheduler.submit("user", run)
+        assert started.wait(2)
+        assert scheduler.cancel(job.id)
+        assert job.cancelled and not job.finished
+        # trimming history while the cancelled job is still running must not fail
+        scheduler.submit("user", lambda: None).wait(timeout=2)
+        release.set()
+        assert job.wait(timeout=2) is None
+        assert job.state == CANCELLED
+        assert job.finished_at is not None
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_cancel_pending_job_wakes_waiters():
+    scheduler = JobScheduler(max_workers=2, per_user_limit=1, reserved_interactive=1)
+    release = threading.Event()
+    try:
+        scheduler.submit("user", _blocking(release), priority=PRIORITY_BULK)
+        queued = scheduler.submit("user", _blocking(release), priority=PRIORITY_BULK)
+        assert scheduler.cancel(queued.id)
+        queued.wait(timeout=1)
+        assert queued.state == CANCELLED
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_shutdown_releases_waiters_of_popped_job():
+    scheduler = JobScheduler(max_workers=1, reserved_interactive=0)
+    # 持有锁时提交并关闭，唯一的 worker 醒来时会取出任务并看到 shutdown
+    with scheduler._lock:
+        job = scheduler.submit("user", lambda: "never")
+        scheduler._shutdown = True
+    job.wait(timeout=2)
+    assert job.state == CANCELLED
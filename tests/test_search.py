@@ -0,0 +1,73 @@
+import numpy as np
+
+from app.data.search import InvertedIndex, parse_query, tokenize
+
+TEXTS = [
+    "Check my channel for free Tesla giveaways",
+    "my check is in the mail",
+    "check check my new video",
+    "Tesla model 3 review",
+    "",
+    "the model 3 beats the rivian",
+    "check\nmy channel",
+    None,
+    "my",
+]
+
+
+def _search(query):
+    return InvertedIndex(TEXTS).search(parse_query(query)).tolist()
+
+
+def _brute_force(query):
+    """Reference: re-tokenize every row"""
+    def matches(tokens, term):
+        size = len(term)
+        return any(tokens[i:i + size] == term for i in range(len(tokens) - size + 1))
+
+    rows = set()
+    for clause in parse_query(query):
+        for row, text in enumerate(TEXTS):
+            if all(matches(tokenize(text), term) for term in clause):
+                rows.add(row)
+    return sorted(rows)
+
+
+def test_parse_query():
+    assert parse_query('tesla "model 3" OR rivian') == [[["tesla"], ["model", "3"]], [["rivian"]]]
+    assert parse_query('a AND b') == [[["a"], ["b"]]]
+    assert parse_query('"unbalanced') == [[["unbalanced"]]]
+
+
+def test_phrase_requires_consecutive_tokens_in_order():
+    assert _search('"check my"') == [0, 2, 6]
+    assert _search('"my check"') == [1]
+
+
+def test_phrase_does_not_span_rows():
+    # 第7行以 "my" 结尾、第8行以 "my" 开头，不能拼成 "my my"
+    assert _search('"my my"') == []
+    assert _search('"channel check"') == []
+
+
+def test_repeated_tokens_in_phrase():
+    assert _search('"check check"') == [2]
+
+
+def test_and_or_and_unknown_tokens():
+    assert _search('tesla "model 3"') == [3]
+    assert _search('tesla OR rivian') == [0, 3, 5]
+    assert _search('"model 3" unknownword') == []
+    assert _search('') == []
+
+
+def test_matches_brute_force():
+    for query in ['"check my"', 'my', '"the model 3"', 'check OR "model 3" the', '"check my channel"', 'the "model 3" OR "my check"']:
+        assert _search(query) == _brute_force(query), query
+
+
+def test_row_postings_are_unique_and_sorted():
+    index = InvertedIndex(TEXTS)
+    postings = index.lookup("check")
+    assert postings.tolist() == [0, 1, 2, 6]
+    assert np.all(np.diff(index.token_positions("check")) > 0)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.time_pyramid import TimePyramid
+
+RULES = {"Weekly": "W", "Monthly": "ME"}
+
+
+def _daily():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2019-03-05", "2022-11-20", freq="D")
+    # 有缺失的日期和缺失值，与真实数据一致
+    index = index[rng.random(len(index)) > 0.1]
+    df = pd.DataFrame(rng.poisson(4, size=(len(index), 3)).astype(float), index=index, columns=["a", "b", "c"])
+    df.index.name = "date"
+    df.iloc[rng.integers(0, len(df), 40), 1] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("level", ["Weekly", "Monthly"])
+@pytest.mark.parametrize("how", ["mean", "sum"])
+def test_matches_slice_then_resample(level, how):
+    daily = _daily()
+    pyramid = TimePyramid(daily)
+    rng = np.random.default_rng(1)
+    dates = pd.date_range(daily.index[0] - pd.Timedelta(days=5), daily.index[-1] + pd.Timedelta(days=5))
+    for _ in range(100):
+        start, end = sorted(rng.choice(dates, 2))
+        expected = getattr(daily.loc[start:end].resample(RULES[level]), how)()
+        result = pyramid.aggregate(start, end, level, how=how)
+        assert list(result.index) == list(expected.index)
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_full_range_and_daily():
+    daily = _daily()
+    pyramid = TimePyramid(daily)
+    pd.testing.assert_frame_equal(pyramid.aggregate(), daily)
+    pd.testing.assert_frame_equal(pyramid.aggregate("2020-01-01", "2020-02-01"), daily.loc["2020-01-01":"2020-02-01"])
+    np.testing.assert_allclose(pyramid.aggregate(level="Monthly").to_numpy(), daily.resample("ME").mean().to_numpy(), equal_nan=True)
+
+
+def test_empty_range():
+    pyramid = TimePyramid(_daily())
+    assert pyramid.aggregate("2021-01-10", "2021-01-01", "Weekly").empty
+    assert pyramid.aggregate("2030-01-01", None, "Monthly").empty
+
+
+def test_unsorted_input():
+    daily = _daily()
+    shuffled = daily.sample(frac=1, random_state=0)
+    np.testing.assert_allclose(
+        TimePyramid(shuffled).aggregate(level="Weekly").to_numpy(),
+        TimePyramid(daily).aggregate(level="Weekly").to_numpy(),
+        equal_nan=True
+    )